@@ -0,0 +1,234 @@
+# ~/aurora_project/core_modules/cess_mesh/benchmarks.py
+import os
+import subprocess
+import sys
+import time
+from typing import Optional, Tuple
+
+from .mesh_simulator import CESSMesh
+
+# Project root, so `python -c "import core_modules..."` resolves in a fresh interpreter.
+_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+_IMPORT_PROBE = """
+import sys, time
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+import torch
+print(elapsed, 'matplotlib' in sys.modules, torch.cuda.is_initialized())
+"""
+
+
+def _import_once(module: str) -> Tuple[float, bool, bool]:
+    out = subprocess.run(
+        [sys.executable, "-c", _IMPORT_PROBE.format(module=module)],
+        cwd=_ROOT, capture_output=True, text=True, check=True,
+    ).stdout.split()
+    return float(out[0]), out[1] == "True", out[2] == "True"
+
+
+def bench_import_time(repeats: int = 5) -> None:
+    """
+    Cold import time of the modules worker processes load on start, each in a fresh
+    interpreter (best of `repeats`). `torch` alone is the floor. Importing must not pull in
+    matplotlib or initialise CUDA; the benchmark fails loudly if either regresses.
+    """
+    modules = (
+        "torch",
+        "core_modules.cess_mesh.mesh_simulator",
+        "core_modules.tgif_flow.intent",
+        "core_modules.tgif_flow.router",
+        "core_modules.hnk.sheaf_hypergraph_network",
+    )
+    print(f"{'module':<45} {'import (ms)':>12} {'matplotlib':>11} {'cuda init':>10}")
+    for module in modules:
+        runs = [_import_once(module) for _ in range(repeats)]
+        best = min(r[0] for r in runs)
+        plotting, cuda = runs[0][1], runs[0][2]
+        print(f"{module:<45} {best * 1e3:>12.1f} {str(plotting):>11} {str(cuda):>10}")
+        assert not plotting, f"Importing {module} pulled in matplotlib"
+        assert not cuda, f"Importing {module} initialised CUDA"
+
+
+def _triangulated_mesh(side: int, seed: int = 0) -> CESSMesh:
+    """A CESSMesh whose random edges are overlaid with a triangulated side x side lattice."""
+    mesh = CESSMesh(num_nodes=side * side, seed=seed)
+    for r in range(side):
+        for c in range(side):
+            n = r * side + c
+            if c + 1 < side:
+                mesh.add_edge(n, n + 1)
+            if r + 1 < side:
+                mesh.add_edge(n, n + side)
+            if r + 1 < side and c + 1 < side:
+                mesh.add_edge(n, n + side + 1)
+    return mesh
+
+
+def bench_rewrites(sides: Tuple[int, ...] = (60, 190, 580), sweeps: int = 5, budget: int = 4096) -> None:
+    """
+    Rewrite engine throughput (2-2, 1-3 and 3-1 rules) on triangulated meshes of growing size,
+    up to ~1M edges: index build time, matches/sec and applied moves per sweep.
+    """
+    from .graph_rewrites import Flip22, Merge31, RewriteEngine, Split13
+    print(f"{'edges':>10} {'triangles':>10} {'index build (s)':>16} {'matches/s':>11} {'applied/sweep':>14}")
+    for side in sides:
+        mesh = _triangulated_mesh(side)
+        start = time.perf_counter()
+        engine = RewriteEngine(mesh, [Flip22(), Split13(), Merge31()], seed=0)
+        build_s = time.perf_counter() - start
+        stats = engine.run(sweeps, budget)
+        print(f"{mesh.num_edges:>10,} {len(engine.index.triangles):>10,} {build_s:>16.2f} "
+              f"{stats.matches_per_second:>11,.0f} {stats.total_applied / sweeps:>14,.0f}")
+        engine.close()
+
+
+def bench_triangle_index(sides: Tuple[int, ...] = (60, 190), steps: int = 20, k: int = 256) -> None:
+    """
+    Cost of keeping triangle counts (and 4-cliques) current across `steps` batches of `k`
+    rewires each: incremental maintenance by the mesh-owned index vs a full recount per step.
+    """
+    import networkx as nx
+    print(f"{'edges':>10} {'index build (s)':>16} {'incremental/step (ms)':>22} {'recount/step (ms)':>18}")
+    for side in sides:
+        mesh = _triangulated_mesh(side)
+        start = time.perf_counter()
+        mesh.triangle_index(track_cliques=True)
+        build_s = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for _ in range(steps):
+            mesh.perform_pachner_moves(k)
+        incremental_ms = (time.perf_counter() - start) / steps * 1e3
+        mesh.drop_triangle_index()
+
+        start = time.perf_counter()
+        for _ in range(steps):
+            mesh.perform_pachner_moves(k)
+            sum(nx.triangles(mesh.graph).values())
+        recount_ms = (time.perf_counter() - start) / steps * 1e3
+        print(f"{mesh.num_edges:>10,} {build_s:>16.2f} {incremental_ms:>22.1f} {recount_ms:>18.1f}")
+
+
+def bench_parallel(num_nodes: int = 200_000, ticks: int = 20, max_workers: Optional[int] = None) -> None:
+    """
+    Strong scaling of ParallelMeshEvolver on a fixed mesh: ticks/sec with 1..N worker
+    processes (N = CPU count by default), against the serial `update_node_properties`.
+    """
+    from .parallel import ParallelMeshEvolver
+    mesh = CESSMesh(num_nodes=num_nodes, seed=0)
+    start = time.perf_counter()
+    for _ in range(ticks):
+        mesh.update_node_properties()
+    serial_tps = ticks / (time.perf_counter() - start)
+    print(f"serial update_node_properties: {serial_tps:,.1f} ticks/s on {mesh.num_edges:,} edges")
+    print(f"{'workers':>8} {'edge cut':>10} {'ticks/s':>10} {'speedup':>8}")
+    for workers in range(1, (max_workers or os.cpu_count() or 1) + 1):
+        with ParallelMeshEvolver(mesh, num_parts=workers, rewires_per_tick=64) as evolver:
+            evolver.tick()  # Warm up the worker processes.
+            start = time.perf_counter()
+            for _ in range(ticks):
+                evolver.tick()
+            tps = ticks / (time.perf_counter() - start)
+        print(f"{workers:>8} {evolver.plan.edge_cut:>10,} {tps:>10,.1f} {tps / serial_tps:>7.2f}x")
+
+
+def bench_construction(sizes: Tuple[int, ...] = (100_000, 1_000_000)) -> None:
+    """Wall time to build a CESSMesh from each generator (edge sampling, graph and edge store)."""
+    from .generators import erdos_renyi, random_geometric, small_world
+    builders = {
+        "default (2N pairs)": lambda n: CESSMesh(num_nodes=n, seed=0),
+        "erdos_renyi": lambda n: CESSMesh.from_edge_index(erdos_renyi(n, 4.0 / n), n, seed=0),
+        "random_geometric": lambda n: CESSMesh.from_edge_index(random_geometric(n, (4.0 / (3.1416 * n)) ** 0.5), n, seed=0),
+        "small_world": lambda n: CESSMesh.from_edge_index(small_world(n, k=4, p=0.1), n, seed=0),
+    }
+    print(f"{'generator':<20} {'nodes':>10} {'edges':>10} {'build (s)':>10}")
+    for n in sizes:
+        for name, build in builders.items():
+            start = time.perf_counter()
+            mesh = build(n)
+            elapsed = time.perf_counter() - start
+            print(f"{name:<20} {n:>10,} {mesh.num_edges:>10,} {elapsed:>10.2f}")
+            del mesh
+
+
+def bench_snapshot(num_nodes: int = 1_000_000) -> None:
+    """
+    Snapshot costs for a large mesh: bulk write, opening the memory map and lazily loading a
+    1,000-node range (zero-copy), a full restore (adopts the mapped tensors), and the first
+    topology access on the restored mesh, which builds its networkx graph and edge-slot map.
+    """
+    import tempfile
+    from core_modules.snapshot import Snapshot, load_mesh, save_mesh
+    mesh = CESSMesh(num_nodes=num_nodes, seed=0)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "mesh.snap")
+        start = time.perf_counter()
+        save_mesh(mesh, path)
+        save_s = time.perf_counter() - start
+        size_mb = os.path.getsize(path) / 2**20
+        start = time.perf_counter()
+        snapshot = Snapshot(path)
+        snapshot.array("node_state")
+        snapshot.node_range(num_nodes // 2, num_nodes // 2 + 1_000)
+        partial_ms = (time.perf_counter() - start) * 1e3
+        start = time.perf_counter()
+        restored = load_mesh(path)
+        load_ms = (time.perf_counter() - start) * 1e3
+        start = time.perf_counter()
+        restored.add_edge(0, 1)
+        index_s = time.perf_counter() - start
+        del restored
+    print(f"{num_nodes:,} nodes / {mesh.num_edges:,} edges: {size_mb:.0f} MB written in {save_s:.2f} s, "
+          f"open + partial load {partial_ms:.2f} ms, full restore {load_ms:.2f} ms, "
+          f"first topology access {index_s:.2f} s")
+
+
+def bench_event_log(num_nodes: int = 200_000, ticks: int = 10, moves_per_tick: int = 1_000) -> None:
+    """
+    Event logging overhead on an evolving mesh (rewires + node updates per tick), with node
+    state stored never / every tick, and the replay rate of the resulting logs.
+    """
+    import tempfile
+    from .event_log import EventLogWriter, replay
+
+    def run(mesh: CESSMesh) -> float:
+        start = time.perf_counter()
+        for _ in range(ticks):
+            mesh.perform_pachner_moves(moves_per_tick)
+            mesh.update_node_properties()
+        return time.perf_counter() - start
+
+    base_s = run(CESSMesh(num_nodes=num_nodes, seed=0))
+    print(f"unlogged: {ticks / base_s:.1f} ticks/s")
+    with tempfile.TemporaryDirectory() as tmp:
+        for state_every in (0, 5, 1):
+            mesh = CESSMesh(num_nodes=num_nodes, seed=0)
+            start_state = CESSMesh.from_edge_index(mesh.edge_index.clone(), num_nodes, mesh.node_state.clone(),
+                                                   mesh.edge_weight.clone(), seed=0)
+            path = os.path.join(tmp, f"run{state_every}.log")
+            with EventLogWriter(mesh, path, state_every=state_every) as log:
+                logged_s = run(mesh)
+            start = time.perf_counter()
+            replay(start_state, path)
+            replay_s = time.perf_counter() - start
+            print(f"state_every={state_every}: {ticks / logged_s:.1f} ticks/s ({logged_s / base_s - 1:+.0%}), "
+                  f"{log.records:,} records / {os.path.getsize(path) / 2**20:.1f} MB, replay {ticks / replay_s:.1f} ticks/s")
+
+
+if __name__ == "__main__":
+    print("--- CESS Mesh Benchmarks ---")
+    bench_import_time()
+    print()
+    bench_rewrites()
+    print()
+    bench_triangle_index()
+    print()
+    bench_parallel()
+    print()
+    bench_construction()
+    print()
+    bench_snapshot()
+    print()
+    bench_event_log()
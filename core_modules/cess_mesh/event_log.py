@@ -0,0 +1,223 @@
+# ~/aurora_project/core_modules/cess_mesh/event_log.py
+import logging
+import struct
+from typing import BinaryIO, Iterator, NamedTuple, Optional
+
+import torch
+
+from .mesh_simulator import (CESSMesh, MeshEvent, EDGE_ADDED, EDGE_REMOVED, EDGE_WEIGHT_CHANGED,
+                             NODE_ADDED, NODE_REMOVED, NODES_UPDATED, TICK_COMPLETED)
+
+logger = logging.getLogger(__name__)
+
+# File layout: header, then one record per mutation:
+#   header: MAGIC | i64 base tick | i64 num nodes | i64 num edges | u32 node state width
+#   record: u8 kind | i64 u | i64 v | u32 payload floats | float32 payload
+MAGIC = b"AUREVLG\x01"
+_HEADER = struct.Struct("<8sqqqI")
+_RECORD = struct.Struct("<BqqI")
+
+# Record kinds (one byte on disk).
+REC_EDGE_ADDED = 1     # u, v; payload: weight
+REC_EDGE_REMOVED = 2   # u, v
+REC_EDGE_WEIGHT = 3    # u, v; payload: new weight
+REC_NODE_ADDED = 4     # u = new node; payload: its state
+REC_NODE_REMOVED = 5   # u = vanished (highest) ID, v = ID it was renumbered to
+REC_TICK = 6           # u = tick completed
+REC_NODE_STATE = 7     # u = num nodes, v = tick the state belongs to; payload: the full (N, D) node state, row-major
+
+_KINDS = {EDGE_ADDED: REC_EDGE_ADDED, EDGE_REMOVED: REC_EDGE_REMOVED, EDGE_WEIGHT_CHANGED: REC_EDGE_WEIGHT,
+          NODE_ADDED: REC_NODE_ADDED, NODE_REMOVED: REC_NODE_REMOVED}
+
+
+class LogHeader(NamedTuple):
+    base_tick: int
+    num_nodes: int
+    num_edges: int
+    state_dim: int
+
+
+class LogRecord(NamedTuple):
+    """One decoded record: its kind, two integer fields and a float32 payload (possibly empty)."""
+    kind: int
+    u: int
+    v: int
+    payload: torch.Tensor
+
+
+_EMPTY = torch.empty(0)
+
+
+def _float_bytes(values: torch.Tensor) -> bytearray:
+    """float32 bytes of a tensor, in one copy."""
+    values = values.detach().to("cpu", torch.float32).reshape(-1)
+    buffer = bytearray(values.numel() * 4)
+    if buffer:
+        torch.frombuffer(buffer, dtype=torch.float32).copy_(values)
+    return buffer
+
+
+def mutation_record(mesh: CESSMesh, event: MeshEvent) -> Optional[LogRecord]:
+    """
+    The record that redoes one topology or edge-weight event (None for other events), with
+    the weight or node state it needs copied out of `mesh` at the time of the event.
+    """
+    kind = event.kind
+    if kind in (EDGE_ADDED, EDGE_WEIGHT_CHANGED):
+        return LogRecord(_KINDS[kind], event.u, event.v, mesh.edge_attrs[(event.u, event.v)].detach().float().cpu().clone())
+    if kind == NODE_ADDED:
+        return LogRecord(REC_NODE_ADDED, event.u, -1, mesh.node_state[event.u].detach().float().cpu().clone())
+    if kind in (EDGE_REMOVED, NODE_REMOVED):
+        return LogRecord(_KINDS[kind], event.u, event.v, _EMPTY)
+    return None
+
+
+class EventLogWriter:
+    """
+    Append-only binary log of a mesh's mutations, fed by a mesh listener.
+    Every edge add/remove/reweight and node add/remove is recorded with the data needed to
+    redo it (weights, new node states), and every completed tick (`update_node_properties`,
+    or one `ParallelMeshEvolver.tick`) writes a tick boundary. Records go through a
+    `buffer_size` write buffer, so logging costs one small struct pack per event.
+    Start a log right after a snapshot; together they rebuild the topology and edge weights
+    at any later tick. Node state changes everywhere every tick, so it is only stored as a
+    full (N, D) checkpoint, O(N) bytes each: by default never (`state_every=0`), otherwise
+    whenever the mesh announces the state of every `state_every`-th tick (announced by each
+    `update_node_properties` call, or by `ParallelMeshEvolver.sync`).
+    """
+    def __init__(self, mesh: CESSMesh, path: str, state_every: int = 0, buffer_size: int = 1 << 20):
+        self.mesh = mesh
+        self.path = path
+        self.state_every = state_every
+        self.records = 0
+        self._file: Optional[BinaryIO] = open(path, "wb", buffering=buffer_size)  # type: ignore[assignment]
+        self._file.write(_HEADER.pack(MAGIC, mesh.tick_count, mesh.num_nodes, mesh.num_edges, mesh.NODE_STATE_DIM))
+        mesh.add_listener(self.on_mesh_event)
+
+    def _write(self, kind: int, u: int, v: int, payload: Optional[torch.Tensor] = None) -> None:
+        data = _float_bytes(payload) if payload is not None else b""
+        self._file.write(_RECORD.pack(kind, u, v, len(data) // 4))
+        if data:
+            self._file.write(data)
+        self.records += 1
+
+    def on_mesh_event(self, event: MeshEvent) -> None:
+        if self._file is None:
+            return
+        if event.kind == TICK_COMPLETED:
+            self._write(REC_TICK, event.u, -1)
+        elif event.kind == NODES_UPDATED:
+            tick = event.u
+            if self.state_every > 0 and (tick + 1) % self.state_every == 0:
+                self._write(REC_NODE_STATE, self.mesh.num_nodes, tick, self.mesh.node_state)
+        else:
+            record = mutation_record(self.mesh, event)
+            if record is not None:
+                self._write(record.kind, record.u, record.v, record.payload if record.payload.numel() else None)
+
+    def flush(self) -> None:
+        if self._file is not None:
+            self._file.flush()
+
+    def close(self) -> None:
+        """Detaches from the mesh and closes the log file."""
+        if self._file is not None:
+            self.mesh.remove_listener(self.on_mesh_event)
+            self._file.close()
+            self._file = None
+            logger.info("Closed event log %s (%d records).", self.path, self.records)
+
+    def __enter__(self) -> "EventLogWriter":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def read_header(path: str) -> LogHeader:
+    with open(path, "rb") as f:
+        magic, *fields = _HEADER.unpack(f.read(_HEADER.size))
+    if magic != MAGIC:
+        raise ValueError(f"{path} is not an AURORA mesh event log.")
+    return LogHeader(*fields)
+
+
+def read_records(path: str, buffer_size: int = 1 << 20) -> Iterator[LogRecord]:
+    """Streams the decoded records of a log (a complete trailing record is required; a torn tail is ignored)."""
+    with open(path, "rb", buffering=buffer_size) as f:
+        if f.read(_HEADER.size)[:len(MAGIC)] != MAGIC:
+            raise ValueError(f"{path} is not an AURORA mesh event log.")
+        while True:
+            head = f.read(_RECORD.size)
+            if len(head) < _RECORD.size:
+                return
+            kind, u, v, count = _RECORD.unpack(head)
+            payload = _EMPTY
+            if count:
+                data = bytearray(f.read(count * 4))
+                if len(data) < count * 4:
+                    return
+                payload = torch.frombuffer(data, dtype=torch.float32)
+            yield LogRecord(kind, u, v, payload)
+
+
+def apply_record(mesh: CESSMesh, record: LogRecord) -> None:
+    """Redoes one logged mutation on `mesh` through its public mutation API."""
+    kind, u, v, payload = record
+    if kind == REC_EDGE_ADDED:
+        mesh.add_edge(u, v, payload[0].clone())
+    elif kind == REC_EDGE_REMOVED:
+        mesh.remove_edge(u, v)
+    elif kind == REC_EDGE_WEIGHT:
+        mesh.edge_attrs[(u, v)] = payload[0].clone()
+    elif kind == REC_NODE_ADDED:
+        mesh.add_node(payload.to(mesh.device))
+    elif kind == REC_NODE_REMOVED:
+        # The renumbered node's edges were already replayed; move its state and drop the old ID.
+        if v != u:
+            mesh.node_state[v] = mesh.node_state[u]
+        mesh.remove_node(u)
+    elif kind == REC_TICK:
+        mesh.tick_count = u + 1
+    elif kind == REC_NODE_STATE:
+        mesh.node_state.copy_(payload.view(u, -1))
+    else:
+        raise ValueError(f"Unknown event log record kind {kind}.")
+
+
+def follow(mesh: CESSMesh, path: str) -> Iterator[int]:
+    """
+    Replays a log onto `mesh` (in the state the log started from, e.g. a restored snapshot)
+    tick by tick, yielding after each tick boundary with the tick just completed. Analyses
+    can inspect the live mesh between ticks without copying it:
+
+        mesh = load_mesh("run.snap")
+        for tick in follow(mesh, "run.log"):
+            curvature.append(mesh.triangle_index().curvature_stats())
+
+    Topology is exact at every tick; node state is exact on ticks the writer stored it. A
+    tick is yielded once the record after its boundary has been read, so a state checkpoint
+    announced after the boundary (e.g. by `ParallelMeshEvolver.sync`) is applied first.
+    """
+    header = read_header(path)
+    if mesh.num_nodes != header.num_nodes or mesh.num_edges != header.num_edges:
+        raise ValueError(f"Mesh ({mesh.num_nodes} nodes, {mesh.num_edges} edges) does not match the state "
+                         f"the log starts from ({header.num_nodes} nodes, {header.num_edges} edges).")
+    completed: Optional[int] = None
+    for record in read_records(path):
+        if completed is not None and not (record.kind == REC_NODE_STATE and record.v == completed):
+            yield completed
+            completed = None
+        apply_record(mesh, record)
+        if record.kind == REC_TICK:
+            completed = record.u
+    if completed is not None:
+        yield completed
+
+
+def replay(mesh: CESSMesh, path: str, until_tick: Optional[int] = None) -> CESSMesh:
+    """Replays a log onto `mesh` up to and including tick `until_tick` (the whole log by default)."""
+    for tick in follow(mesh, path):
+        if until_tick is not None and tick >= until_tick:
+            break
+    return mesh
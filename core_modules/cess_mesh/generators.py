@@ -0,0 +1,115 @@
+# ~/aurora_project/core_modules/cess_mesh/generators.py
+import math
+from typing import Optional
+
+import torch
+
+# Every generator returns a `(2, E)` long tensor of distinct undirected edges (u < v, no
+# self-loops) built entirely with tensor ops, ready for `CESSMesh.from_edge_index`.
+# Tensors are drawn on the generator's device (CPU without one), so a mesh's CUDA stream
+# samples on the GPU rather than being handed to CPU-only kernels.
+
+
+def _device(generator: Optional[torch.Generator]) -> torch.device:
+    return generator.device if generator is not None else torch.device("cpu")
+
+
+def dedup_edges(edge_index: torch.Tensor, num_nodes: int) -> torch.Tensor:
+    """
+    Canonicalises a `(2, M)` block of candidate edges: orients every edge as (min, max),
+    drops self-loops and removes duplicates (in either orientation) with one sort.
+    The result is sorted by (u, v).
+    """
+    u, v = edge_index[0], edge_index[1]
+    lo, hi = torch.minimum(u, v), torch.maximum(u, v)
+    keep = lo != hi
+    keys = torch.unique(lo[keep] * num_nodes + hi[keep])
+    return torch.stack([keys // num_nodes, keys % num_nodes])
+
+
+def uniform_random_edges(num_nodes: int, num_samples: int, generator: Optional[torch.Generator] = None) -> torch.Tensor:
+    """
+    The classic CESS Mesh topology: `num_samples` endpoint pairs drawn uniformly among
+    distinct nodes, duplicates dropped (so slightly fewer than `num_samples` edges remain).
+    """
+    device = _device(generator)
+    if num_nodes < 2 or num_samples <= 0:
+        return torch.empty((2, 0), dtype=torch.long, device=device)
+    u = torch.randint(num_nodes, (num_samples,), generator=generator, device=device)
+    # An offset in [1, N) makes v uniform over the nodes other than u.
+    v = (u + torch.randint(1, num_nodes, (num_samples,), generator=generator, device=device)) % num_nodes
+    return dedup_edges(torch.stack([u, v]), num_nodes)
+
+
+def erdos_renyi(num_nodes: int, p: float, generator: Optional[torch.Generator] = None) -> torch.Tensor:
+    """
+    Erdős–Rényi G(n, m) with m = round(p * n(n-1)/2), the expected edge count of G(n, p).
+    Candidates are drawn uniformly and de-duplicated; missing edges are topped up in a few
+    rounds, so the cost is O(m log m) rather than O(n^2).
+    """
+    total = num_nodes * (num_nodes - 1) // 2
+    target = min(total, round(p * total))
+    device = _device(generator)
+    edges = torch.empty((2, 0), dtype=torch.long, device=device)
+    while edges.shape[1] < target:
+        missing = target - edges.shape[1]
+        # Oversample by the expected collision rate so one or two rounds usually suffice.
+        draw = uniform_random_edges(num_nodes, int(missing * (1 + 2 * target / max(total, 1))) + 16, generator)
+        edges = dedup_edges(torch.cat([edges, draw], dim=1), num_nodes)
+    if edges.shape[1] > target:
+        edges = edges[:, torch.randperm(edges.shape[1], generator=generator, device=device)[:target]]
+        edges = edges[:, torch.argsort(edges[0] * num_nodes + edges[1])]
+    return edges
+
+
+def random_geometric(num_nodes: int, radius: float, dim: int = 2, positions: Optional[torch.Tensor] = None,
+                     generator: Optional[torch.Generator] = None) -> torch.Tensor:
+    """
+    Random geometric graph: nodes at `positions` (uniform in the unit cube by default) are
+    joined when closer than `radius`. Nodes are binned into a grid of `radius`-sized cells and
+    only pairs in neighbouring cells are compared, so the cost is O(n + E), not O(n^2).
+    """
+    if positions is None:
+        positions = torch.rand(num_nodes, dim, generator=generator, device=_device(generator))
+    device = positions.device
+    dim = positions.shape[1]
+    cells_per_axis = max(1, int(math.floor(1.0 / radius)))
+    coords = (positions * cells_per_axis).long().clamp(0, cells_per_axis - 1)
+    strides = cells_per_axis ** torch.arange(dim, device=device)
+    cell = (coords * strides).sum(dim=1)
+    order = torch.argsort(cell)
+    sorted_cell = cell[order]
+    num_cells = cells_per_axis ** dim
+    counts = torch.bincount(sorted_cell, minlength=num_cells)
+    starts = torch.cumsum(counts, dim=0) - counts
+
+    pairs = []
+    for offset in torch.cartesian_prod(*[torch.tensor([-1, 0, 1], device=device)] * dim).reshape(-1, dim):
+        neighbour = coords[order] + offset
+        inside = ((neighbour >= 0) & (neighbour < cells_per_axis)).all(dim=1)
+        src = torch.nonzero(inside).flatten()
+        target_cell = (neighbour[src] * strides).sum(dim=1)
+        per_src = counts[target_cell]
+        src_rep = torch.repeat_interleave(src, per_src)
+        # k-th candidate of each source: position starts[cell] + k in the sorted order.
+        first = torch.repeat_interleave(starts[target_cell] - (torch.cumsum(per_src, 0) - per_src), per_src)
+        dst = first + torch.arange(src_rep.numel(), device=device)
+        a, b = order[src_rep], order[dst]
+        close = (a < b) & ((positions[a] - positions[b]).pow(2).sum(dim=1) < radius * radius)
+        pairs.append(torch.stack([a[close], b[close]]))
+    return dedup_edges(torch.cat(pairs, dim=1), num_nodes)
+
+
+def small_world(num_nodes: int, k: int = 4, p: float = 0.1, generator: Optional[torch.Generator] = None) -> torch.Tensor:
+    """
+    Watts–Strogatz small world: a ring where every node links to its k/2 nearest neighbours
+    on each side, after which each edge's far endpoint is rewired uniformly with probability p.
+    Rewires that would create a self-loop or a duplicate edge are dropped.
+    """
+    device = _device(generator)
+    nodes = torch.arange(num_nodes, device=device)
+    u = nodes.repeat(k // 2)
+    v = (u + torch.arange(1, k // 2 + 1, device=device).repeat_interleave(num_nodes)) % num_nodes
+    rewire = torch.rand(u.numel(), generator=generator, device=device) < p
+    v = torch.where(rewire, torch.randint(num_nodes, (u.numel(),), generator=generator, device=device), v)
+    return dedup_edges(torch.stack([u, v]), num_nodes)
@@ -0,0 +1,238 @@
+# ~/aurora_project/core_modules/cess_mesh/graph_rewrites.py
+import logging
+import random
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Sequence, Set, Tuple
+
+import torch
+
+from .mesh_simulator import CESSMesh, MeshEvent, NODE_REMOVED
+from .mesh_index import DegreeBuckets, TriangleIndex
+
+logger = logging.getLogger(__name__)
+
+# Pattern anchors a rule can be matched from; each is sampled from a maintained index.
+ANCHOR_EDGE: str = "edge"
+ANCHOR_TRIANGLE: str = "triangle"
+ANCHOR_NODE: str = "node"
+
+
+class RewriteMatch(NamedTuple):
+    """
+    A concrete occurrence of a rule's pattern.
+    `footprint` lists every existing node the rewrite reads or writes; matches applied in
+    the same sweep have disjoint footprints. `data` is rule-specific.
+    """
+    footprint: Tuple[int, ...]
+    data: Tuple[int, ...]
+
+
+class MeshIndex:
+    """
+    The indexes rules are matched against: degree buckets and the triangle list. The
+    triangle index is the mesh's own (`CESSMesh.triangle_index()`), shared with other users.
+    """
+    def __init__(self, mesh: CESSMesh):
+        self.mesh = mesh
+        self.degrees = DegreeBuckets(mesh)
+        self.triangles: TriangleIndex = mesh.triangle_index()
+
+    def candidates(self, anchor: str, k: int, rng: random.Random, degree: Optional[int] = None) -> List[Any]:
+        """Up to k random anchors of the given kind, drawn without scanning the mesh."""
+        if anchor == ANCHOR_TRIANGLE:
+            return self.triangles.sample(k, rng)
+        if anchor == ANCHOR_NODE:
+            if degree is not None:
+                return self.degrees.sample(degree, k, rng)
+            return [rng.randrange(self.mesh.num_nodes) for _ in range(min(k, self.mesh.num_nodes))]
+        if anchor == ANCHOR_EDGE:
+            num_edges = self.mesh.num_edges
+            if num_edges == 0:
+                return []
+            # Distinct slots from the caller's stream: reproducible, and no global RNG state.
+            slots = torch.tensor(rng.sample(range(num_edges), min(k, num_edges)), dtype=torch.long, device=self.mesh.device)
+            return [tuple(e) for e in self.mesh.edge_index[:, slots].t().tolist()]
+        raise ValueError(f"Unknown rule anchor '{anchor}'.")
+
+    def close(self) -> None:
+        self.degrees.close()
+
+
+class RewriteRule:
+    """
+    A local rewrite, declared by its pattern:
+    - `anchor`: what a candidate match is grown from ("edge", "triangle" or "node");
+    - `degree`: for node anchors, restricts candidates to that degree bucket;
+    - `match(mesh, index, anchor)`: checks the pattern around the anchor against the live
+      mesh and returns a RewriteMatch, or None;
+    - `apply(mesh, match)`: performs the rewrite through the mesh's mutation API.
+    Subclass it, or wrap plain functions with LocalRule.
+    """
+    name: str = "rule"
+    anchor: str = ANCHOR_EDGE
+    degree: Optional[int] = None
+
+    def match(self, mesh: CESSMesh, index: MeshIndex, anchor: Any) -> Optional[RewriteMatch]:
+        raise NotImplementedError
+
+    def apply(self, mesh: CESSMesh, match: RewriteMatch) -> None:
+        raise NotImplementedError
+
+
+class LocalRule(RewriteRule):
+    """A user-defined rule built from a match function and an apply function."""
+    def __init__(self, name: str, anchor: str,
+                 match: Callable[[CESSMesh, MeshIndex, Any], Optional[RewriteMatch]],
+                 apply: Callable[[CESSMesh, RewriteMatch], None], degree: Optional[int] = None):
+        self.name = name
+        self.anchor = anchor
+        self.degree = degree
+        self._match = match
+        self._apply = apply
+
+    def match(self, mesh: CESSMesh, index: MeshIndex, anchor: Any) -> Optional[RewriteMatch]:
+        return self._match(mesh, index, anchor)
+
+    def apply(self, mesh: CESSMesh, match: RewriteMatch) -> None:
+        self._apply(mesh, match)
+
+
+class Flip22(RewriteRule):
+    """
+    Pachner 2-2 move: an edge (u, v) shared by triangles (u, v, a) and (u, v, b), with a and
+    b not adjacent, is replaced by the other diagonal (a, b). Edge count is preserved.
+    """
+    name = "2-2"
+    anchor = ANCHOR_TRIANGLE
+
+    def match(self, mesh: CESSMesh, index: MeshIndex, anchor: Tuple[int, int, int]) -> Optional[RewriteMatch]:
+        flip = index.triangles.find_flip(anchor)
+        return RewriteMatch(flip, flip) if flip is not None else None
+
+    def apply(self, mesh: CESSMesh, match: RewriteMatch) -> None:
+        mesh.flip_edge(*match.data)
+
+
+class Split13(RewriteRule):
+    """Pachner 1-3 move: a triangle (a, b, c) gains a new interior node joined to all three corners."""
+    name = "1-3"
+    anchor = ANCHOR_TRIANGLE
+
+    def match(self, mesh: CESSMesh, index: MeshIndex, anchor: Tuple[int, int, int]) -> Optional[RewriteMatch]:
+        a, b, c = anchor
+        adj = mesh.graph.adj
+        if b in adj[a] and c in adj[a] and c in adj[b]:
+            return RewriteMatch(anchor, anchor)
+        return None
+
+    def apply(self, mesh: CESSMesh, match: RewriteMatch) -> None:
+        corners = match.data
+        node = mesh.add_node(mesh.node_state[list(corners)].mean(dim=0))
+        for corner in corners:
+            mesh.add_edge(node, corner)
+
+
+class Merge31(RewriteRule):
+    """Pachner 3-1 move: a degree-3 node whose neighbours form a triangle is removed."""
+    name = "3-1"
+    anchor = ANCHOR_NODE
+    degree = 3
+
+    def match(self, mesh: CESSMesh, index: MeshIndex, anchor: int) -> Optional[RewriteMatch]:
+        adj = mesh.graph.adj
+        if anchor >= mesh.num_nodes or len(adj[anchor]) != 3:
+            return None
+        a, b, c = adj[anchor]
+        if b in adj[a] and c in adj[a] and c in adj[b]:
+            return RewriteMatch((anchor, a, b, c), (anchor,))
+        return None
+
+    def apply(self, mesh: CESSMesh, match: RewriteMatch) -> None:
+        mesh.remove_node(match.data[0])
+
+
+@dataclass
+class SweepStats:
+    """Outcome of one or more rewrite sweeps."""
+    candidates: int = 0
+    matches: int = 0
+    conflicts: int = 0
+    applied: Dict[str, int] = field(default_factory=dict)
+    seconds: float = 0.0
+
+    @property
+    def total_applied(self) -> int:
+        return sum(self.applied.values())
+
+    @property
+    def matches_per_second(self) -> float:
+        return self.matches / self.seconds if self.seconds > 0 else 0.0
+
+    def merge(self, other: "SweepStats") -> None:
+        self.candidates += other.candidates
+        self.matches += other.matches
+        self.conflicts += other.conflicts
+        self.seconds += other.seconds
+        for name, count in other.applied.items():
+            self.applied[name] = self.applied.get(name, 0) + count
+
+
+class RewriteEngine:
+    """
+    Applies local rewrite rules to a CESS Mesh.
+    Each sweep draws up to `budget` candidate anchors per rule from the maintained indexes
+    (no full scans), matches the rule's pattern around each one, and applies every match
+    whose footprint does not overlap a match already applied in the same sweep. Rewrites go
+    through the mesh's mutation API, so the indexes (and any other listeners) stay current.
+    """
+    def __init__(self, mesh: CESSMesh, rules: Optional[Sequence[RewriteRule]] = None, seed: Optional[int] = None):
+        self.mesh = mesh
+        self.rules: List[RewriteRule] = list(rules) if rules is not None else [Flip22()]
+        self.index = MeshIndex(mesh)
+        self.rng = random.Random(seed)
+        self.stats = SweepStats()
+        self._locked: Set[int] = set()
+        mesh.add_listener(self._on_mesh_event)
+
+    def _on_mesh_event(self, event: MeshEvent) -> None:
+        # A removed node's ID is taken over by the highest node; carry its lock over.
+        if event.kind == NODE_REMOVED and event.u in self._locked:
+            self._locked.add(event.v)
+
+    def sweep(self, budget: int = 1024) -> SweepStats:
+        """Runs one sweep over every rule and returns its statistics."""
+        stats = SweepStats()
+        start = time.perf_counter()
+        self._locked = set()
+        for rule in self.rules:
+            applied = 0
+            for anchor in self.index.candidates(rule.anchor, budget, self.rng, rule.degree):
+                stats.candidates += 1
+                match = rule.match(self.mesh, self.index, anchor)
+                if match is None:
+                    continue
+                stats.matches += 1
+                if any(node in self._locked for node in match.footprint):
+                    stats.conflicts += 1
+                    continue
+                self._locked.update(match.footprint)
+                rule.apply(self.mesh, match)
+                applied += 1
+            stats.applied[rule.name] = applied
+        stats.seconds = time.perf_counter() - start
+        self.stats.merge(stats)
+        logger.debug("Rewrite sweep: %d candidates, %d matches, applied %s.", stats.candidates, stats.matches, stats.applied)
+        return stats
+
+    def run(self, sweeps: int, budget: int = 1024) -> SweepStats:
+        """Runs several sweeps and returns their combined statistics."""
+        total = SweepStats()
+        for _ in range(sweeps):
+            total.merge(self.sweep(budget))
+        return total
+
+    def close(self) -> None:
+        """Detaches the engine and its indexes from the mesh."""
+        self.mesh.remove_listener(self._on_mesh_event)
+        self.index.close()
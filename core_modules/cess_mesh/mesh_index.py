@@ -0,0 +1,248 @@
+# ~/aurora_project/core_modules/cess_mesh/mesh_index.py
+import random
+from typing import Container, Dict, Generic, Hashable, Iterator, List, Optional, Set, Tuple, TypeVar
+
+import torch
+
+from .mesh_simulator import CESSMesh, MeshEvent, EDGE_ADDED, EDGE_REMOVED, NODE_ADDED, NODE_REMOVED
+from .mesh_storage import EdgeKey, edge_key
+
+Triangle = Tuple[int, int, int]
+Clique = Tuple[int, int, int, int]
+T = TypeVar("T", bound=Hashable)
+
+
+class SampleableSet(Generic[T]):
+    """A set with O(1) add, remove and uniform random sampling (list + position map, swap-remove)."""
+    def __init__(self) -> None:
+        self._items: List[T] = []
+        self._pos: Dict[T, int] = {}
+
+    def add(self, item: T) -> bool:
+        if item in self._pos:
+            return False
+        self._pos[item] = len(self._items)
+        self._items.append(item)
+        return True
+
+    def discard(self, item: T) -> bool:
+        i = self._pos.pop(item, None)
+        if i is None:
+            return False
+        last = self._items.pop()
+        if i < len(self._items):
+            self._items[i] = last
+            self._pos[last] = i
+        return True
+
+    def sample(self, k: int, rng: random.Random) -> List[T]:
+        """Up to k distinct items, uniformly at random."""
+        if k >= len(self._items):
+            items = list(self._items)
+            rng.shuffle(items)
+            return items
+        return rng.sample(self._items, k)
+
+    def __contains__(self, item: object) -> bool:
+        return item in self._pos
+
+    def __iter__(self) -> Iterator[T]:
+        return iter(self._items)
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+
+class DegreeBuckets:
+    """
+    Nodes grouped by degree, maintained from mesh events in O(1) per edge change, so
+    rules anchored on "a node of degree d" sample candidates without scanning the mesh.
+    """
+    def __init__(self, mesh: CESSMesh):
+        self.mesh = mesh
+        self.degree: List[int] = [0] * mesh.num_nodes
+        self._buckets: Dict[int, SampleableSet[int]] = {}
+        for node, d in mesh.graph.degree():
+            self.degree[node] = d
+            self._bucket(d).add(node)
+        mesh.add_listener(self.on_mesh_event)
+
+    def _bucket(self, d: int) -> SampleableSet[int]:
+        bucket = self._buckets.get(d)
+        if bucket is None:
+            bucket = self._buckets[d] = SampleableSet()
+        return bucket
+
+    def _shift(self, node: int, delta: int) -> None:
+        d = self.degree[node]
+        self._buckets[d].discard(node)
+        self.degree[node] = d + delta
+        self._bucket(d + delta).add(node)
+
+    def on_mesh_event(self, event: MeshEvent) -> None:
+        if event.kind == EDGE_ADDED:
+            self._shift(event.u, 1)
+            self._shift(event.v, 1)
+        elif event.kind == EDGE_REMOVED:
+            self._shift(event.u, -1)
+            self._shift(event.v, -1)
+        elif event.kind == NODE_ADDED:
+            self.degree.append(0)
+            self._bucket(0).add(event.u)
+        elif event.kind == NODE_REMOVED:
+            # The vanished ID is isolated by now; its edges were re-announced under `event.v`.
+            self._buckets[self.degree[event.u]].discard(event.u)
+            self.degree.pop()
+
+    def nodes_with_degree(self, d: int) -> SampleableSet[int]:
+        return self._bucket(d)
+
+    def sample(self, d: int, k: int, rng: random.Random) -> List[int]:
+        return self._bucket(d).sample(k, rng)
+
+    def close(self) -> None:
+        self.mesh.remove_listener(self.on_mesh_event)
+
+
+class TriangleIndex:
+    """
+    All triangles of the mesh, maintained from mesh events.
+    - `triangles`: a sampleable set of sorted (a, b, c) triples;
+    - `apexes[(u, v)]`: the third vertices of the triangles on edge (u, v);
+    - `cliques`: with `track_cliques`, the sorted 4-cliques (a, b, c, d), derived from the
+      recorded triangles (a 4-clique is four triangles on the same four nodes).
+    Adding edge (u, v) intersects the two neighbourhoods (O(min degree)); removing it drops
+    the triangles recorded on that edge (O(triangles on the edge)). Each triangle change
+    touches the 4-cliques through one of its sides, O(triangles on that side). Updates read
+    the live graph, so batched rewires that notify after mutating stay consistent.
+    Use `CESSMesh.triangle_index()` for the mesh's shared instance.
+    """
+    def __init__(self, mesh: CESSMesh, track_cliques: bool = False):
+        self.mesh = mesh
+        self.triangles: SampleableSet[Triangle] = SampleableSet()
+        self.apexes: Dict[EdgeKey, Set[int]] = {}
+        self.track_cliques = False
+        self.cliques: SampleableSet[Clique] = SampleableSet()
+        adj = mesh.graph.adj
+        for u, v in mesh.graph.edges():
+            self._add_edge_triangles(u, v, adj)
+        if track_cliques:
+            self.enable_cliques()
+        mesh.add_listener(self.on_mesh_event)
+
+    def enable_cliques(self) -> None:
+        """Starts tracking 4-cliques, seeding them from the current triangles."""
+        if self.track_cliques:
+            return
+        self.track_cliques = True
+        for a, b, c in self.triangles:
+            self._add_triangle_cliques(a, b, c)
+
+    def _add_triangle_cliques(self, a: int, b: int, c: int) -> None:
+        triangles = self.triangles
+        for d in self.apexes.get((a, b), ()):
+            if d != c and tuple(sorted((a, c, d))) in triangles and tuple(sorted((b, c, d))) in triangles:
+                self.cliques.add(tuple(sorted((a, b, c, d))))  # type: ignore[arg-type]
+
+    def _add_triangle(self, a: int, b: int, c: int) -> None:
+        tri: Triangle = tuple(sorted((a, b, c)))  # type: ignore[assignment]
+        if self.triangles.add(tri):
+            x, y, z = tri
+            self.apexes.setdefault((x, y), set()).add(z)
+            self.apexes.setdefault((x, z), set()).add(y)
+            self.apexes.setdefault((y, z), set()).add(x)
+            if self.track_cliques:
+                self._add_triangle_cliques(x, y, z)
+
+    def _add_edge_triangles(self, u: int, v: int, adj) -> None:
+        nu, nv = adj[u], adj[v]
+        if len(nu) > len(nv):
+            nu, nv = nv, nu
+        for w in nu:
+            if w in nv:
+                self._add_triangle(u, v, w)
+
+    def _remove_edge_triangles(self, u: int, v: int) -> None:
+        key = edge_key(u, v)
+        for w in self.apexes.pop(key, ()):
+            tri: Triangle = tuple(sorted((u, v, w)))  # type: ignore[assignment]
+            self.triangles.discard(tri)
+            if self.track_cliques:
+                # Every 4-clique on (u, v, w) also contains a triangle (u, w, d).
+                for d in self.apexes.get(edge_key(u, w), ()):
+                    if d != v:
+                        self.cliques.discard(tuple(sorted((u, v, w, d))))  # type: ignore[arg-type]
+            # (u, w) loses apex v and (v, w) loses apex u.
+            for side, apex in ((edge_key(u, w), v), (edge_key(v, w), u)):
+                apexes = self.apexes.get(side)
+                if apexes is not None:
+                    apexes.discard(apex)
+                    if not apexes:
+                        del self.apexes[side]
+
+    def on_mesh_event(self, event: MeshEvent) -> None:
+        if event.kind == EDGE_ADDED:
+            if self.mesh.graph.has_edge(event.u, event.v):
+                self._add_edge_triangles(event.u, event.v, self.mesh.graph.adj)
+        elif event.kind == EDGE_REMOVED:
+            self._remove_edge_triangles(event.u, event.v)
+
+    def triangles_on(self, u: int, v: int) -> Set[int]:
+        """Apexes of the triangles containing edge (u, v)."""
+        return self.apexes.get(edge_key(u, v), set())
+
+    def find_flip(self, triangle: Triangle, exclude: Container[int] = ()) -> Optional[Tuple[int, int, int, int]]:
+        """
+        A Pachner 2-2 flip on one of the triangle's sides, as (u, v, a, b): edge (u, v) is shared
+        by triangles (u, v, a) and (u, v, b), a and b are not adjacent, and b is not in `exclude`.
+        None if the triangle no longer exists or no side can be flipped.
+        """
+        tri: Triangle = tuple(sorted(triangle))  # type: ignore[assignment]
+        if tri not in self.triangles:
+            return None
+        adj = self.mesh.graph.adj
+        x, y, z = tri
+        for u, v, a in ((x, y, z), (x, z, y), (y, z, x)):
+            for b in self.triangles_on(u, v):
+                if b != a and b not in exclude and b not in adj[a]:
+                    return (u, v, a, b)
+        return None
+
+    def triangle_count(self, u: int, v: int) -> int:
+        """Number of triangles containing edge (u, v)."""
+        return len(self.apexes.get(edge_key(u, v), ()))
+
+    def edge_triangle_counts(self) -> torch.Tensor:
+        """(E,) triangles on every edge, aligned with `mesh.edge_index` columns."""
+        apexes = self.apexes
+        counts = [len(apexes.get(edge_key(u, v), ())) for u, v in self.mesh.edge_index.t().tolist()]
+        return torch.tensor(counts, dtype=torch.long, device=self.mesh.device)
+
+    def forman_curvature(self) -> torch.Tensor:
+        """
+        (E,) augmented Forman curvature of every edge, aligned with `mesh.edge_index`:
+        F(u, v) = 4 - deg(u) - deg(v) + 3 * triangles(u, v).
+        Negative on tree-like bridges between hubs, positive inside dense triangulated patches.
+        """
+        ei = self.mesh.edge_index
+        degree = torch.bincount(ei.reshape(-1), minlength=self.mesh.num_nodes)
+        return 4 - degree[ei[0]] - degree[ei[1]] + 3 * self.edge_triangle_counts()
+
+    def curvature_stats(self) -> Dict[str, float]:
+        """Mean / min / max augmented Forman curvature over all edges, plus triangle and 4-clique counts."""
+        stats: Dict[str, float] = {"triangles": float(len(self.triangles))}
+        if self.track_cliques:
+            stats["cliques"] = float(len(self.cliques))
+        curvature = self.forman_curvature().float()
+        if curvature.numel():
+            stats.update(mean=curvature.mean().item(), min=curvature.min().item(), max=curvature.max().item())
+        return stats
+
+    def sample(self, k: int, rng: random.Random) -> List[Triangle]:
+        return self.triangles.sample(k, rng)
+
+    def __len__(self) -> int:
+        return len(self.triangles)
+
+    def close(self) -> None:
+        self.mesh.remove_listener(self.on_mesh_event)
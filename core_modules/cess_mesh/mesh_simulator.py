@@ -1,17 +1,74 @@
 # ~/aurora_project/core_modules/cess_mesh/mesh_simulator.py
 import torch
 import networkx as nx
-import matplotlib.pyplot as plt
-from typing import List, Tuple, Dict, Set, Any, Optional
-import random
+from typing import TYPE_CHECKING, Callable, List, NamedTuple, Sequence, Tuple, Dict, Set, Any, Optional
+import logging
+
+from core_modules.device import get_device
+from core_modules.rng import RNGStreams
+from .generators import uniform_random_edges
+from .mesh_storage import EdgeStore, NodeAttrView, EdgeAttrView, gc_paused
+
+if TYPE_CHECKING:
+    from .mesh_index import TriangleIndex
+
+logger = logging.getLogger(__name__)
 
 # --- Global Constants / Module-Level Definitions ---
-if not torch.cuda.is_available():
-    print("WARNING: CUDA is not available. CESS Mesh will run on CPU. Performance will be severely limited.")
-    DEVICE: torch.device = torch.device("cpu")
-else:
-    DEVICE: torch.device = torch.device("cuda")
-    print(f"CUDA available. CESS Mesh will use GPU: {torch.cuda.get_device_name(0)}")
+def __getattr__(name: str) -> Any:
+    # `DEVICE` used to be probed at import time; it is now resolved lazily on first access.
+    if name == "DEVICE":
+        return get_device()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+# Counter-based RNG stream of the per-node evolution noise (see RNGStreams.normal).
+NOISE_STREAM: int = 0
+
+# --- Mesh mutation events ---
+EDGE_ADDED: str = "edge_added"
+EDGE_REMOVED: str = "edge_removed"
+EDGE_WEIGHT_CHANGED: str = "edge_weight_changed"
+NODE_ADDED: str = "node_added"
+NODE_REMOVED: str = "node_removed"
+NODES_UPDATED: str = "nodes_updated"
+TICK_COMPLETED: str = "tick_completed"
+
+
+class MeshEvent(NamedTuple):
+    """
+    A single topology or edge-attribute change, delivered to mesh listeners.
+    Edge events carry the edge's endpoints. NODE_ADDED carries the new ID in `u` (`v` is -1).
+    NODE_REMOVED carries the ID that ceased to exist in `u` (always the former highest ID)
+    and the ID it was renumbered to in `v` (equal to `u` when the highest ID itself was removed).
+    NODES_UPDATED marks a wholesale node-state update; `u` is the tick whose state `node_state` now holds.
+    TICK_COMPLETED closes an evolution tick (after its rewires and state update); `u` is that tick.
+    """
+    kind: str
+    u: int
+    v: int
+
+
+MeshListener = Callable[[MeshEvent], None]
+
+def _bulk_graph(num_nodes: int, edge_index: torch.Tensor) -> nx.Graph:
+    """
+    Builds the networkx graph of nodes 0..num_nodes-1 and a block of distinct edges by
+    filling its node and adjacency dicts directly. Same result as `add_nodes_from` +
+    `add_edges_from`, without their per-item argument handling, which dominates
+    construction time for meshes with millions of edges.
+    """
+    graph = nx.Graph()
+    with gc_paused():
+        nodes: Dict[int, Dict[str, Any]] = {n: {} for n in range(num_nodes)}
+        adj: Dict[int, Dict[int, Dict[str, Any]]] = {n: {} for n in range(num_nodes)}
+        for u, v in zip(edge_index[0].tolist(), edge_index[1].tolist()):
+            data: Dict[str, Any] = {}
+            adj[u][v] = data
+            adj[v][u] = data
+    graph._node = nodes  # Assigning resets networkx's cached node and adjacency views.
+    graph._adj = adj
+    return graph
+
 
 # --- CESSMesh Class Definition ---
 class CESSMesh:
@@ -19,77 +76,396 @@ class CESSMesh:
     A classical simulation of an emergent spacetime mesh, representing AURORA's computational fabric.
     This uses a graph-based approach with dynamic evolution rules inspired by Pachner moves.
     """
-    graph: nx.Graph
-    node_attrs: Dict[int, torch.Tensor]
-    edge_attrs: Dict[Tuple[int, int], torch.Tensor]
+    node_state: torch.Tensor
+    node_attrs: NodeAttrView
+    edge_attrs: EdgeAttrView
+
+    # Width of each node's state vector.
+    NODE_STATE_DIM: int = 4
 
     def __init__(self, num_nodes: int = 10, seed: Optional[int] = None):
-        if seed is not None:
-            random.seed(seed)
-            torch.manual_seed(seed)
-            if torch.cuda.is_available():
-                torch.cuda.manual_seed_all(seed)
-        
-        self.graph = nx.Graph()
-        self.node_attrs = {i: torch.rand(4, device=DEVICE) for i in range(num_nodes)}
-        self.edge_attrs = {}
-
-        for _ in range(num_nodes * 2):
-            u, v = random.sample(range(num_nodes), 2)
-            if not self.graph.has_edge(u, v):
-                self.graph.add_edge(u, v)
-                self.edge_attrs[(u, v)] = torch.rand(1, device=DEVICE)
-                self.edge_attrs[(v, u)] = self.edge_attrs[(u, v)]
-
-        print(f"Initialized CESS Mesh with {self.graph.number_of_nodes()} nodes and {self.graph.number_of_edges()} edges.")
+        self.device = get_device()
+        # Every random draw goes through the mesh's own streams; global RNG state is untouched.
+        self.rng = RNGStreams(seed, device=self.device)
+        # The classic topology: 2N uniformly drawn node pairs, de-duplicated in one sort.
+        edge_index = uniform_random_edges(num_nodes, num_nodes * 2, generator=self.rng.substream(0).torch)
+        self._init_from_edges(num_nodes, edge_index, None, None)
+
+    @classmethod
+    def from_edge_index(cls, edge_index: torch.Tensor, num_nodes: Optional[int] = None,
+                        node_state: Optional[torch.Tensor] = None, edge_weight: Optional[torch.Tensor] = None,
+                        seed: Optional[int] = None, copy: bool = True) -> "CESSMesh":
+        """
+        Builds a mesh around a `(2, E)` edge index in bulk, e.g. from cess_mesh.generators.
+        Edges must be distinct and free of self-loops (see generators.dedup_edges). Node states
+        and edge weights are drawn in one tensor each unless given; `seed` seeds the mesh's streams.
+        With `copy=False` the given tensors become the mesh's storage as they are (e.g. arrays
+        memory-mapped from a snapshot); they are only copied once the mesh outgrows them, and
+        the networkx graph and edge-slot map are only built on first use.
+        """
+        mesh = cls.__new__(cls)
+        mesh.device = get_device()
+        mesh.rng = RNGStreams(seed, device=mesh.device)
+        if num_nodes is None:
+            num_nodes = int(edge_index.max().item()) + 1 if edge_index.numel() else 0
+        mesh._init_from_edges(num_nodes, edge_index, node_state, edge_weight, copy)
+        return mesh
+
+    def _init_from_edges(self, num_nodes: int, edge_index: torch.Tensor, node_state: Optional[torch.Tensor],
+                         edge_weight: Optional[torch.Tensor], copy: bool = True) -> None:
+        self.tick_count = 0
+        self._graph: Optional[nx.Graph] = _bulk_graph(num_nodes, edge_index) if copy else None
+        # Node state lives in one (N, 4) tensor; edges live in a packed COO store.
+        # `node_attrs` / `edge_attrs` are thin dict-style views over that storage.
+        if node_state is None:
+            node_state = torch.rand(num_nodes, self.NODE_STATE_DIM, generator=self.rng.torch, device=self.device)
+        self.node_state = node_state.to(self.device) if not copy or node_state.device != self.device else node_state.clone()
+        num_edges = edge_index.shape[1]
+        self._edges = EdgeStore(self.device, capacity=max(num_nodes * 2, num_edges) if copy else 1)
+        self._version = 0
+        self._csr_cache: Optional[Tuple[int, Tuple[torch.Tensor, torch.Tensor, torch.Tensor]]] = None
+        self._listeners: List[MeshListener] = []
+        self._triangle_index: Optional["TriangleIndex"] = None
+        self.node_attrs = NodeAttrView(self)
+        self.edge_attrs = EdgeAttrView(self._edges, on_write=self._on_edge_attr_write)
+
+        if num_edges:
+            if edge_weight is None:
+                edge_weight = torch.rand(num_edges, generator=self.rng.torch, device=self.device)
+            if copy:
+                self._edges.add_many(edge_index.long(), edge_weight)
+            else:
+                self._edges.adopt(edge_index.to(self.device), edge_weight.to(self.device))
+
+        logger.info("Initialized CESS Mesh with %d nodes and %d edges.", num_nodes, num_edges)
+
+    @property
+    def graph(self) -> nx.Graph:
+        """The networkx topology, kept in step with the edge store (built on first use when adopted)."""
+        if self._graph is None:
+            self._graph = _bulk_graph(self.num_nodes, self.edge_index)
+        return self._graph
+
+    @property
+    def node_state(self) -> torch.Tensor:
+        """(N, 4) node state tensor (a view of the first N rows of a growable buffer)."""
+        return self._node_buffer[:self._num_nodes]
+
+    @node_state.setter
+    def node_state(self, state: torch.Tensor) -> None:
+        self._node_buffer = state
+        self._num_nodes = state.shape[0]
+
+    @property
+    def num_nodes(self) -> int:
+        return self._num_nodes
+
+    @property
+    def num_edges(self) -> int:
+        return self._edges.num_edges
+
+    @property
+    def edge_index(self) -> torch.Tensor:
+        """(2, E) COO index of every undirected edge, one column per edge."""
+        return self._edges.edge_index
+
+    @property
+    def edge_weight(self) -> torch.Tensor:
+        """(E,) edge attribute tensor, aligned with `edge_index` columns."""
+        return self._edges.edge_weight
+
+    @property
+    def version(self) -> int:
+        """Incremented on every topology or edge-weight change."""
+        return self._version
+
+    def csr(self) -> Tuple[torch.Tensor, torch.Tensor, torch.Tensor]:
+        """
+        Returns the symmetric CSR adjacency (indptr, indices, weights) of the mesh.
+        The result is cached until the next topology or edge-weight change.
+        """
+        if self._csr_cache is None or self._csr_cache[0] != self._version:
+            self._csr_cache = (self._version, self._edges.to_csr(self.num_nodes))
+        return self._csr_cache[1]
+
+    def add_listener(self, listener: MeshListener) -> None:
+        """Registers a callback invoked with a MeshEvent after every topology, edge-weight or node-state change and tick."""
+        self._listeners.append(listener)
+
+    def remove_listener(self, listener: MeshListener) -> None:
+        self._listeners.remove(listener)
+
+    def _notify(self, kind: str, u: int, v: int) -> None:
+        if self._listeners:
+            event = MeshEvent(kind, u, v)
+            for listener in self._listeners:
+                listener(event)
+
+    def _notify_rewires(self, moves: List[Tuple[int, int, int]]) -> None:
+        if self._listeners:
+            for u, v, w in moves:
+                self._notify(EDGE_REMOVED, u, v)
+                self._notify(EDGE_ADDED, u, w)
+
+    def add_edge(self, u: int, v: int, weight: Optional[torch.Tensor] = None) -> bool:
+        """Adds edge (u, v) with the given (or a random) weight. Returns False if it already exists."""
+        if u == v or self.graph.has_edge(u, v):
+            return False
+        self.graph.add_edge(u, v)
+        self._edges.add(u, v, weight if weight is not None else torch.rand(1, generator=self.rng.torch, device=self.device))
+        self._version += 1
+        self._notify(EDGE_ADDED, u, v)
+        return True
+
+    def remove_edge(self, u: int, v: int) -> bool:
+        """Removes edge (u, v). Returns False if it does not exist."""
+        if not self.graph.has_edge(u, v):
+            return False
+        self.graph.remove_edge(u, v)
+        self._edges.remove(u, v)
+        self._version += 1
+        self._notify(EDGE_REMOVED, u, v)
+        return True
+
+    def flip_edge(self, u: int, v: int, a: int, b: int) -> None:
+        """Replaces edge (u, v) with (a, b), keeping its weight: a Pachner 2-2 flip when (a, b) is the other diagonal."""
+        weight = self.edge_attrs[(u, v)].clone()
+        self.remove_edge(u, v)
+        self.add_edge(a, b, weight)
+
+    def add_node(self, state: Optional[torch.Tensor] = None) -> int:
+        """Appends an isolated node with the given (or a random) state and returns its ID."""
+        node = self._num_nodes
+        if node == self._node_buffer.shape[0]:
+            buffer = torch.empty(max(2 * node, 16), self.NODE_STATE_DIM, device=self.device)
+            buffer[:node] = self._node_buffer[:node]
+            self._node_buffer = buffer
+        self._node_buffer[node] = state if state is not None else torch.rand(self.NODE_STATE_DIM, generator=self.rng.torch, device=self.device)
+        self._num_nodes += 1
+        self.graph.add_node(node)
+        self._version += 1
+        self._notify(NODE_ADDED, node, -1)
+        return node
+
+    def remove_node(self, node: int) -> None:
+        """
+        Removes a node and its edges. Node IDs stay contiguous: the node with the highest ID
+        takes over the freed ID (state and edges; its edges are re-announced as removed and
+        added under the new ID), then NODE_REMOVED(u=old highest ID, v=node) is emitted.
+        """
+        if not 0 <= node < self._num_nodes:
+            raise ValueError(f"Node {node} does not exist.")
+        for w in list(self.graph.adj[node]):
+            self.remove_edge(node, w)
+        last = self._num_nodes - 1
+        if node != last:
+            moved = [(w, self.edge_attrs[(last, w)].clone()) for w in self.graph.adj[last]]
+            for w, _ in moved:
+                self.remove_edge(last, w)
+            self._node_buffer[node] = self._node_buffer[last]
+            for w, weight in moved:
+                self.add_edge(node, w, weight)
+        self.graph.remove_node(last)
+        self._num_nodes -= 1
+        self._version += 1
+        self._notify(NODE_REMOVED, last, node)
+
+    def triangle_index(self, track_cliques: bool = False) -> "TriangleIndex":
+        """
+        The mesh's incremental triangle index (see mesh_index.TriangleIndex), built on first
+        use and then kept current from mesh events in O(degree) per edge change.
+        `track_cliques=True` additionally maintains the 4-cliques from then on.
+        """
+        if self._triangle_index is None:
+            from .mesh_index import TriangleIndex  # mesh_index builds on this module.
+            self._triangle_index = TriangleIndex(self, track_cliques=track_cliques)
+        elif track_cliques:
+            self._triangle_index.enable_cliques()
+        return self._triangle_index
+
+    def drop_triangle_index(self) -> None:
+        """Detaches and discards the triangle index, so edge changes stop paying for it."""
+        if self._triangle_index is not None:
+            self._triangle_index.close()
+            self._triangle_index = None
+
+    def _on_edge_attr_write(self, u: int, v: int) -> None:
+        self._version += 1
+        self._notify(EDGE_WEIGHT_CHANGED, u, v)
 
     def _update_edge_attr(self, u: int, v: int, new_attr: torch.Tensor):
         self.edge_attrs[(u, v)] = new_attr
-        self.edge_attrs[(v, u)] = new_attr
 
     def perform_pachner_move_2_2(self) -> bool:
-        possible_edges: List[Tuple[Any, Any]] = list(self.graph.edges())
-        if not possible_edges:
-            return False
+        """
+        Rewires a single edge (u, v) to (u, w) for a random non-neighbour w of u.
+        Candidates are drawn in O(1) from the packed edge store; the full edge scan is
+        only used as a fallback when random sampling keeps failing (e.g. near-complete graphs).
+        """
+        moves = self.perform_pachner_moves(1)
+        if moves:
+            u, v, new_target = moves[0]
+            logger.debug("Rewired edge (%d,%d) to (%d,%d).", u, v, u, new_target)
+            return True
 
-        random.shuffle(possible_edges)
+        possible_edges: List[Tuple[Any, Any]] = list(self.graph.edges())
+        self.rng.random.shuffle(possible_edges)
         for u, v in possible_edges:
-            neighbors_of_u: Set[Any] = set(self.graph.neighbors(u))
-            
-            if len(neighbors_of_u) > 1:
-                other_neighbor_of_u: Any = (neighbors_of_u - {v}).pop()
-                
-                possible_targets: List[Any] = list(set(self.graph.nodes()) - {u, v, other_neighbor_of_u})
+            if self.graph.degree(u) > 1:
+                possible_targets: List[Any] = [
+                    n for n in self.graph.nodes() if n not in (u, v) and not self.graph.has_edge(u, n)
+                ]
                 if not possible_targets:
                     continue
-
-                new_target: Any = random.choice(possible_targets)
-                
-                if not self.graph.has_edge(u, new_target):
-                    self.graph.remove_edge(u, v)
-                    self.graph.add_edge(u, new_target)
-                    
-                    self.edge_attrs.pop((u,v), None)
-                    self.edge_attrs.pop((v,u), None)
-                    self.edge_attrs[(u,new_target)] = torch.rand(1, device=DEVICE)
-                    self.edge_attrs[(new_target,u)] = self.edge_attrs[(u,new_target)]
-                    
-                    print(f"Rewired edge ({u},{v}) to ({u},{new_target}).")
-                    return True
+                new_target: Any = self.rng.random.choice(possible_targets)
+                slot = self._edges.slot(u, v)
+                self.graph.remove_edge(u, v)
+                self.graph.add_edge(u, new_target)
+                self._edges.rewire_many(
+                    torch.tensor([slot], device=self.device),
+                    torch.tensor([[u], [new_target]]),
+                    torch.rand(1, generator=self.rng.torch, device=self.device),
+                )
+                self._version += 1
+                self._notify_rewires([(u, v, new_target)])
+                logger.debug("Rewired edge (%d,%d) to (%d,%d).", u, v, u, new_target)
+                return True
         return False
 
-    def update_node_properties(self):
-        for node in self.graph.nodes():
-            neighbors: List[Any] = list(self.graph.neighbors(node))
-            if neighbors:
-                neighbor_states: torch.Tensor = torch.stack([self.node_attrs[n] for n in neighbors])
-                new_state: torch.Tensor = torch.mean(neighbor_states, dim=0) + torch.randn_like(self.node_attrs[node]) * 0.1
-                self.node_attrs[node] = new_state.to(DEVICE)
-        print("Node properties updated based on local interactions.")
+    def perform_pachner_moves(self, k: int, max_rounds: int = 4) -> List[Tuple[int, int, int]]:
+        """
+        Applies up to `k` Pachner 2-2 style rewires in one call and returns them as
+        (u, old_neighbor, new_neighbor) triples.
+        - Edges are sampled by slot from the packed COO store and targets by node ID, O(1) each.
+        - A move (u, v) -> (u, w) is accepted when u keeps at least one other edge, w is not
+          u or v, and (u, w) is not already an edge; each edge slot is rewired at most once.
+        - Rejected candidates are re-drawn for up to `max_rounds` rounds.
+        - Accepted moves reuse their edge slots, so the COO index and weights are updated with
+          a single scatter at the end.
+        """
+        num_edges = self.num_edges
+        if k <= 0 or num_edges == 0 or self.num_nodes < 3:
+            return []
+
+        moves: List[Tuple[int, int, int]] = []
+        move_slots: List[int] = []
+        used_slots: Set[int] = set()
+        ei = self.edge_index
+        for _ in range(max_rounds):
+            remaining = k - len(moves)
+            if remaining <= 0:
+                break
+            slots = torch.randint(num_edges, (remaining,), generator=self.rng.torch, device=self.device)
+            pivot = torch.randint(2, (remaining,), generator=self.rng.torch, device=self.device)
+            # Either endpoint may act as the pivot u that keeps its edge.
+            candidates = ei[:, slots]
+            us = torch.where(pivot == 0, candidates[0], candidates[1])
+            vs = torch.where(pivot == 0, candidates[1], candidates[0])
+            targets = torch.randint(self.num_nodes, (remaining,), generator=self.rng.torch, device=self.device)
+            valid = (targets != us) & (targets != vs)
+
+            # Conflicts between accepted moves are resolved against the live graph, which
+            # reflects every move accepted so far in this call.
+            for s, u, v, w in zip(slots[valid].tolist(), us[valid].tolist(), vs[valid].tolist(), targets[valid].tolist()):
+                if s in used_slots or self.graph.degree(u) <= 1 or self.graph.has_edge(u, w):
+                    continue
+                self.graph.remove_edge(u, v)
+                self.graph.add_edge(u, w)
+                used_slots.add(s)
+                move_slots.append(s)
+                moves.append((u, v, w))
+                if len(moves) == k:
+                    break
+
+        if moves:
+            new_index = torch.tensor([[u for u, _, _ in moves], [w for _, _, w in moves]], dtype=torch.long)
+            self._edges.rewire_many(
+                torch.tensor(move_slots, device=self.device), new_index, torch.rand(len(moves), generator=self.rng.torch, device=self.device)
+            )
+            self._version += 1
+            self._notify_rewires(moves)
+        return moves
+
+    def perform_pachner_flips(self, k: int, max_rounds: int = 4) -> List[Tuple[int, int, int, int]]:
+        """
+        Applies up to `k` true Pachner 2-2 flips and returns them as (u, v, a, b) tuples:
+        edge (u, v), shared by triangles (u, v, a) and (u, v, b) with a and b not adjacent, is
+        replaced by the other diagonal (a, b), keeping its weight.
+        - Candidates are triangles sampled from `triangle_index()`, so no triangle is recounted;
+          they are matched and applied like `graph_rewrites.Flip22` (`TriangleIndex.find_flip`, `flip_edge`).
+        - Flips in one call touch disjoint node sets; a triangle whose nodes are already used
+          is skipped, and candidates are re-drawn for up to `max_rounds` rounds.
+        """
+        index = self.triangle_index()
+        flips: List[Tuple[int, int, int, int]] = []
+        used: Set[int] = set()
+        for _ in range(max_rounds):
+            if len(flips) >= k or not len(index):
+                break
+            for tri in index.sample(k - len(flips), self.rng.random):
+                if any(n in used for n in tri):
+                    continue  # Overlaps an earlier flip.
+                flip = index.find_flip(tri, exclude=used)
+                if flip is None:
+                    continue  # Removed by an earlier flip, or no side can be flipped.
+                self.flip_edge(*flip)
+                used.update(flip)
+                flips.append(flip)
+                if len(flips) == k:
+                    break
+        return flips
+
+    def apply_rewires(self, moves: Sequence[Tuple[int, int, int]]) -> None:
+        """
+        Applies precomputed rewires (u, v, w) -- edge (u, v) becomes (u, w) with a fresh
+        random weight -- as one batch, e.g. the moves returned by parallel partition workers.
+        Every (u, v) must exist and every (u, w) must be new; the moves must not overlap.
+        """
+        if not moves:
+            return
+        slots: List[int] = []
+        for u, v, w in moves:
+            slot = self._edges.slot(u, v)
+            if slot is None or self.graph.has_edge(u, w):
+                raise ValueError(f"Cannot rewire ({u},{v}) to ({u},{w}).")
+            self.graph.remove_edge(u, v)
+            self.graph.add_edge(u, w)
+            slots.append(slot)
+        new_index = torch.tensor([[u for u, _, _ in moves], [w for _, _, w in moves]], dtype=torch.long)
+        self._edges.rewire_many(torch.tensor(slots, device=self.device), new_index, torch.rand(len(moves), generator=self.rng.torch, device=self.device))
+        self._version += 1
+        self._notify_rewires(list(moves))
+
+    def update_node_properties(self, noise_scale: float = 0.1):
+        """
+        Synchronously replaces every node's state with the mean of its neighbours' states
+        plus Gaussian noise. All neighbour means come from a single scatter-add over the
+        COO edge index. The noise is counter-based, keyed by (seed, tick, node), so a
+        partitioned run (see cess_mesh.parallel) draws exactly the same noise per node.
+        Isolated nodes keep their state.
+        """
+        num_nodes = self.num_nodes
+        ei = self.edge_index
+        # Each undirected edge contributes in both directions: src -> dst.
+        src = torch.cat([ei[0], ei[1]])
+        dst = torch.cat([ei[1], ei[0]])
+        neighbor_sum = torch.zeros_like(self.node_state).index_add_(0, dst, self.node_state[src])
+        degree = torch.bincount(dst, minlength=num_nodes).unsqueeze(1)
+        has_neighbors = degree > 0
+        neighbor_mean = neighbor_sum / degree.clamp(min=1).to(self.node_state.dtype)
+        rows = torch.arange(num_nodes, device=self.device)
+        noise = self.rng.normal(NOISE_STREAM, self.tick_count, rows, self.NODE_STATE_DIM, self.node_state.dtype) * noise_scale
+        self.tick_count += 1
+        # Written in place so the storage (and any views onto it) stays stable.
+        self.node_state.copy_(torch.where(has_neighbors, neighbor_mean + noise, self.node_state))
+        self._notify(NODES_UPDATED, self.tick_count - 1, -1)
+        self._notify(TICK_COMPLETED, self.tick_count - 1, -1)
+        logger.debug("Node properties updated based on local interactions.")
 
     # CORRECTED: Added title_suffix parameter
     def visualize(self, iteration: int = 0, title_suffix: str = ""):
         """Basic visualization of the graph."""
+        import matplotlib.pyplot as plt  # Plotting is optional and heavy to import; load it on demand.
         plt.figure(figsize=(8, 6))
         pos: Dict[Any, Any] = nx.spring_layout(self.graph, seed=42)
         nx.draw(self.graph, pos, with_labels=True, node_color='skyblue', node_size=700, edge_color='gray', font_size=10)
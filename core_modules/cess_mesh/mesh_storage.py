@@ -0,0 +1,232 @@
+# ~/aurora_project/core_modules/cess_mesh/mesh_storage.py
+import gc
+from contextlib import contextmanager
+import torch
+from typing import Callable, Dict, Iterator, Mapping, MutableMapping, Optional, Protocol, Tuple, Union
+
+EdgeKey = Tuple[int, int]
+WeightLike = Union[float, torch.Tensor]
+WriteHook = Callable[[int, int], None]
+
+
+class HasNodeState(Protocol):
+    node_state: torch.Tensor
+
+
+def edge_key(u: int, v: int) -> EdgeKey:
+    """Canonical (undirected) key for an edge: the smaller endpoint comes first."""
+    return (u, v) if u < v else (v, u)
+
+
+@contextmanager
+def gc_paused() -> Iterator[None]:
+    """
+    Pauses the cyclic garbage collector while building millions of small containers (dicts,
+    tuples), which are never cyclic here but would otherwise trigger repeated full collections.
+    """
+    was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if was_enabled:
+            gc.enable()
+
+
+class EdgeStore:
+    """
+    Contiguous COO storage for the undirected edges of a CESS Mesh.
+    - `index[:, :num_edges]` holds one (u, v) column per edge, in the orientation it was added.
+    - `weight[:num_edges]` holds the matching scalar edge attribute.
+    - `slots` maps the canonical edge key to its column, so lookups stay O(1); after
+      `adopt` it is only built on first use.
+    Live edges are always packed into the first `num_edges` columns (removal swaps the
+    last column into the freed slot), which keeps every bulk op a plain slice.
+    """
+    def __init__(self, device: torch.device, capacity: int = 16):
+        capacity = max(capacity, 1)
+        self.device = device
+        self.index: torch.Tensor = torch.empty((2, capacity), dtype=torch.long, device=device)
+        self.weight: torch.Tensor = torch.empty(capacity, device=device)
+        self._slots: Optional[Dict[EdgeKey, int]] = {}
+        self.num_edges: int = 0
+
+    @property
+    def slots(self) -> Dict[EdgeKey, int]:
+        if self._slots is None:
+            ei = self.edge_index
+            lo, hi = torch.minimum(ei[0], ei[1]), torch.maximum(ei[0], ei[1])
+            with gc_paused():
+                self._slots = dict(zip(zip(lo.tolist(), hi.tolist()), range(self.num_edges)))
+        return self._slots
+
+    @property
+    def capacity(self) -> int:
+        return self.index.shape[1]
+
+    @property
+    def edge_index(self) -> torch.Tensor:
+        """(2, E) view of the live edge columns."""
+        return self.index[:, :self.num_edges]
+
+    @property
+    def edge_weight(self) -> torch.Tensor:
+        """(E,) view of the live edge weights."""
+        return self.weight[:self.num_edges]
+
+    def _grow(self, min_capacity: int) -> None:
+        new_capacity = max(min_capacity, self.capacity * 2)
+        index = torch.empty((2, new_capacity), dtype=torch.long, device=self.device)
+        weight = torch.empty(new_capacity, device=self.device)
+        index[:, :self.num_edges] = self.index[:, :self.num_edges]
+        weight[:self.num_edges] = self.weight[:self.num_edges]
+        self.index, self.weight = index, weight
+
+    def slot(self, u: int, v: int) -> Optional[int]:
+        return self.slots.get(edge_key(u, v))
+
+    def add(self, u: int, v: int, weight: WeightLike) -> int:
+        """Appends edge (u, v) and returns its slot. The caller guarantees it is new."""
+        if self.num_edges == self.capacity:
+            self._grow(self.num_edges + 1)
+        s = self.num_edges
+        self.index[0, s] = u
+        self.index[1, s] = v
+        self.weight[s] = weight if not isinstance(weight, torch.Tensor) else weight.reshape(())
+        self.slots[edge_key(u, v)] = s
+        self.num_edges += 1
+        return s
+
+    def add_many(self, edge_index: torch.Tensor, weights: torch.Tensor) -> None:
+        """Appends a (2, M) block of new, de-duplicated edges in one copy."""
+        m = edge_index.shape[1]
+        if m == 0:
+            return
+        if self.num_edges + m > self.capacity:
+            self._grow(self.num_edges + m)
+        start = self.num_edges
+        self.index[:, start:start + m] = edge_index.to(self.device)
+        self.weight[start:start + m] = weights.to(self.device)
+        lo, hi = torch.minimum(edge_index[0], edge_index[1]), torch.maximum(edge_index[0], edge_index[1])
+        with gc_paused():
+            self.slots.update(zip(zip(lo.tolist(), hi.tolist()), range(start, start + m)))
+        self.num_edges += m
+
+    def adopt(self, edge_index: torch.Tensor, weights: torch.Tensor) -> None:
+        """
+        Uses a (2, M) block of new, de-duplicated edges and their weights as the (empty) store's
+        buffers, without copying. The slot map is built on first use.
+        """
+        self.index, self.weight = edge_index, weights
+        self.num_edges = edge_index.shape[1]
+        self._slots = None
+
+    def remove(self, u: int, v: int) -> bool:
+        """Removes edge (u, v), moving the last live column into its slot."""
+        s = self.slots.pop(edge_key(u, v), None)
+        if s is None:
+            return False
+        last = self.num_edges - 1
+        if s != last:
+            self.index[:, s] = self.index[:, last]
+            self.weight[s] = self.weight[last]
+            lu, lv = self.index[:, s].tolist()
+            self.slots[edge_key(lu, lv)] = s
+        self.num_edges -= 1
+        return True
+
+    def rewire_many(self, slots: torch.Tensor, new_index: torch.Tensor, weights: torch.Tensor) -> None:
+        """
+        Overwrites the edges in `slots` with the (2, M) columns of `new_index` in one shot.
+        The caller guarantees the slots are distinct and the new edges do not already exist.
+        """
+        old_keys = [edge_key(u, v) for u, v in self.index[:, slots].t().tolist()]
+        for key in old_keys:
+            del self.slots[key]
+        self.index[:, slots] = new_index.to(self.device)
+        self.weight[slots] = weights.to(self.device)
+        for s, (u, v) in zip(slots.tolist(), new_index.t().tolist()):
+            self.slots[edge_key(u, v)] = s
+
+    def to_csr(self, num_nodes: int) -> Tuple[torch.Tensor, torch.Tensor, torch.Tensor]:
+        """
+        Builds a symmetric CSR view (indptr, indices, weights) of the live edges.
+        Each undirected edge appears once in the row of either endpoint.
+        """
+        ei = self.edge_index
+        rows = torch.cat([ei[0], ei[1]])
+        cols = torch.cat([ei[1], ei[0]])
+        weights = torch.cat([self.edge_weight, self.edge_weight])
+        order = torch.argsort(rows * max(num_nodes, 1) + cols)
+        counts = torch.bincount(rows, minlength=num_nodes)
+        indptr = torch.zeros(num_nodes + 1, dtype=torch.long, device=self.device)
+        indptr[1:] = torch.cumsum(counts, dim=0)
+        return indptr, cols[order], weights[order]
+
+
+class NodeAttrView(MutableMapping[int, torch.Tensor]):
+    """
+    Dict-style view over a mesh's `(N, D)` node state tensor.
+    `view[i]` returns row i (a view, not a copy); assignment writes the row in place.
+    """
+    def __init__(self, mesh: HasNodeState):
+        self._mesh = mesh
+
+    def __getitem__(self, node: int) -> torch.Tensor:
+        if node not in self:
+            raise KeyError(node)
+        return self._mesh.node_state[node]
+
+    def __setitem__(self, node: int, value: torch.Tensor) -> None:
+        if node not in self:
+            raise KeyError(node)
+        self._mesh.node_state[node] = value
+
+    def __delitem__(self, node: int) -> None:
+        raise TypeError("Node attributes cannot be deleted independently of the mesh.")
+
+    def __contains__(self, node: object) -> bool:
+        return isinstance(node, int) and 0 <= node < self._mesh.node_state.shape[0]
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(range(self._mesh.node_state.shape[0]))
+
+    def __len__(self) -> int:
+        return self._mesh.node_state.shape[0]
+
+
+class EdgeAttrView(Mapping[EdgeKey, torch.Tensor]):
+    """
+    Dict-style view over an EdgeStore, keyed by both (u, v) and (v, u) like the
+    original per-edge dict. Values are 1-element views into the weight tensor, so they
+    stay valid only until the next topology change.
+    """
+    def __init__(self, store: EdgeStore, on_write: Optional[WriteHook] = None):
+        self._store = store
+        self._on_write = on_write
+
+    def __getitem__(self, key: EdgeKey) -> torch.Tensor:
+        s = self._store.slot(*key)
+        if s is None:
+            raise KeyError(key)
+        return self._store.weight[s:s + 1]
+
+    def __setitem__(self, key: EdgeKey, value: WeightLike) -> None:
+        s = self._store.slot(*key)
+        if s is None:
+            raise KeyError(f"Edge {key} does not exist; add it to the mesh first.")
+        self._store.weight[s] = value if not isinstance(value, torch.Tensor) else value.reshape(())
+        if self._on_write is not None:
+            self._on_write(key[0], key[1])
+
+    def __contains__(self, key: object) -> bool:
+        return isinstance(key, tuple) and len(key) == 2 and self._store.slot(*key) is not None
+
+    def __iter__(self) -> Iterator[EdgeKey]:
+        for u, v in self._store.edge_index.t().tolist():
+            yield (u, v)
+            yield (v, u)
+
+    def __len__(self) -> int:
+        return 2 * self._store.num_edges
+
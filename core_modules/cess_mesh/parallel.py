@@ -0,0 +1,276 @@
+# ~/aurora_project/core_modules/cess_mesh/parallel.py
+import logging
+import math
+from collections import deque
+from multiprocessing.connection import Connection
+from typing import List, NamedTuple, Optional, Set, Tuple
+
+import torch
+import torch.multiprocessing as mp
+
+from core_modules.rng import RNGStreams
+from .mesh_simulator import CESSMesh, NODES_UPDATED, NOISE_STREAM, TICK_COMPLETED
+from .mesh_storage import EdgeKey, edge_key
+
+logger = logging.getLogger(__name__)
+
+Rewire = Tuple[int, int, int]
+
+
+def greedy_partition(mesh: CESSMesh, num_parts: int) -> torch.Tensor:
+    """
+    Splits the mesh into `num_parts` connected-ish regions of (almost) equal size by greedy
+    BFS region growing: each part grows breadth-first from the lowest unassigned node until
+    it holds ceil(N / num_parts) nodes. O(N + E). Returns the `(N,)` part of every node.
+    """
+    num_nodes = mesh.num_nodes
+    target = max(1, math.ceil(num_nodes / max(num_parts, 1)))
+    parts = [-1] * num_nodes
+    adj = mesh.graph.adj
+    next_seed = 0
+    for p in range(num_parts):
+        size = 0
+        queue: deque = deque()
+        while size < target:
+            if not queue:
+                while next_seed < num_nodes and parts[next_seed] != -1:
+                    next_seed += 1
+                if next_seed == num_nodes:
+                    break
+                queue.append(next_seed)
+            node = queue.popleft()
+            if parts[node] != -1:
+                continue
+            parts[node] = p
+            size += 1
+            queue.extend(n for n in adj[node] if parts[n] == -1)
+    return torch.tensor(parts, dtype=torch.long)
+
+
+class PartitionPlan(NamedTuple):
+    """
+    A domain decomposition of a mesh.
+    - `parts`: `(N,)` owning part of every node;
+    - `owned[p]`: nodes part p updates;
+    - `halo[p]`: nodes of other parts adjacent to part p, whose state p reads each tick;
+    - `edges[p]`: `(2, E_p)` every edge with at least one endpoint in part p;
+    - `edge_cut`: number of edges whose endpoints lie in different parts.
+    """
+    parts: torch.Tensor
+    owned: List[torch.Tensor]
+    halo: List[torch.Tensor]
+    edges: List[torch.Tensor]
+    edge_cut: int
+
+    @classmethod
+    def build(cls, mesh: CESSMesh, parts: torch.Tensor) -> "PartitionPlan":
+        ei = mesh.edge_index.cpu()
+        pu, pv = parts[ei[0]], parts[ei[1]]
+        owned, halo, edges = [], [], []
+        for p in range(int(parts.max().item()) + 1 if parts.numel() else 0):
+            local_edges = ei[:, (pu == p) | (pv == p)]
+            endpoints = local_edges.reshape(-1)
+            owned.append(torch.nonzero(parts == p).flatten())
+            halo.append(torch.unique(endpoints[parts[endpoints] != p]))
+            edges.append(local_edges)
+        return cls(parts, owned, halo, edges, int((pu != pv).sum().item()))
+
+    @property
+    def num_parts(self) -> int:
+        return len(self.owned)
+
+
+class PartitionWorker:
+    """
+    Evolves one part of a partitioned mesh against shared, double-buffered node state.
+    Tick t reads every owned and halo row from `buffers[t % 2]` (the halo exchange) and
+    writes the owned rows of `buffers[(t + 1) % 2]`, so no part ever reads a row another
+    part is writing. Rewires are local: both endpoints of the rewired edge and its new
+    target are owned, so the halo (and every other part's edges) never change.
+    """
+    def __init__(self, part: int, owned: torch.Tensor, halo: torch.Tensor, edges: torch.Tensor,
+                 buffers: torch.Tensor, rng: RNGStreams, noise_scale: float = 0.1, rewires_per_tick: int = 0):
+        self.part = part
+        self.buffers = buffers
+        self.noise_scale = noise_scale
+        self.rewires_per_tick = rewires_per_tick
+        self.nodes = torch.cat([owned, halo])
+        self.global_ids: List[int] = self.nodes.tolist()
+        self.num_owned = owned.numel()
+        lookup = torch.full((buffers.shape[1],), -1, dtype=torch.long)
+        lookup[self.nodes] = torch.arange(self.nodes.numel())
+        # Edges in local IDs: owned nodes are 0..num_owned-1, halo nodes follow.
+        self.edges = lookup[edges].clone()
+        self.keys: Set[EdgeKey] = {edge_key(u, v) for u, v in self.edges.t().tolist()}
+        self.degree: List[int] = torch.bincount(self.edges.reshape(-1), minlength=self.nodes.numel()).tolist()
+        # Directed messages into owned rows: column s of `edges` sends edges[0] -> edges[1]
+        # at position s and edges[1] -> edges[0] at position s + E of the doubled arrays.
+        num_edges = self.edges.shape[1]
+        src = torch.cat([self.edges[0], self.edges[1]])
+        dst = torch.cat([self.edges[1], self.edges[0]])
+        self._inward = torch.nonzero(dst < self.num_owned).flatten()
+        self._src, self._dst = src[self._inward], dst[self._inward]
+        self._in_degree = torch.bincount(self._dst, minlength=self.num_owned).unsqueeze(1)
+        # Interior columns keep both directions, at these positions of `_src` / `_dst`.
+        position = torch.full((2 * num_edges,), -1, dtype=torch.long)
+        position[self._inward] = torch.arange(self._inward.numel())
+        self._position = position.view(2, num_edges)
+        self._owned_rows = owned
+        # Noise comes from the mesh's counter-based stream (identical to a serial run);
+        # rewires from this part's own substream.
+        self.rng = rng
+        self.rewire_rng = rng.substream(part).random
+
+    def _rewire(self) -> List[Rewire]:
+        """Up to `rewires_per_tick` rewires of interior edges to owned targets; returns global IDs."""
+        num_edges = self.edges.shape[1]
+        if self.rewires_per_tick <= 0 or num_edges == 0 or self.num_owned < 3:
+            return []
+        moves: List[Rewire] = []
+        used_slots: Set[int] = set()  # Each edge moves at most once per tick, as in perform_pachner_moves.
+        for _ in range(self.rewires_per_tick):
+            slot = self.rewire_rng.randrange(num_edges)
+            if slot in used_slots:
+                continue
+            a, b = self.edges[:, slot].tolist()
+            u, v = (a, b) if self.rewire_rng.random() < 0.5 else (b, a)
+            w = self.rewire_rng.randrange(self.num_owned)
+            if (u >= self.num_owned or v >= self.num_owned or w in (u, v)
+                    or self.degree[u] <= 1 or edge_key(u, w) in self.keys):
+                continue
+            used_slots.add(slot)
+            self.keys.discard(edge_key(u, v))
+            self.keys.add(edge_key(u, w))
+            self.edges[0, slot], self.edges[1, slot] = u, w
+            forward, backward = self._position[:, slot].tolist()
+            self._src[forward], self._dst[forward] = u, w
+            self._src[backward], self._dst[backward] = w, u
+            self._in_degree[v] -= 1
+            self._in_degree[w] += 1
+            self.degree[v] -= 1
+            self.degree[w] += 1
+            moves.append((self.global_ids[u], self.global_ids[v], self.global_ids[w]))
+        return moves
+
+    def tick(self, t: int, step: int) -> List[Rewire]:
+        """
+        Rewires, then updates the owned node states for local tick t, which is tick `step`
+        of the mesh's noise stream. Returns the rewires.
+        """
+        moves = self._rewire()
+        front, back = self.buffers[t % 2], self.buffers[(t + 1) % 2]
+        x = front.index_select(0, self.nodes)
+        neighbor_sum = x.new_zeros(self.num_owned, x.shape[1]).index_add_(0, self._dst, x.index_select(0, self._src))
+        degree = self._in_degree
+        neighbor_mean = neighbor_sum / degree.clamp(min=1).to(x.dtype)
+        noise = self.rng.normal(NOISE_STREAM, step, self._owned_rows, x.shape[1], x.dtype) * self.noise_scale
+        back.index_copy_(0, self._owned_rows, torch.where(degree > 0, neighbor_mean + noise, x[:self.num_owned]))
+        return moves
+
+
+def _worker_loop(worker: PartitionWorker, conn: Connection) -> None:
+    torch.set_num_threads(1)  # One core per partition; intra-op threads would oversubscribe.
+    while True:
+        message = conn.recv()
+        if message is None:
+            break
+        conn.send(worker.tick(*message))
+    conn.close()
+
+
+class ParallelMeshEvolver:
+    """
+    Domain-decomposed evolution of a CESS Mesh across a pool of worker processes.
+    The mesh is split with `greedy_partition`; each worker owns one part, runs the
+    `update_node_properties` rule (neighbour mean plus noise) and local rewires on it, and
+    exchanges halo states through a shared-memory, double-buffered `(2, N, 4)` state tensor.
+    Each tick is a barrier: the coordinator collects every worker's rewires and applies them
+    to the mesh (notifying its listeners) before the next tick starts. `num_workers=0` runs
+    the same partitions in-process, which is useful for debugging and as the serial baseline.
+    Per-node noise comes from the mesh's counter-based stream, so without rewires the node
+    states are bit-identical to calling `mesh.update_node_properties()` serially, for any
+    number of parts; with rewires, results depend on the partitioning but not on `num_workers`.
+
+        with ParallelMeshEvolver(mesh, num_parts=4) as evolver:
+            evolver.run(100)  # mesh.node_state and mesh topology are current afterwards
+    """
+    def __init__(self, mesh: CESSMesh, num_parts: int, num_workers: Optional[int] = None,
+                 noise_scale: float = 0.1, rewires_per_tick: int = 0):
+        if mesh.device.type != "cpu":
+            raise ValueError("ParallelMeshEvolver shares node state through CPU shared memory.")
+        self.mesh = mesh
+        self.plan = PartitionPlan.build(mesh, greedy_partition(mesh, num_parts))
+        self.buffers = torch.empty((2,) + tuple(mesh.node_state.shape), dtype=mesh.node_state.dtype).share_memory_()
+        self.buffers[0] = mesh.node_state
+        self.ticks = 0
+        self.workers = [
+            PartitionWorker(p, self.plan.owned[p], self.plan.halo[p], self.plan.edges[p], self.buffers,
+                            mesh.rng, noise_scale, rewires_per_tick)
+            for p in range(self.plan.num_parts)
+        ]
+        self._conns: List[Connection] = []
+        self._processes: List[mp.Process] = []
+        num_workers = self.plan.num_parts if num_workers is None else num_workers
+        if num_workers > 0:
+            if num_workers != self.plan.num_parts:
+                raise ValueError("Each worker process owns exactly one part; use num_workers == num_parts or 0.")
+            ctx = mp.get_context()
+            for worker in self.workers:
+                parent, child = ctx.Pipe()
+                process = ctx.Process(target=_worker_loop, args=(worker, child), daemon=True)
+                process.start()
+                child.close()
+                self._conns.append(parent)
+                self._processes.append(process)
+        logger.info("Partitioned %d nodes into %d parts (edge cut %d) across %d worker processes.",
+                    mesh.num_nodes, self.plan.num_parts, self.plan.edge_cut, len(self._processes))
+
+    def tick(self) -> List[Rewire]:
+        """
+        Advances every partition by one tick, applies their rewires to the mesh and closes the
+        tick for listeners. `mesh.node_state` is only brought up to date by `sync()`.
+        """
+        message = (self.ticks, self.mesh.tick_count)
+        if self._conns:
+            for conn in self._conns:
+                conn.send(message)
+            results = [conn.recv() for conn in self._conns]
+        else:
+            results = [worker.tick(*message) for worker in self.workers]
+        self.ticks += 1
+        self.mesh.tick_count += 1
+        moves = [move for part_moves in results for move in part_moves]
+        self.mesh.apply_rewires(moves)
+        self.mesh._notify(TICK_COMPLETED, self.mesh.tick_count - 1, -1)
+        return moves
+
+    @property
+    def node_state(self) -> torch.Tensor:
+        """(N, 4) shared node state after the last tick."""
+        return self.buffers[self.ticks % 2]
+
+    def sync(self) -> None:
+        """Copies the shared node state back into `mesh.node_state` and announces it to listeners."""
+        self.mesh.node_state.copy_(self.node_state)
+        self.mesh._notify(NODES_UPDATED, self.mesh.tick_count - 1, -1)
+
+    def run(self, ticks: int) -> int:
+        """Runs `ticks` ticks, syncs the mesh, and returns the number of rewires applied."""
+        applied = sum(len(self.tick()) for _ in range(ticks))
+        self.sync()
+        return applied
+
+    def close(self) -> None:
+        """Stops the worker processes."""
+        for conn in self._conns:
+            conn.send(None)
+            conn.close()
+        for process in self._processes:
+            process.join()
+        self._conns, self._processes = [], []
+
+    def __enter__(self) -> "ParallelMeshEvolver":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
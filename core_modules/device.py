@@ -0,0 +1,32 @@
+# ~/aurora_project/core_modules/device.py
+import logging
+from typing import Optional, Union
+
+import torch
+
+logger = logging.getLogger(__name__)
+
+# Shared compute device for every AURORA module, resolved on first use rather than at import.
+_device: Optional[torch.device] = None
+
+
+def get_device() -> torch.device:
+    """
+    Returns the shared compute device, probing CUDA the first time it is called.
+    Importing AURORA modules never touches CUDA; only the first tensor allocation does.
+    """
+    global _device
+    if _device is None:
+        if torch.cuda.is_available():
+            _device = torch.device("cuda")
+            logger.info("CUDA available. AURORA modules will use GPU: %s", torch.cuda.get_device_name(0))
+        else:
+            _device = torch.device("cpu")
+            logger.info("CUDA is not available. AURORA modules will run on CPU. Performance will be severely limited.")
+    return _device
+
+
+def set_device(device: Union[str, torch.device]) -> None:
+    """Pins the shared device explicitly (e.g. "cpu" in worker processes), skipping the CUDA probe."""
+    global _device
+    _device = torch.device(device)
@@ -0,0 +1,213 @@
+# ~/aurora_project/core_modules/hnk/benchmarks.py
+import random
+import time
+from typing import Callable, List, Tuple
+
+import torch
+
+from .reference import loop_forward
+from .sheaf_hypergraph_network import SheafHypergraph, SheafHypergraphNetwork, SheafHypergraphStack
+
+
+def _random_hyperedges(num_nodes: int, num_hyperedges: int, max_size: int = 5, seed: int = 0) -> List[List[int]]:
+    rng = random.Random(seed)
+    return [rng.sample(range(num_nodes), rng.randint(2, max_size)) for _ in range(num_hyperedges)]
+
+
+def bench_incidence_queries(sizes: Tuple[int, ...] = (10_000, 100_000, 1_000_000), queries: int = 1_000) -> None:
+    """
+    Construction time and `get_incident_hyperedges` latency of the tensor-backed hypergraph,
+    against the original linear scan over every hyperedge (skipped at the largest size).
+    """
+    print(f"{'hyperedges':>11} {'build (s)':>10} {'indexed (us)':>13} {'linear scan (us)':>17}")
+    for num_hyperedges in sizes:
+        num_nodes = num_hyperedges // 2
+        data = _random_hyperedges(num_nodes, num_hyperedges)
+        start = time.perf_counter()
+        hypergraph = SheafHypergraph(num_nodes=num_nodes, hyperedges_data=data, feature_dim=8, seed=0)
+        build_s = time.perf_counter() - start
+
+        nodes = [random.Random(1).randrange(num_nodes) for _ in range(queries)]
+        start = time.perf_counter()
+        for node in nodes:
+            hypergraph.get_incident_hyperedges(node)
+        indexed_us = (time.perf_counter() - start) / queries * 1e6
+
+        scan_us = float("nan")
+        if num_hyperedges <= 100_000:
+            sample = nodes[:20]
+            start = time.perf_counter()
+            for node in sample:
+                [he for he in hypergraph.hyperedges if node in he]
+            scan_us = (time.perf_counter() - start) / len(sample) * 1e6
+        print(f"{num_hyperedges:>11,} {build_s:>10.2f} {indexed_us:>13.2f} {scan_us:>17.1f}")
+
+
+def bench_forward(sizes: Tuple[int, ...] = (1_000, 10_000, 100_000, 1_000_000), feature_dim: int = 32) -> None:
+    """Per-layer time of the vectorized SHN forward vs. the original loop (skipped when too slow)."""
+    print(f"{'hyperedges':>11} {'dense (ms)':>11} {'loop (ms)':>10}")
+    for num_hyperedges in sizes:
+        num_nodes = num_hyperedges // 2
+        hypergraph = SheafHypergraph(num_nodes, _random_hyperedges(num_nodes, num_hyperedges), feature_dim=feature_dim, seed=0)
+        layer = SheafHypergraphNetwork(feature_dim, feature_dim)
+        with torch.no_grad():
+            layer.forward_dense(hypergraph)  # Warm-up (builds caches, first-kernel overhead)
+            start = time.perf_counter()
+            layer.forward_dense(hypergraph)
+            dense_ms = (time.perf_counter() - start) * 1e3
+            loop_ms = float("nan")
+            if num_hyperedges <= 10_000:
+                start = time.perf_counter()
+                loop_forward(layer, hypergraph)
+                loop_ms = (time.perf_counter() - start) * 1e3
+        print(f"{num_hyperedges:>11,} {dense_ms:>11.1f} {loop_ms:>10.1f}")
+
+
+def bench_stalk_update(sizes: Tuple[int, ...] = (10_000, 100_000, 1_000_000), feature_dim: int = 32) -> None:
+    """Refreshing every stalk: one `update_all_stalks` call vs. E `update_stalk_from_nodes` calls."""
+    print(f"{'hyperedges':>11} {'batched (ms)':>13} {'per-edge (ms)':>14}")
+    for num_hyperedges in sizes:
+        num_nodes = num_hyperedges // 2
+        hypergraph = SheafHypergraph(num_nodes, _random_hyperedges(num_nodes, num_hyperedges), feature_dim=feature_dim, seed=0)
+        hypergraph.update_all_stalks()  # Warm-up
+        start = time.perf_counter()
+        hypergraph.update_all_stalks()
+        batched_ms = (time.perf_counter() - start) * 1e3
+        per_edge_ms = float("nan")
+        if num_hyperedges <= 100_000:
+            start = time.perf_counter()
+            for he in hypergraph.hyperedges:
+                hypergraph.update_stalk_from_nodes(he)
+            per_edge_ms = (time.perf_counter() - start) * 1e3
+        print(f"{num_hyperedges:>11,} {batched_ms:>13.1f} {per_edge_ms:>14.1f}")
+
+
+def bench_sampling(num_hyperedges: int = 1_000_000, batch_size: int = 1_024, fanout: Tuple[int, ...] = (10, 5),
+                   num_batches: int = 20) -> None:
+    """Mini-batch sampling rate and sub-hypergraph size (bounded by seeds x fan-outs, not by E)."""
+    from .sampling import NeighborhoodSampler
+    num_nodes = num_hyperedges // 2
+    hypergraph = SheafHypergraph(num_nodes, _random_hyperedges(num_nodes, num_hyperedges), feature_dim=32, seed=0)
+    layer = SheafHypergraphNetwork(32, 32)
+    sampler = NeighborhoodSampler(hypergraph, fanout=fanout, seed=0)
+    rng = random.Random(4)
+    sample_s = forward_s = 0.0
+    nodes = edges = 0
+    for _ in range(num_batches):
+        seeds = rng.sample(range(num_nodes), batch_size)
+        start = time.perf_counter()
+        batch = sampler.sample(seeds)
+        sample_s += time.perf_counter() - start
+        start = time.perf_counter()
+        layer.forward_dense(batch.hypergraph).sum().backward()
+        forward_s += time.perf_counter() - start
+        nodes += batch.hypergraph.num_nodes
+        edges += batch.hypergraph.num_hyperedges
+    print(f"{hypergraph.incidence_index.shape[1]:,} incidences, {batch_size} seeds, fan-out {fanout}: "
+          f"sample {sample_s / num_batches * 1e3:.1f} ms, forward+backward {forward_s / num_batches * 1e3:.1f} ms, "
+          f"~{nodes // num_batches:,} nodes / {edges // num_batches:,} hyperedges per batch")
+
+
+def bench_laplacian(sizes: Tuple[int, ...] = (1_000, 10_000, 100_000), feature_dim: int = 4, touched: int = 100) -> None:
+    """
+    Sheaf Laplacian cost vs. graph size: full assembly, re-assembly after `touched` hyperedges'
+    restriction maps change, one assembled sparse matvec, and one nonlinear (tanh) apply.
+    """
+    from .nonlinear_laplacians import NonlinearSheafLaplacian, SheafLaplacian
+    print(f"{'hyperedges':>11} {'assemble (ms)':>14} {'re-assemble (ms)':>17} {'apply (ms)':>11} {'nonlinear (ms)':>15}")
+    for num_hyperedges in sizes:
+        num_nodes = num_hyperedges // 2
+        hypergraph = SheafHypergraph(num_nodes, _random_hyperedges(num_nodes, num_hyperedges), feature_dim=feature_dim, seed=0)
+        num_incidences = hypergraph.incidence_index.shape[1]
+        maps = torch.randn(num_incidences, feature_dim, feature_dim, device=hypergraph.device)
+        laplacian = SheafLaplacian(hypergraph, maps)
+        start = time.perf_counter()
+        laplacian.assemble()
+        assemble_ms = (time.perf_counter() - start) * 1e3
+
+        columns = torch.randint(num_incidences, (touched,))
+        laplacian.set_restriction_maps(columns, torch.randn(touched, feature_dim, feature_dim))
+        start = time.perf_counter()
+        laplacian.assemble()
+        reassemble_ms = (time.perf_counter() - start) * 1e3
+
+        x = torch.randn(num_nodes, feature_dim, device=hypergraph.device)
+        laplacian.apply(x)
+        start = time.perf_counter()
+        laplacian.apply(x)
+        apply_ms = (time.perf_counter() - start) * 1e3
+
+        nonlinear = NonlinearSheafLaplacian(hypergraph, laplacian.maps)
+        nonlinear.apply(x)
+        start = time.perf_counter()
+        nonlinear.apply(x)
+        nonlinear_ms = (time.perf_counter() - start) * 1e3
+        print(f"{num_hyperedges:>11,} {assemble_ms:>14.1f} {reassemble_ms:>17.1f} {apply_ms:>11.2f} {nonlinear_ms:>15.2f}")
+
+
+def _saved_activation_bytes(step: Callable[[], None]) -> int:
+    """Peak bytes held for backward during `step`, tracked through autograd's saved-tensor hooks."""
+    live = {"bytes": 0, "peak": 0}
+
+    class _Saved:
+        def __init__(self, tensor: torch.Tensor):
+            self.tensor = tensor
+            self.size = tensor.numel() * tensor.element_size()
+            live["bytes"] += self.size
+            live["peak"] = max(live["peak"], live["bytes"])
+
+        def __del__(self) -> None:
+            live["bytes"] -= self.size
+
+    with torch.autograd.graph.saved_tensors_hooks(_Saved, lambda saved: saved.tensor):
+        step()
+    return live["peak"]
+
+
+def bench_stack(depths: Tuple[int, ...] = (2, 8, 16), num_hyperedges: int = 50_000, width: int = 32) -> None:
+    """
+    Training step time and peak activation memory of SHN stacks, with and without activation
+    checkpointing. Memory is the peak of tensors saved for backward (plus the CUDA allocator
+    peak when running on GPU).
+    """
+    num_nodes = num_hyperedges // 2
+    hypergraph = SheafHypergraph(num_nodes, _random_hyperedges(num_nodes, num_hyperedges), feature_dim=width, seed=0)
+    structure = hypergraph.incidence_structure()
+    on_cuda = hypergraph.device.type == "cuda"
+    print(f"{'depth':>6} {'checkpoint':>11} {'step (ms)':>10} {'saved peak (MB)':>16}" + (f" {'CUDA peak (MB)':>15}" if on_cuda else ""))
+    for depth in depths:
+        for use_checkpoint in (False, True):
+            stack = SheafHypergraphStack([width] * (depth + 1), checkpoint=use_checkpoint)
+
+            def step() -> None:
+                stack.zero_grad()
+                stack(hypergraph.features, structure).pow(2).mean().backward()
+
+            step()  # Warm-up
+            if on_cuda:
+                torch.cuda.synchronize()
+                torch.cuda.reset_peak_memory_stats()
+            start = time.perf_counter()
+            saved = _saved_activation_bytes(step)
+            if on_cuda:
+                torch.cuda.synchronize()
+            step_ms = (time.perf_counter() - start) * 1e3
+            row = f"{depth:>6} {str(use_checkpoint):>11} {step_ms:>10.1f} {saved / 2**20:>16.1f}"
+            if on_cuda:
+                row += f" {torch.cuda.max_memory_allocated() / 2**20:>15.1f}"
+            print(row)
+
+
+if __name__ == "__main__":
+    print("--- HNK Benchmarks ---")
+    bench_incidence_queries()
+    print()
+    bench_forward()
+    print()
+    bench_stalk_update()
+    print()
+    bench_sampling()
+    print()
+    bench_laplacian()
+    print()
+    bench_stack()
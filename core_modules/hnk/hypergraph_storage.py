@@ -0,0 +1,257 @@
+# ~/aurora_project/core_modules/hnk/hypergraph_storage.py
+import torch
+from typing import Dict, Iterator, List, MutableMapping, NamedTuple, Optional, Protocol, Sequence, Tuple
+
+HyperedgeKey = Tuple[int, ...]
+
+
+class HasFeatures(Protocol):
+    features: torch.Tensor
+
+
+def hyperedge_key(nodes: Sequence[int]) -> HyperedgeKey:
+    """Canonical key for a hyperedge: its node IDs, sorted."""
+    return tuple(sorted(nodes))
+
+
+class HyperedgeStore:
+    """
+    Contiguous storage for the hyperedges of a SheafHypergraph.
+    - `stalk[:num_hyperedges]` holds one `(F,)` stalk row per hyperedge, in insertion order.
+    - `incidence[:, :num_incidences]` holds one (node, hyperedge) COO column per membership.
+    - `ids` maps the canonical hyperedge tuple to its row, and `node_hyperedges[n]` lists
+      the rows incident to node n, so membership queries are O(degree), not O(E).
+    Buffers grow geometrically, so appending hyperedges one at a time stays amortised O(size).
+    The Python-side index (`hyperedges`, `ids`, `node_hyperedges`) is built from the incidence
+    columns on first use, so stores adopted via `adopt` never pay for it on tensor-only paths.
+    """
+    def __init__(self, num_nodes: int, feature_dim: int, device: torch.device, capacity: int = 16):
+        capacity = max(capacity, 1)
+        self.device = device
+        self.num_nodes = num_nodes
+        self.feature_dim = feature_dim
+        self.stalk: torch.Tensor = torch.empty((capacity, feature_dim), device=device)
+        self.incidence: torch.Tensor = torch.empty((2, capacity), dtype=torch.long, device=device)
+        # Python-side index, built from the incidence columns on first use (None until then).
+        self._hyperedges: Optional[List[HyperedgeKey]] = None
+        self._ids: Dict[HyperedgeKey, int] = {}
+        self._node_hyperedges: List[List[int]] = []
+        self.num_hyperedges: int = 0
+        self.num_incidences: int = 0
+        self.version: int = 0
+        self._incidence_matrix: Optional[Tuple[int, torch.Tensor]] = None
+
+    def _build_index(self) -> None:
+        hyperedges: List[List[int]] = [[] for _ in range(self.num_hyperedges)]
+        node_hyperedges: List[List[int]] = [[] for _ in range(self.num_nodes)]
+        nodes, rows = self.incidence_index.tolist()
+        for node, row in zip(nodes, rows):
+            hyperedges[row].append(node)
+            node_hyperedges[node].append(row)
+        self._hyperedges = [tuple(members) for members in hyperedges]
+        self._ids = {key: row for row, key in enumerate(self._hyperedges)}
+        self._node_hyperedges = node_hyperedges
+
+    @property
+    def hyperedges(self) -> List[HyperedgeKey]:
+        if self._hyperedges is None:
+            self._build_index()
+        return self._hyperedges  # type: ignore[return-value]
+
+    @property
+    def ids(self) -> Dict[HyperedgeKey, int]:
+        if self._hyperedges is None:
+            self._build_index()
+        return self._ids
+
+    @property
+    def node_hyperedges(self) -> List[List[int]]:
+        if self._hyperedges is None:
+            self._build_index()
+        return self._node_hyperedges
+
+    @property
+    def stalks(self) -> torch.Tensor:
+        """(E, F) view of the live stalk rows."""
+        return self.stalk[:self.num_hyperedges]
+
+    @property
+    def incidence_index(self) -> torch.Tensor:
+        """(2, I) view of the (node, hyperedge) incidence columns."""
+        return self.incidence[:, :self.num_incidences]
+
+    def _grow_stalks(self, min_capacity: int) -> None:
+        stalk = torch.empty((max(min_capacity, self.stalk.shape[0] * 2), self.feature_dim), device=self.device)
+        stalk[:self.num_hyperedges] = self.stalks
+        self.stalk = stalk
+
+    def _grow_incidence(self, min_capacity: int) -> None:
+        incidence = torch.empty((2, max(min_capacity, self.incidence.shape[1] * 2)), dtype=torch.long, device=self.device)
+        incidence[:, :self.num_incidences] = self.incidence_index
+        self.incidence = incidence
+
+    def add_many(self, keys: List[HyperedgeKey], stalks: torch.Tensor) -> None:
+        """Appends new, de-duplicated hyperedges and their `(M, F)` stalks in one copy each."""
+        m = len(keys)
+        if m == 0:
+            return
+        first = self.num_hyperedges
+        if first + m > self.stalk.shape[0]:
+            self._grow_stalks(first + m)
+        self.stalk[first:first + m] = stalks.to(self.device)
+
+        members: List[int] = []
+        owners: List[int] = []
+        ids, hyperedges, node_hyperedges = self.ids, self.hyperedges, self.node_hyperedges
+        for offset, key in enumerate(keys):
+            row = first + offset
+            ids[key] = row
+            hyperedges.append(key)
+            for node in key:
+                node_hyperedges[node].append(row)
+            members.extend(key)
+            owners.extend([row] * len(key))
+        self.num_hyperedges += m
+        k = len(members)
+        if self.num_incidences + k > self.incidence.shape[1]:
+            self._grow_incidence(self.num_incidences + k)
+        self.incidence[0, self.num_incidences:self.num_incidences + k] = torch.tensor(members, dtype=torch.long)
+        self.incidence[1, self.num_incidences:self.num_incidences + k] = torch.tensor(owners, dtype=torch.long)
+        self.num_incidences += k
+        self.version += 1
+
+    def adopt(self, incidence_index: torch.Tensor, stalks: torch.Tensor) -> None:
+        """
+        Uses a `(2, I)` incidence block and `(E, F)` stalks as the (empty) store's buffers,
+        without copying. Columns must be grouped by hyperedge row in ascending order, with
+        each row's nodes sorted (the layout `add_many` produces).
+        """
+        self.stalk, self.incidence = stalks, incidence_index
+        self.num_hyperedges = stalks.shape[0]
+        self.num_incidences = incidence_index.shape[1]
+        self._hyperedges = None
+        self.version += 1
+
+    def sizes(self) -> torch.Tensor:
+        """(E,) number of nodes in each hyperedge."""
+        return torch.bincount(self.incidence_index[1], minlength=self.num_hyperedges)
+
+    def degrees(self, num_nodes: int) -> torch.Tensor:
+        """(N,) number of hyperedges incident to each node."""
+        return torch.bincount(self.incidence_index[0], minlength=num_nodes)
+
+    def incidence_matrix(self, num_nodes: int) -> torch.Tensor:
+        """Sparse `N x E` 0/1 incidence matrix, cached until the hyperedge set changes."""
+        if self._incidence_matrix is None or self._incidence_matrix[0] != self.version:
+            index = self.incidence_index
+            values = torch.ones(index.shape[1], device=self.device)
+            matrix = torch.sparse_coo_tensor(index, values, size=(num_nodes, self.num_hyperedges),
+                                             check_invariants=False).coalesce()
+            self._incidence_matrix = (self.version, matrix)
+        return self._incidence_matrix[1]
+
+
+class IncidenceStructure(NamedTuple):
+    """
+    Precomputed incidence and normalisation tensors for message passing, shared by every
+    layer of a stack (and rebuilt only when the hyperedge set changes):
+    - `node_ids` / `edge_ids`: `(I,)` incidence columns;
+    - `node_norm`: `(N, 1)` 1 / node degree (0 for isolated nodes);
+    - `edge_norm`: `(E, 1)` 1 / hyperedge size;
+    - `isolated`: `(N, 1)` True for nodes in no hyperedge.
+    """
+    node_ids: torch.Tensor
+    edge_ids: torch.Tensor
+    node_norm: torch.Tensor
+    edge_norm: torch.Tensor
+    isolated: torch.Tensor
+
+    @classmethod
+    def build(cls, incidence_index: torch.Tensor, num_nodes: int, num_hyperedges: int) -> "IncidenceStructure":
+        node_ids, edge_ids = incidence_index
+        degrees = torch.bincount(node_ids, minlength=num_nodes).unsqueeze(1).float()
+        sizes = torch.bincount(edge_ids, minlength=num_hyperedges).unsqueeze(1).float()
+        return cls(node_ids, edge_ids, 1.0 / degrees.clamp(min=1), 1.0 / sizes.clamp(min=1), degrees == 0)
+
+    @property
+    def num_nodes(self) -> int:
+        return self.node_norm.shape[0]
+
+    @property
+    def num_hyperedges(self) -> int:
+        return self.edge_norm.shape[0]
+
+    def nodes_to_hyperedges(self, x: torch.Tensor) -> torch.Tensor:
+        """(N, F) node rows -> (E, F) mean over each hyperedge's members."""
+        summed = x.new_zeros(self.num_hyperedges, x.shape[1]).index_add(0, self.edge_ids, x[self.node_ids])
+        return summed * self.edge_norm.to(x.dtype)
+
+    def hyperedges_to_nodes(self, h: torch.Tensor) -> torch.Tensor:
+        """(E, F) hyperedge rows -> (N, F) mean over each node's incident hyperedges (0 if none)."""
+        summed = h.new_zeros(self.num_nodes, h.shape[1]).index_add(0, self.node_ids, h[self.edge_ids])
+        return summed * self.node_norm.to(h.dtype)
+
+
+class FeatureRowView(MutableMapping[int, torch.Tensor]):
+    """
+    Dict-style view over an owner's `(N, F)` feature tensor, keyed by node ID like the original
+    per-node dict. `view[i]` returns row i (a view, not a copy); assignment writes in place.
+    """
+    def __init__(self, owner: HasFeatures):
+        self._owner = owner
+
+    def _rows(self) -> torch.Tensor:
+        return self._owner.features
+
+    def __getitem__(self, node: int) -> torch.Tensor:
+        if node not in self:
+            raise KeyError(node)
+        return self._rows()[node]
+
+    def __setitem__(self, node: int, value: torch.Tensor) -> None:
+        if node not in self:
+            raise KeyError(node)
+        self._rows()[node] = value
+
+    def __delitem__(self, node: int) -> None:
+        raise TypeError("Node features cannot be deleted independently of the hypergraph.")
+
+    def __contains__(self, node: object) -> bool:
+        return isinstance(node, int) and 0 <= node < self._rows().shape[0]
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(range(self._rows().shape[0]))
+
+    def __len__(self) -> int:
+        return self._rows().shape[0]
+
+
+class StalkView(MutableMapping[HyperedgeKey, torch.Tensor]):
+    """
+    Dict-style view over a HyperedgeStore, keyed by hyperedge tuple like the original
+    per-hyperedge dict. Values are row views of the stalk tensor; assigning to an existing
+    hyperedge writes its row in place. New hyperedges are added through the hypergraph.
+    """
+    def __init__(self, store: HyperedgeStore):
+        self._store = store
+
+    def __getitem__(self, key: HyperedgeKey) -> torch.Tensor:
+        return self._store.stalk[self._store.ids[key]]
+
+    def __setitem__(self, key: HyperedgeKey, value: torch.Tensor) -> None:
+        row = self._store.ids.get(key)
+        if row is None:
+            raise KeyError(f"Hyperedge {key} does not exist; add it to the hypergraph first.")
+        self._store.stalk[row] = value
+
+    def __delitem__(self, key: HyperedgeKey) -> None:
+        raise TypeError("Hyperedge stalks cannot be deleted independently of the hypergraph.")
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._store.ids
+
+    def __iter__(self) -> Iterator[HyperedgeKey]:
+        return iter(self._store.hyperedges)
+
+    def __len__(self) -> int:
+        return self._store.num_hyperedges
@@ -0,0 +1,224 @@
+# ~/aurora_project/core_modules/hnk/nonlinear_laplacians.py
+import logging
+import warnings
+from typing import Callable, Optional, Sequence, Set, Tuple
+
+import torch
+
+from .sheaf_hypergraph_network import SheafHypergraph
+
+logger = logging.getLogger(__name__)
+
+Activation = Callable[[torch.Tensor], torch.Tensor]
+
+
+class SheafLaplacian:
+    """
+    Linear sheaf Laplacian of a SheafHypergraph, assembled as a sparse `(N*F, N*F)` operator.
+    Every incidence (v, e) carries a restriction map F_{v<e}: R^F -> R^D (stored together
+    as one `(I, D, F)` tensor aligned with the hypergraph's incidence columns; identity by
+    default, which recovers the plain hypergraph Laplacian on each feature channel).
+    The coboundary compares each restricted node value with the hyperedge's average:
+        (delta x)_{v,e} = F_{v<e} x_v - (1/|e|) sum_{u in e} F_{u<e} x_u
+    and L = delta^T delta, which is symmetric positive semi-definite. Its (u, v) block is
+        sum_{e containing u, v} F_{u<e}^T ([u == v] - 1/|e|) F_{v<e}.
+    Assembly computes these blocks per hyperedge with batched matmuls and sums them into a
+    CSR operator. Blocks are cached per hyperedge together with the CSR slot of every entry:
+    - touched restriction maps (`set_restriction_maps`, `mark_dirty`) only recompute the
+      touched hyperedges' blocks and scatter their difference into the CSR values;
+    - new hyperedges change the sparsity pattern, so their blocks are computed and the
+      pattern is rebuilt from the cached blocks (no other block is recomputed).
+    """
+    def __init__(self, hypergraph: SheafHypergraph, restriction_maps: Optional[torch.Tensor] = None):
+        self.hypergraph = hypergraph
+        self.feature_dim = hypergraph.feature_dim
+        num_incidences = hypergraph.incidence_index.shape[1]
+        if restriction_maps is None:
+            restriction_maps = self._identity_maps(num_incidences)
+        if restriction_maps.shape[0] != num_incidences or restriction_maps.shape[2] != self.feature_dim:
+            raise ValueError("Restriction maps must have shape (num_incidences, stalk_dim, feature_dim).")
+        self.maps: torch.Tensor = restriction_maps.to(hypergraph.device)
+        self.blocks_recomputed = 0
+        self._dirty: Set[int] = set()
+        self._built_hyperedges = 0
+        # Per-block cache: owning hyperedge, block row/column node and the (F, F) block.
+        empty = torch.empty(0, dtype=torch.long, device=hypergraph.device)
+        self._owner, self._u, self._v = empty, empty, empty
+        self._values = torch.empty((0, self.feature_dim, self.feature_dim), device=hypergraph.device)
+        # CSR pattern of the assembled operator and the CSR slot of every cached block entry.
+        self._pattern_stale = True
+        self._crow, self._col, self._entry_slot = empty, empty, empty
+        self._operator_values = torch.empty(0, device=hypergraph.device)
+        self._operator: Optional[torch.Tensor] = None
+
+    def _identity_maps(self, count: int) -> torch.Tensor:
+        eye = torch.eye(self.feature_dim, device=self.hypergraph.device)
+        return eye.expand(count, self.feature_dim, self.feature_dim).clone()
+
+    # --- Restriction maps ---
+    def _sync_incidences(self) -> None:
+        """Gives incidences added to the hypergraph since the last call identity maps."""
+        num_incidences = self.hypergraph.incidence_index.shape[1]
+        missing = num_incidences - self.maps.shape[0]
+        if missing > 0:
+            extra = torch.zeros(missing, self.maps.shape[1], self.feature_dim, device=self.maps.device)
+            eye = torch.eye(min(self.maps.shape[1], self.feature_dim), device=self.maps.device)
+            extra[:, :eye.shape[0], :eye.shape[1]] = eye
+            self.maps = torch.cat([self.maps, extra])
+        num_hyperedges = self.hypergraph.num_hyperedges
+        if num_hyperedges > self._built_hyperedges:
+            self._dirty.update(range(self._built_hyperedges, num_hyperedges))
+            self._built_hyperedges = num_hyperedges
+            self._pattern_stale = True
+
+    def set_restriction_maps(self, incidence_columns: torch.Tensor, maps: torch.Tensor) -> None:
+        """Overwrites the maps of the given incidence columns and marks their hyperedges dirty."""
+        self._sync_incidences()
+        columns = incidence_columns.to(self.maps.device)
+        self.maps[columns] = maps.to(self.maps.device)
+        self._dirty.update(self.hypergraph.incidence_index[1, columns].tolist())
+
+    def mark_dirty(self, hyperedge_ids: Sequence[int]) -> None:
+        """Flags hyperedges whose maps were edited in place (through `self.maps`)."""
+        self._dirty.update(int(e) for e in hyperedge_ids)
+
+    @property
+    def num_dirty_hyperedges(self) -> int:
+        self._sync_incidences()
+        return len(self._dirty)
+
+    # --- Assembly ---
+    def _incidence_pairs(self, hyperedge_ids: Optional[torch.Tensor]) -> Tuple[torch.Tensor, torch.Tensor, torch.Tensor, torch.Tensor]:
+        """
+        All ordered pairs (a, b) of incidence columns sharing a hyperedge, restricted to
+        `hyperedge_ids` (all hyperedges when None). Returns (a, b, owner, |owner|).
+        """
+        edge_ids = self.hypergraph.incidence_index[1]
+        columns = torch.arange(edge_ids.shape[0], device=edge_ids.device)
+        if hyperedge_ids is not None:
+            columns = columns[torch.isin(edge_ids, hyperedge_ids)]
+        owners = edge_ids[columns]
+        order = torch.argsort(owners, stable=True)
+        columns, owners = columns[order], owners[order]
+        _, counts = torch.unique_consecutive(owners, return_counts=True)
+        group_start = torch.cumsum(counts, dim=0) - counts
+        group = torch.repeat_interleave(torch.arange(counts.shape[0], device=counts.device), counts)
+        size = counts[group]  # |e| for every incidence column
+        a = torch.repeat_interleave(torch.arange(columns.shape[0], device=columns.device), size)
+        pair_start = torch.repeat_interleave(torch.cumsum(size, dim=0) - size, size)
+        b = group_start[group[a]] + (torch.arange(a.shape[0], device=a.device) - pair_start)
+        return columns[a], columns[b], owners[a], size[a]
+
+    def _blocks(self, hyperedge_ids: Optional[torch.Tensor]) -> Tuple[torch.Tensor, torch.Tensor, torch.Tensor, torch.Tensor]:
+        a, b, owner, size = self._incidence_pairs(hyperedge_ids)
+        maps_a, maps_b = self.maps[a], self.maps[b]
+        values = torch.bmm(maps_a.transpose(1, 2), maps_b) * (-1.0 / size.to(maps_a.dtype)).view(-1, 1, 1)
+        diagonal = a == b
+        values[diagonal] += torch.bmm(maps_a[diagonal].transpose(1, 2), maps_a[diagonal])
+        node_ids = self.hypergraph.incidence_index[0]
+        self.blocks_recomputed += a.shape[0]
+        return owner, node_ids[a], node_ids[b], values
+
+    def assemble(self) -> torch.Tensor:
+        """Returns the sparse CSR `(N*F, N*F)` Laplacian, recomputing only dirty hyperedges' blocks."""
+        self._sync_incidences()
+        if self._operator is not None and not self._dirty:
+            return self._operator
+        dirty = torch.tensor(sorted(self._dirty), dtype=torch.long, device=self.maps.device)
+        if self._pattern_stale:
+            keep = ~torch.isin(self._owner, dirty)
+            owner, u, v, values = self._blocks(dirty)
+            self._owner = torch.cat([self._owner[keep], owner])
+            self._u = torch.cat([self._u[keep], u])
+            self._v = torch.cat([self._v[keep], v])
+            self._values = torch.cat([self._values[keep], values])
+            self._build_pattern()
+        else:
+            self._update_values(dirty)
+        self._dirty.clear()
+
+        n = self.hypergraph.num_nodes * self.feature_dim
+        with warnings.catch_warnings():
+            # CSR is flagged as beta by PyTorch, but it is several times faster than COO for matvecs.
+            warnings.filterwarnings("ignore", message="Sparse CSR tensor support is in beta")
+            self._operator = torch.sparse_csr_tensor(self._crow, self._col, self._operator_values,
+                                                     size=(n, n), check_invariants=False)
+        logger.debug("Assembled sheaf Laplacian: %d blocks, %d non-zeros.", self._values.shape[0], self._col.shape[0])
+        return self._operator
+
+    def _build_pattern(self) -> None:
+        """Sums all cached blocks into CSR arrays, remembering the CSR slot of every block entry."""
+        f = self.feature_dim
+        n = self.hypergraph.num_nodes * f
+        channel = torch.arange(f, device=self._u.device)
+        rows = (self._u.view(-1, 1, 1) * f + channel.view(1, f, 1)).expand(-1, f, f)
+        cols = (self._v.view(-1, 1, 1) * f + channel.view(1, 1, f)).expand(-1, f, f)
+        keys, self._entry_slot = torch.unique(rows.reshape(-1) * n + cols.reshape(-1), return_inverse=True)
+        self._operator_values = torch.zeros(keys.shape[0], device=self._values.device)
+        self._operator_values.index_add_(0, self._entry_slot, self._values.reshape(-1))
+        self._crow = torch.zeros(n + 1, dtype=torch.long, device=keys.device)
+        self._crow[1:] = torch.cumsum(torch.bincount(keys // n, minlength=n), dim=0)
+        self._col = keys % n
+        self._pattern_stale = False
+
+    def _update_values(self, dirty: torch.Tensor) -> None:
+        """Recomputes the dirty hyperedges' blocks and scatters the change into the CSR values."""
+        # Cached blocks of one hyperedge are contiguous and in the order `_blocks` emits them,
+        # so a stable sort by owner lines them up with the freshly computed blocks.
+        cached = torch.nonzero(torch.isin(self._owner, dirty)).flatten()
+        cached = cached[torch.argsort(self._owner[cached], stable=True)]
+        _, _, _, values = self._blocks(dirty)
+        block_size = self.feature_dim * self.feature_dim
+        entries = (cached.view(-1, 1) * block_size + torch.arange(block_size, device=cached.device)).reshape(-1)
+        self._operator_values.index_add_(0, self._entry_slot[entries], (values - self._values[cached]).reshape(-1))
+        self._values[cached] = values
+
+    # --- Application ---
+    def apply(self, x: torch.Tensor) -> torch.Tensor:
+        """L x for `(N, F)` node signals x, as one CSR matvec against the assembled operator."""
+        operator = self.assemble()
+        return torch.sparse.mm(operator, x.reshape(-1, 1)).view_as(x)
+
+    def energy(self, x: torch.Tensor) -> torch.Tensor:
+        """Dirichlet energy x^T L x (zero exactly on global sections)."""
+        return (x * self.apply(x)).sum()
+
+    def diffuse(self, x: torch.Tensor, steps: int = 1, step_size: float = 0.1) -> torch.Tensor:
+        """Explicit Euler sheaf diffusion x <- x - step_size * L(x), repeated `steps` times."""
+        for _ in range(steps):
+            x = x - step_size * self.apply(x)
+        return x
+
+
+class NonlinearSheafLaplacian(SheafLaplacian):
+    """
+    Nonlinear sheaf Laplacian L(x) = delta^T sigma(delta x), with delta^T = R^T (I - P): the per-incidence disagreement
+    is passed through a pointwise `activation` before being pulled back to the nodes.
+    A nonlinear operator has no matrix to assemble, so `apply` works directly on the
+    block-sparse restriction maps: one batched matmul to restrict, a segment mean per
+    hyperedge, the activation, and a batched transposed matmul scattered back to the nodes.
+    With the identity activation it equals the linear Laplacian.
+    """
+    def __init__(self, hypergraph: SheafHypergraph, restriction_maps: Optional[torch.Tensor] = None,
+                 activation: Activation = torch.tanh):
+        super().__init__(hypergraph, restriction_maps)
+        self.activation = activation
+
+    def _center(self, values: torch.Tensor) -> torch.Tensor:
+        """(I - P) values: subtracts each hyperedge's mean from its incidence rows."""
+        edge_ids = self.hypergraph.incidence_index[1]
+        sums = values.new_zeros(self.hypergraph.num_hyperedges, values.shape[1]).index_add(0, edge_ids, values)
+        sizes = self.hypergraph.hyperedge_sizes().clamp(min=1).to(values.dtype).unsqueeze(1)
+        return values - (sums / sizes)[edge_ids]
+
+    def coboundary(self, x: torch.Tensor) -> torch.Tensor:
+        """(delta x): the `(I, D)` disagreement of every incidence with its hyperedge's average."""
+        self._sync_incidences()
+        node_ids = self.hypergraph.incidence_index[0]
+        return self._center(torch.bmm(self.maps, x[node_ids].unsqueeze(2)).squeeze(2))
+
+    def apply(self, x: torch.Tensor) -> torch.Tensor:
+        node_ids = self.hypergraph.incidence_index[0]
+        disagreement = self._center(self.activation(self.coboundary(x)))
+        pulled_back = torch.bmm(self.maps.transpose(1, 2), disagreement.unsqueeze(2)).squeeze(2)
+        return x.new_zeros(x.shape).index_add(0, node_ids, pulled_back)
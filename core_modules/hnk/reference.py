@@ -0,0 +1,19 @@
+# ~/aurora_project/core_modules/hnk/reference.py
+from typing import Dict
+
+import torch
+
+from .sheaf_hypergraph_network import SheafHypergraph, SheafHypergraphNetwork
+
+
+def loop_forward(layer: SheafHypergraphNetwork, hypergraph: SheafHypergraph) -> Dict[int, torch.Tensor]:
+    """The original per-stalk, per-node SHN forward pass: the tests' oracle and the benchmarks' baseline."""
+    device = hypergraph.device
+    sums = {n: torch.zeros(layer.out_features, device=device) for n in hypergraph.node_features}
+    counts = {n: 0 for n in hypergraph.node_features}
+    for he_tuple, stalk in hypergraph.hyperedge_stalks.items():
+        transformed = layer.linear_transform(stalk)
+        for n in he_tuple:
+            sums[n] += transformed
+            counts[n] += 1
+    return {n: sums[n] / counts[n] if counts[n] > 0 else hypergraph.node_features[n].clone() for n in hypergraph.node_features}
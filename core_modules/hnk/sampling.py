@@ -0,0 +1,122 @@
+# ~/aurora_project/core_modules/hnk/sampling.py
+import random
+from typing import Dict, Iterator, List, NamedTuple, Optional, Sequence, Set, Union
+
+import torch
+from torch.utils.data import IterableDataset, get_worker_info
+
+from .sheaf_hypergraph_network import SheafHypergraph
+
+
+class SampledHypergraph(NamedTuple):
+    """
+    A sub-hypergraph cut out around a set of seed nodes.
+    - `hypergraph`: the sub-hypergraph, with nodes relabelled 0..n-1;
+    - `node_ids`: `(n,)` global ID of every local node (the seeds come first);
+    - `hyperedge_ids`: `(m,)` global row of every local hyperedge;
+    - `num_seeds`: number of seed nodes, i.e. the rows to read the loss from.
+    """
+    hypergraph: SheafHypergraph
+    node_ids: torch.Tensor
+    hyperedge_ids: torch.Tensor
+    num_seeds: int
+
+
+class NeighborhoodSampler:
+    """
+    k-hop neighbourhood sampler over a SheafHypergraph, for mini-batch training.
+    Hop h expands every frontier node through at most `fanout[h]` of its incident
+    hyperedges (sampled uniformly, all of them when fewer), and every member of a chosen
+    hyperedge joins the sample. Memory per mini-batch is therefore bounded by the seed
+    count and the fan-outs, not by the size of the full hypergraph.
+    """
+    def __init__(self, hypergraph: SheafHypergraph, fanout: Union[int, Sequence[int]] = (10, 5), seed: Optional[int] = None):
+        self.hypergraph = hypergraph
+        self.fanout: List[int] = [fanout] if isinstance(fanout, int) else list(fanout)
+        self.rng = random.Random(seed)
+
+    @property
+    def num_hops(self) -> int:
+        return len(self.fanout)
+
+    def sample(self, seeds: Sequence[int]) -> SampledHypergraph:
+        """Extracts the sampled k-hop sub-hypergraph around `seeds`."""
+        store = self.hypergraph._store
+        local_of: Dict[int, int] = {}
+        for node in seeds:
+            local_of.setdefault(int(node), len(local_of))
+        num_seeds = len(local_of)
+        chosen: List[int] = []
+        chosen_set: Set[int] = set()
+        frontier = list(local_of)
+
+        for limit in self.fanout:
+            next_frontier: List[int] = []
+            for node in frontier:
+                incident = store.node_hyperedges[node]
+                if len(incident) > limit:
+                    incident = self.rng.sample(incident, limit)
+                for row in incident:
+                    if row in chosen_set:
+                        continue
+                    chosen_set.add(row)
+                    chosen.append(row)
+                    for member in store.hyperedges[row]:
+                        if member not in local_of:
+                            local_of[member] = len(local_of)
+                            next_frontier.append(member)
+            frontier = next_frontier
+
+        device = self.hypergraph.device
+        node_ids = torch.tensor(list(local_of), dtype=torch.long, device=device)
+        hyperedge_ids = torch.tensor(chosen, dtype=torch.long, device=device)
+        local_hyperedges = [[local_of[n] for n in store.hyperedges[row]] for row in chosen]
+        sub = SheafHypergraph.from_tensors(
+            self.hypergraph.features[node_ids], local_hyperedges, self.hypergraph.stalks[hyperedge_ids],
+            seed=self.rng.getrandbits(63),
+        )
+        return SampledHypergraph(sub, node_ids, hyperedge_ids, num_seeds)
+
+
+class SubHypergraphDataset(IterableDataset):
+    """
+    Streams sampled mini-batches for one epoch over `nodes` (all nodes by default).
+    Under a DataLoader with worker processes, each worker samples a disjoint share of the
+    mini-batches. Workers get a copy of the dataset, so call `set_epoch` before each epoch
+    to reshuffle. Use `batch_size=None`, since every item already is a mini-batch:
+
+        dataset = SubHypergraphDataset(hg, batch_size=512)
+        loader = DataLoader(dataset, batch_size=None, num_workers=4)
+        for epoch in range(num_epochs):
+            dataset.set_epoch(epoch)
+            for batch in loader: ...
+    """
+    def __init__(self, hypergraph: SheafHypergraph, batch_size: int = 512, fanout: Union[int, Sequence[int]] = (10, 5),
+                 nodes: Optional[Sequence[int]] = None, shuffle: bool = True, seed: int = 0):
+        super().__init__()
+        self.hypergraph = hypergraph
+        self.batch_size = batch_size
+        self.fanout = fanout
+        self.nodes: List[int] = list(nodes) if nodes is not None else list(range(hypergraph.num_nodes))
+        self.shuffle = shuffle
+        self.seed = seed
+        self.epoch = 0
+
+    def __len__(self) -> int:
+        return (len(self.nodes) + self.batch_size - 1) // self.batch_size
+
+    def set_epoch(self, epoch: int) -> None:
+        """Selects the shuffle order (and sampling seed) of the next epoch."""
+        self.epoch = epoch
+
+    def __iter__(self) -> Iterator[SampledHypergraph]:
+        order = list(self.nodes)
+        if self.shuffle:
+            random.Random(self.seed * 1_000_003 + self.epoch).shuffle(order)
+        batches = [order[i:i + self.batch_size] for i in range(0, len(order), self.batch_size)]
+
+        worker = get_worker_info()
+        worker_id, num_workers = (0, 1) if worker is None else (worker.id, worker.num_workers)
+        sampler = NeighborhoodSampler(self.hypergraph, self.fanout, seed=(self.seed * 1_000_003 + self.epoch) * 1_009 + worker_id)
+        for batch in batches[worker_id::num_workers]:
+            yield sampler.sample(batch)
@@ -1,75 +1,195 @@
 # ~/aurora_project/core_modules/hnk/sheaf_hypergraph_network.py
 import torch
 import torch.nn as nn
-from typing import Dict, List, Set, Any, Tuple, Optional
-import random
+from typing import Dict, List, Set, Any, Tuple, Optional, Sequence
+import logging
+
+from core_modules.device import get_device
+from core_modules.rng import RNGStreams
+from torch.utils.checkpoint import checkpoint
+
+from .hypergraph_storage import FeatureRowView, HyperedgeKey, HyperedgeStore, IncidenceStructure, StalkView, hyperedge_key
+
+logger = logging.getLogger(__name__)
+
+
+def __getattr__(name: str) -> Any:
+    # `DEVICE` used to be probed at import time; it is now the shared, lazily resolved device.
+    if name == "DEVICE":
+        return get_device()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
-# Ensure CUDA is available (DEVICE is already defined in cess_mesh, but we'll re-check here for this module's context)
-if torch.cuda.is_available():
-    DEVICE = torch.device("cuda")
-    print(f"HNK Module will use GPU: {torch.cuda.get_device_name(0)}")
-else:
-    DEVICE = torch.device("cpu")
-    print("WARNING: CUDA not available. HNK Module will run on CPU. Performance will be severely limited.")
 
 class SheafHypergraph:
     """
-    Represents a simplified Sheaf Hypergraph using PyTorch tensors and standard Python structures.
+    Represents a simplified Sheaf Hypergraph using PyTorch tensors.
     - Nodes are basic entities (represented by integer IDs).
     - Hyperedges connect arbitrary subsets of nodes.
     - Each hyperedge has a 'stalk' (a tensor of features).
     - Each node has a 'feature' (a tensor).
+    Features live in one `(N, F)` tensor and stalks in one `(E, F)` tensor, with a COO
+    incidence structure (and a lazily built sparse `N x E` incidence matrix) linking them.
+    `node_features` and `hyperedge_stalks` remain available as dict-style views over rows.
     """
     def __init__(self, num_nodes: int, hyperedges_data: List[List[int]], feature_dim: int = 8, seed: Optional[int] = None):
-        if seed is not None:
-            random.seed(seed)
-            torch.manual_seed(seed)
-            if torch.cuda.is_available():
-                torch.cuda.manual_seed_all(seed)
-
-        self.num_nodes = num_nodes
-        self.feature_dim = feature_dim
-        
-        # Node features: A dictionary mapping node ID to its feature tensor
-        self.node_features: Dict[int, torch.Tensor] = {
-            i: torch.randn(feature_dim, device=DEVICE) for i in range(num_nodes)
-        }
-        
-        # Hyperedges: A list of tuples, where each tuple is a sorted collection of node IDs
-        self.hyperedges: List[Tuple[int, ...]] = []
-        # Hyperedge stalks: A dictionary mapping hyperedge tuple to its stalk tensor
-        self.hyperedge_stalks: Dict[Tuple[int, ...], torch.Tensor] = {}
+        device = get_device()
+        # Random features and stalks come from the hypergraph's own streams, not global RNG state.
+        self.rng = RNGStreams(seed, device=device)
+        self._init_storage(torch.randn(num_nodes, feature_dim, generator=self.rng.torch, device=device),
+                           capacity=len(hyperedges_data))
 
         # Add initial hyperedges and their stalks
-        for he_nodes in hyperedges_data:
-            self._add_hyperedge_internal(he_nodes)
+        self._add_hyperedges_internal(hyperedges_data)
+
+        logger.info("Initialized Sheaf Hypergraph with %d nodes and %d hyperedges.", num_nodes, len(self.hyperedges))
+
+    def _init_storage(self, features: torch.Tensor, capacity: int) -> None:
+        self.device = features.device
+        self.num_nodes, self.feature_dim = features.shape
 
-        print(f"Initialized Sheaf Hypergraph with {num_nodes} nodes and {len(self.hyperedges)} hyperedges.")
+        # Node features: row i is node i's feature vector
+        self.features: torch.Tensor = features
+        self.node_features: FeatureRowView = FeatureRowView(self)
+
+        # Hyperedges (sorted node tuples), their stalks and the node/hyperedge incidence
+        self._store = HyperedgeStore(self.num_nodes, self.feature_dim, self.device, capacity=capacity)
+        self.hyperedge_stalks: StalkView = StalkView(self._store)
+        self._structure: Optional[Tuple[int, IncidenceStructure]] = None
+
+    @classmethod
+    def from_tensors(cls, features: torch.Tensor, hyperedges_data: Sequence[Sequence[int]],
+                     stalks: torch.Tensor, seed: Optional[int] = None) -> "SheafHypergraph":
+        """
+        Builds a hypergraph around existing `(N, F)` node features and `(E, F)` stalks
+        (stalk row i belongs to `hyperedges_data[i]`) without drawing random state; `seed`
+        only seeds the streams used by later additions. Used e.g. to materialise sampled
+        sub-hypergraphs.
+        """
+        hypergraph = cls.__new__(cls)
+        hypergraph.rng = RNGStreams(seed, device=features.device)
+        hypergraph._init_storage(features, capacity=len(hyperedges_data))
+        hypergraph._add_hyperedges_internal(hyperedges_data, stalks)
+        logger.debug("Built Sheaf Hypergraph from tensors: %d nodes, %d hyperedges.",
+                     hypergraph.num_nodes, hypergraph.num_hyperedges)
+        return hypergraph
+
+    @classmethod
+    def from_incidence(cls, features: torch.Tensor, incidence_index: torch.Tensor,
+                       stalks: torch.Tensor, seed: Optional[int] = None) -> "SheafHypergraph":
+        """
+        Builds a hypergraph whose storage adopts `(N, F)` features, a `(2, I)` incidence and
+        `(E, F)` stalks as they are (e.g. arrays memory-mapped from a snapshot). Incidence
+        columns must be grouped by hyperedge row, each row's nodes sorted, with no duplicate
+        hyperedges. The per-hyperedge tuples and lookup dicts are only built on first use.
+        """
+        hypergraph = cls.__new__(cls)
+        hypergraph.rng = RNGStreams(seed, device=features.device)
+        hypergraph._init_storage(features, capacity=1)
+        hypergraph._store.adopt(incidence_index.to(features.device), stalks.to(features.device))
+        logger.debug("Adopted Sheaf Hypergraph storage: %d nodes, %d hyperedges.",
+                     hypergraph.num_nodes, hypergraph.num_hyperedges)
+        return hypergraph
+
+    # --- Tensor-backed storage ---
+    @property
+    def hyperedges(self) -> List[HyperedgeKey]:
+        """Hyperedge tuples in insertion order; index i is the hyperedge's row in `stalks`."""
+        return self._store.hyperedges
+
+    @property
+    def num_hyperedges(self) -> int:
+        return self._store.num_hyperedges
+
+    @property
+    def stalks(self) -> torch.Tensor:
+        """(E, F) stalk tensor; row i belongs to `hyperedges[i]`."""
+        return self._store.stalks
+
+    @property
+    def incidence_index(self) -> torch.Tensor:
+        """(2, I) COO incidence: row 0 holds node IDs, row 1 the hyperedge rows they belong to."""
+        return self._store.incidence_index
+
+    @property
+    def version(self) -> int:
+        """Incremented whenever the hyperedge set changes."""
+        return self._store.version
+
+    def incidence_matrix(self) -> torch.Tensor:
+        """Sparse `N x E` 0/1 incidence matrix (cached until the hyperedge set changes)."""
+        return self._store.incidence_matrix(self.num_nodes)
+
+    def hyperedge_sizes(self) -> torch.Tensor:
+        """(E,) number of nodes in each hyperedge."""
+        return self._store.sizes()
+
+    def node_degrees(self) -> torch.Tensor:
+        """(N,) number of hyperedges incident to each node."""
+        return self._store.degrees(self.num_nodes)
+
+    def incidence_structure(self) -> IncidenceStructure:
+        """Message-passing incidence/normalisation tensors, cached until the hyperedge set changes."""
+        if self._structure is None or self._structure[0] != self.version:
+            structure = IncidenceStructure.build(self.incidence_index, self.num_nodes, self.num_hyperedges)
+            self._structure = (self.version, structure)
+        return self._structure[1]
+
+    def hyperedge_id(self, hyperedge: Tuple[int, ...]) -> int:
+        """Row of a hyperedge in `stalks`."""
+        row = self._store.ids.get(hyperedge_key(hyperedge))
+        if row is None:
+            raise ValueError(f"Hyperedge {hyperedge} not found.")
+        return row
+
+    def _add_hyperedges_internal(self, hyperedges_data: Sequence[Sequence[int]],
+                                 stalks: Optional[torch.Tensor] = None) -> List[int]:
+        """
+        Validates, de-duplicates and appends hyperedges. New stalks are drawn all at once,
+        or taken from the matching rows of `stalks` when given.
+        """
+        new_keys: List[HyperedgeKey] = []
+        new_positions: List[int] = []
+        seen: Set[HyperedgeKey] = set()
+        for position, nodes in enumerate(hyperedges_data):
+            # Ensure node IDs are valid
+            if any(node_id >= self.num_nodes or node_id < 0 for node_id in nodes):
+                raise ValueError("Hyperedge contains invalid node IDs.")
+            he_tuple = hyperedge_key(nodes)
+            if he_tuple in self._store.ids or he_tuple in seen:
+                logger.debug("Hyperedge %s already exists, skipping.", he_tuple)
+                continue
+            seen.add(he_tuple)
+            new_keys.append(he_tuple)
+            new_positions.append(position)
+        first = self._store.num_hyperedges
+        if stalks is None:
+            new_stalks = torch.randn(len(new_keys), self.feature_dim, generator=self.rng.torch, device=self.device)
+        elif len(new_positions) == stalks.shape[0]:
+            new_stalks = stalks
+        else:
+            new_stalks = stalks[torch.tensor(new_positions, dtype=torch.long, device=stalks.device)]
+        self._store.add_many(new_keys, new_stalks)
+        return list(range(first, first + len(new_keys)))
 
     def _add_hyperedge_internal(self, nodes: List[int]) -> None:
         """Helper to add a hyperedge and initialize its stalk."""
-        # Ensure node IDs are valid
-        if any(node_id >= self.num_nodes or node_id < 0 for node_id in nodes):
-            raise ValueError("Hyperedge contains invalid node IDs.")
-        
-        he_tuple = tuple(sorted(nodes))
-        if he_tuple not in self.hyperedge_stalks:
-            self.hyperedges.append(he_tuple)
-            self.hyperedge_stalks[he_tuple] = torch.randn(self.feature_dim, device=DEVICE)
-        else:
-            print(f"Hyperedge {he_tuple} already exists, skipping.")
+        self._add_hyperedges_internal([nodes])
 
     def add_hyperedge(self, nodes: List[int]) -> None:
         """Public method to add a new hyperedge and initialize its stalk."""
         self._add_hyperedge_internal(nodes)
-        print(f"Added new hyperedge: {tuple(sorted(nodes))}")
+        logger.debug("Added new hyperedge: %s", nodes)
 
+    def add_hyperedges(self, hyperedges_data: Sequence[Sequence[int]]) -> List[int]:
+        """Adds many hyperedges in one append; returns the rows of those that were new."""
+        return self._add_hyperedges_internal(hyperedges_data)
 
     def get_incident_hyperedges(self, node_id: int) -> List[Tuple[int, ...]]:
-        """Returns hyperedges incident to a given node."""
+        """Returns hyperedges incident to a given node (O(degree) via the node index)."""
         if node_id >= self.num_nodes or node_id < 0:
             raise ValueError(f"Node ID {node_id} is out of bounds.")
-        return [he for he in self.hyperedges if node_id in he]
+        hyperedges = self._store.hyperedges
+        return [hyperedges[row] for row in self._store.node_hyperedges[node_id]]
 
     def update_stalk_from_nodes(self, hyperedge: Tuple[int, ...]):
         """
@@ -78,19 +198,37 @@ class SheafHypergraph:
         """
         if hyperedge not in self.hyperedge_stalks:
             raise ValueError(f"Hyperedge {hyperedge} not found.")
+        if not hyperedge:
+            return  # No members to aggregate: the stalk is left as is, as in update_all_stalks.
+        row = self._store.ids[hyperedge]
+        # Simple aggregation (e.g., mean) of node features
+        aggregated_node_features = self.features[list(hyperedge)].mean(dim=0)
+        # Update stalk with some influence from aggregated node features
+        stalk = self._store.stalk[row]
+        stalk.mul_(0.5).add_(aggregated_node_features, alpha=0.5)
 
-        incident_node_features: List[torch.Tensor] = [
-            self.node_features[node] for node in hyperedge if node in self.node_features
-        ]
-        
-        if incident_node_features:
-            # Simple aggregation (e.g., mean) of node features
-            aggregated_node_features = torch.mean(torch.stack(incident_node_features), dim=0)
-            # Update stalk with some influence from aggregated node features
-            self.hyperedge_stalks[hyperedge] = (
-                self.hyperedge_stalks[hyperedge] * 0.5 + aggregated_node_features * 0.5
-            ).to(DEVICE)
-            # print(f"Updated stalk for hyperedge {hyperedge}.") # Remove for cleaner test output
+    def update_all_stalks(self, hyperedge_ids: Optional[Sequence[int]] = None) -> None:
+        """
+        Batched `update_stalk_from_nodes` for every hyperedge (or the rows in `hyperedge_ids`):
+        all member-feature means come from one segment reduction (an index_add over the
+        incidence columns) and are blended into the stalk tensor in place.
+        """
+        node_ids, edge_ids = self.incidence_index
+        if hyperedge_ids is not None:
+            rows = torch.as_tensor(hyperedge_ids, dtype=torch.long, device=self.device)
+            keep = torch.isin(edge_ids, rows)
+            node_ids, edge_ids = node_ids[keep], edge_ids[keep]
+        num_hyperedges = self.num_hyperedges
+        sums = torch.zeros(num_hyperedges, self.feature_dim, device=self.device)
+        sums.index_add_(0, edge_ids, self.features[node_ids])
+        sizes = torch.bincount(edge_ids, minlength=num_hyperedges)
+        touched = sizes > 0
+        stalks = self.stalks
+        if bool(touched.all()):
+            stalks.mul_(0.5).add_(sums / sizes.unsqueeze(1).to(sums.dtype), alpha=0.5)
+        else:
+            means = sums[touched] / sizes[touched].unsqueeze(1).to(sums.dtype)
+            stalks[touched] = stalks[touched] * 0.5 + means * 0.5
 
 class SheafHypergraphNetwork(nn.Module):
     """
@@ -104,38 +242,84 @@ class SheafHypergraphNetwork(nn.Module):
         self.in_features = in_features
         self.out_features = out_features
         # A simple linear layer to transform aggregated stalk features
-        self.linear_transform = nn.Linear(in_features, out_features).to(DEVICE)
-        print(f"Initialized SHN layer with input={in_features}, output={out_features} features.")
+        self.linear_transform = nn.Linear(in_features, out_features).to(get_device())
+        logger.info("Initialized SHN layer with input=%d, output=%d features.", in_features, out_features)
+
+    def forward_dense(self, hypergraph_instance: SheafHypergraph) -> torch.Tensor:
+        """
+        Vectorized forward pass returning an `(N, out_features)` tensor:
+        one batched Linear over all stalks, a scatter-add of each transformed stalk into its
+        member nodes along the incidence columns, and a division by node degree.
+        Nodes that belong to no hyperedge keep their input features (when the widths match).
+        Everything is differentiable, so the layer can be trained end to end.
+        """
+        structure = hypergraph_instance.incidence_structure()
+        averaged = structure.hyperedges_to_nodes(self.linear_transform(hypergraph_instance.stalks))
+        if self.in_features == self.out_features:
+            averaged = torch.where(structure.isolated, hypergraph_instance.features, averaged)
+        return averaged
 
     def forward(self, hypergraph_instance: SheafHypergraph) -> Dict[int, torch.Tensor]:
         """
         Forward pass: Nodes receive messages from their incident hyperedge stalks.
+        Returns one feature row per node ID; see `forward_dense` for the tensor form.
         """
-        # Dictionary to accumulate messages for each node
-        new_node_features_sum: Dict[int, torch.Tensor] = {
-            node_id: torch.zeros(self.out_features, device=DEVICE) for node_id in hypergraph_instance.node_features
-        }
-        # Dictionary to count how many hyperedges contribute to each node's update
-        node_update_count: Dict[int, int] = {
-            node_id: 0 for node_id in hypergraph_instance.node_features
-        }
-
-        for he_tuple, stalk in hypergraph_instance.hyperedge_stalks.items():
-            # Apply transformation to the stalk
-            transformed_stalk = self.linear_transform(stalk)
-            
-            for node_id in he_tuple:
-                if node_id in new_node_features_sum: # Ensure node exists
-                    new_node_features_sum[node_id] += transformed_stalk
-                    node_update_count[node_id] += 1
-        
-        # Average the updates for nodes (simple normalization)
-        output_node_features: Dict[int, torch.Tensor] = {}
-        for node_id in hypergraph_instance.node_features: # Iterate through all original nodes
-            if node_update_count[node_id] > 0:
-                output_node_features[node_id] = new_node_features_sum[node_id] / node_update_count[node_id]
+        output = self.forward_dense(hypergraph_instance)
+        return {node_id: output[node_id] for node_id in range(hypergraph_instance.num_nodes)}
+
+
+class SheafHypergraphConv(nn.Module):
+    """
+    Stackable SHN layer on dense tensors: node features are averaged into their hyperedges,
+    transformed by one Linear, and averaged back into the nodes, i.e. (N, in) -> (N, out).
+    Averaging commutes with the affine transform, so the Linear runs on whichever side
+    (nodes or hyperedges) has fewer rows times output width.
+    """
+    def __init__(self, in_features: int, out_features: int):
+        super().__init__()
+        self.in_features = in_features
+        self.out_features = out_features
+        self.linear_transform = nn.Linear(in_features, out_features).to(get_device())
+
+    def forward(self, x: torch.Tensor, structure: IncidenceStructure) -> torch.Tensor:
+        if structure.num_nodes <= structure.num_hyperedges:
+            messages = structure.nodes_to_hyperedges(self.linear_transform(x))
+        else:
+            messages = self.linear_transform(structure.nodes_to_hyperedges(x))
+        return structure.hyperedges_to_nodes(messages)
+
+
+class SheafHypergraphStack(nn.Module):
+    """
+    Multi-layer SHN: a stack of SheafHypergraphConv layers with an activation in between.
+    Layers exchange plain `(N, F)` tensors and share one IncidenceStructure, so the
+    incidence normalisation is computed once per hypergraph rather than once per layer.
+    With `checkpoint=True`, each layer's activations are recomputed during backward
+    instead of stored, trading compute for memory on deep stacks.
+    """
+    def __init__(self, feature_dims: Sequence[int], activation: Optional[nn.Module] = None, checkpoint: bool = False):
+        super().__init__()
+        if len(feature_dims) < 2:
+            raise ValueError("A stack needs at least an input and an output width.")
+        self.layers = nn.ModuleList(
+            SheafHypergraphConv(d_in, d_out) for d_in, d_out in zip(feature_dims[:-1], feature_dims[1:])
+        )
+        self.activation = activation if activation is not None else nn.ReLU()
+        self.checkpoint = checkpoint
+        logger.info("Initialized SHN stack with widths %s (checkpointing %s).", list(feature_dims), "on" if checkpoint else "off")
+
+    def _block(self, index: int, x: torch.Tensor, structure: IncidenceStructure) -> torch.Tensor:
+        x = self.layers[index](x, structure)
+        return self.activation(x) if index < len(self.layers) - 1 else x
+
+    def forward(self, x: torch.Tensor, structure: IncidenceStructure) -> torch.Tensor:
+        for index in range(len(self.layers)):
+            if self.checkpoint and torch.is_grad_enabled():
+                x = checkpoint(self._block, index, x, structure, use_reentrant=False)
             else:
-                # If a node is not part of any hyperedge, its feature remains its original
-                output_node_features[node_id] = hypergraph_instance.node_features[node_id].clone().to(DEVICE) # Ensure it's a clone and on device
+                x = self._block(index, x, structure)
+        return x
 
-        return output_node_features
\ No newline at end of file
+    def forward_hypergraph(self, hypergraph_instance: SheafHypergraph) -> torch.Tensor:
+        """Runs the stack on a hypergraph's own node features."""
+        return self(hypergraph_instance.features, hypergraph_instance.incidence_structure())
@@ -1,11 +1,14 @@
 # ~/aurora_project/core_modules/hnk/tests.py
+import logging
 import torch
 # Removed unused imports from typing (Dict, List, Tuple) for tidiness if not directly used in the test script
 from typing import Dict, List, Tuple # Keep these if they are used in type hints within this file's functions
 
-from .sheaf_hypergraph_network import SheafHypergraph, SheafHypergraphNetwork, DEVICE
+from .sheaf_hypergraph_network import SheafHypergraph, SheafHypergraphNetwork, SheafHypergraphStack, DEVICE
 
 if __name__ == "__main__":
+    # Module loggers are silent by default; surface their INFO messages while testing.
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
     print("--- Running HNK Module Basic Tests (PyTorch-Native) ---")
 
     # 1. Test CUDA availability and PyTorch setup (should be fine as CESS Mesh passed)
@@ -67,4 +70,208 @@ if __name__ == "__main__":
         assert f.device.type == DEVICE.type, f"Output node {nid} feature not on {DEVICE.type}" # Corrected assertion
     print(f"All output node features confirmed on {DEVICE.type}.")
 
+    # 5. Tensor backend: feature/stalk tensors, incidence structure and dict views
+    print("\nTesting tensor-backed hypergraph storage:")
+    assert hypergraph.features.shape == (num_nodes, feature_dim)
+    assert hypergraph.stalks.shape == (len(hypergraph.hyperedges), feature_dim)
+    assert hypergraph.node_features[3].data_ptr() == hypergraph.features[3].data_ptr(), "Views must alias the tensor"
+    for node in range(num_nodes):
+        scanned = [he for he in hypergraph.hyperedges if node in he]
+        assert hypergraph.get_incident_hyperedges(node) == scanned, f"Incidence index wrong for node {node}"
+    dense_incidence = hypergraph.incidence_matrix().to_dense()
+    for row, he in enumerate(hypergraph.hyperedges):
+        assert set(torch.nonzero(dense_incidence[:, row]).flatten().tolist()) == set(he)
+        assert hypergraph.hyperedge_id(he) == row
+    assert hypergraph.node_degrees().tolist() == [len(hypergraph.get_incident_hyperedges(n)) for n in range(num_nodes)]
+    assert hypergraph.hyperedge_sizes().tolist() == [len(he) for he in hypergraph.hyperedges]
+    hypergraph.add_hyperedge([4, 0])  # Duplicate of (0, 4): must be skipped
+    assert len(hypergraph.hyperedges) == 4
+    before = hypergraph.hyperedge_stalks[(1, 3)].clone()
+    expected = before * 0.5 + torch.stack([hypergraph.node_features[1], hypergraph.node_features[3]]).mean(dim=0) * 0.5
+    hypergraph.update_stalk_from_nodes((1, 3))
+    assert torch.allclose(hypergraph.stalks[hypergraph.hyperedge_id((1, 3))], expected)
+    grown = SheafHypergraph(num_nodes=50, hyperedges_data=[], feature_dim=4, seed=0)
+    rows = grown.add_hyperedges([[i, (i + 1) % 50, (i + 7) % 50] for i in range(50)])
+    assert rows == list(range(50)) and grown.incidence_index.shape == (2, 150)
+    print("Tensor-backed storage and O(degree) incidence index verified.")
+
+    # 6. Vectorized forward pass matches the original per-stalk loop
+    from .reference import loop_forward
+    print("\nTesting vectorized SHN forward:")
+    with_isolated = SheafHypergraph(num_nodes=8, hyperedges_data=hyperedges_data + [[0, 4, 5], [5, 6]], feature_dim=feature_dim, seed=1)
+    for layer in (shn_layer, SheafHypergraphNetwork(in_features=feature_dim, out_features=feature_dim)):
+        dense = layer.forward_dense(with_isolated)
+        reference = loop_forward(layer, with_isolated)
+        assert dense.shape == (8, feature_dim)
+        for node, expected in reference.items():
+            assert torch.allclose(dense[node], expected, atol=1e-6), f"Dense forward differs at node {node}"
+    assert torch.equal(dense[7], with_isolated.features[7]), "Isolated nodes keep their features"
+    dense.sum().backward()
+    assert layer.linear_transform.weight.grad is not None, "Dense forward must be differentiable"
+    print("Vectorized forward matches the loop implementation and supports autograd.")
+
+    # 7. Batched stalk update matches per-hyperedge updates
+    print("\nTesting batched stalk updates:")
+    batched = SheafHypergraph(num_nodes=30, hyperedges_data=[[i % 30, (i + 3) % 30, (i * 7 + 11) % 30] for i in range(40)], feature_dim=4, seed=2)
+    sequential_stalks = batched.stalks.clone()
+    for row, he in enumerate(batched.hyperedges):
+        mean = batched.features[list(he)].mean(dim=0)
+        sequential_stalks[row] = sequential_stalks[row] * 0.5 + mean * 0.5
+    stalk_storage = batched.stalks.data_ptr()
+    batched.update_all_stalks()
+    assert torch.allclose(batched.stalks, sequential_stalks, atol=1e-6)
+    assert batched.stalks.data_ptr() == stalk_storage, "Stalks must be updated in place"
+    subset = [0, 5, 17]
+    untouched = batched.stalks.clone()
+    expected_subset = untouched.clone()
+    for row in subset:
+        expected_subset[row] = untouched[row] * 0.5 + batched.features[list(batched.hyperedges[row])].mean(dim=0) * 0.5
+    batched.update_all_stalks(subset)
+    assert torch.allclose(batched.stalks, expected_subset, atol=1e-6), "Only the requested hyperedges may change"
+    # An empty hyperedge has no members to aggregate: both paths leave its stalk untouched.
+    with_empty = SheafHypergraph(4, [[0, 1], []], feature_dim=3, seed=0)
+    empty_stalk = with_empty.hyperedge_stalks[()].clone()
+    with_empty.update_stalk_from_nodes(())
+    assert torch.equal(with_empty.hyperedge_stalks[()], empty_stalk)
+    with_empty.update_all_stalks()
+    assert torch.equal(with_empty.hyperedge_stalks[()], empty_stalk) and not with_empty.stalks.isnan().any()
+    print("Batched stalk update verified against update_stalk_from_nodes semantics.")
+
+    # 8. Neighbourhood sampling and mini-batch streaming
+    from torch.utils.data import DataLoader
+    from .sampling import NeighborhoodSampler, SubHypergraphDataset
+    print("\nTesting k-hop sub-hypergraph sampling:")
+    big = SheafHypergraph(num_nodes=200, hyperedges_data=[[i % 200, (i * 7 + 1) % 200, (i * 13 + 5) % 200] for i in range(400)],
+                          feature_dim=feature_dim, seed=3)
+    sampler = NeighborhoodSampler(big, fanout=(3, 2), seed=0)
+    sampled = sampler.sample([0, 1, 2])
+    sub_graph, node_ids, hyperedge_ids = sampled.hypergraph, sampled.node_ids, sampled.hyperedge_ids
+    assert node_ids[:3].tolist() == [0, 1, 2] and sampled.num_seeds == 3
+    assert torch.equal(sub_graph.features, big.features[node_ids])
+    assert torch.equal(sub_graph.stalks, big.stalks[hyperedge_ids])
+    for local_he, global_row in zip(sub_graph.hyperedges, hyperedge_ids.tolist()):
+        assert sorted(node_ids[list(local_he)].tolist()) == list(big.hyperedges[global_row])
+    one_hop = NeighborhoodSampler(big, fanout=2, seed=0).sample([5])
+    assert len(one_hop.hypergraph.hyperedges) <= 2, "Fan-out limit must cap the hyperedges per frontier node"
+
+    dataset = SubHypergraphDataset(big, batch_size=32, fanout=(4, 2))
+    train_layer = SheafHypergraphNetwork(in_features=feature_dim, out_features=feature_dim)
+    optimizer = torch.optim.SGD(train_layer.parameters(), lr=0.01)
+    seen_seeds: List[int] = []
+    for mini_batch in DataLoader(dataset, batch_size=None, num_workers=2):
+        seen_seeds.extend(mini_batch.node_ids[:mini_batch.num_seeds].tolist())
+        out = train_layer.forward_dense(mini_batch.hypergraph)[:mini_batch.num_seeds]
+        loss = (out - mini_batch.hypergraph.features[:mini_batch.num_seeds]).pow(2).mean()
+        optimizer.zero_grad()
+        loss.backward()
+        optimizer.step()
+    assert sorted(seen_seeds) == list(range(200)), "Each node must be a seed exactly once per epoch"
+    print(f"Sampled {len(sub_graph.hyperedges)} hyperedges / {len(node_ids)} nodes around 3 seeds; "
+          f"streamed {len(dataset)} mini-batches through 2 DataLoader workers.")
+
+    # 9. Sheaf Laplacians: sparse assembly, incremental re-assembly, nonlinear variant
+    from .nonlinear_laplacians import NonlinearSheafLaplacian, SheafLaplacian
+    print("\nTesting sheaf Laplacians:")
+    lap_graph = SheafHypergraph(num_nodes=12, hyperedges_data=[[0, 1, 2], [2, 3], [3, 4, 5, 6], [6, 7, 0], [8, 9, 10]],
+                                feature_dim=3, seed=4)
+    num_incidences = lap_graph.incidence_index.shape[1]
+    maps = torch.randn(num_incidences, 3, 3, device=DEVICE)
+    laplacian = SheafLaplacian(lap_graph, maps.clone())
+    # Reference: L = delta^T delta with the coboundary written out as a dense matrix
+    delta = torch.zeros(num_incidences * 3, 12 * 3, device=DEVICE)
+    node_col, edge_col = lap_graph.incidence_index.tolist()
+    sizes = lap_graph.hyperedge_sizes().tolist()
+    for a in range(num_incidences):
+        for b in range(num_incidences):
+            if edge_col[a] == edge_col[b]:
+                coef = (1.0 if a == b else 0.0) - 1.0 / sizes[edge_col[a]]
+                delta[a * 3:(a + 1) * 3, node_col[b] * 3:(node_col[b] + 1) * 3] += coef * maps[b]
+    dense_reference = delta.t() @ delta
+    assert torch.allclose(laplacian.assemble().to_dense(), dense_reference, atol=1e-4), "Assembled Laplacian is wrong"
+    signal = torch.randn(12, 3, device=DEVICE)
+    assert torch.allclose(laplacian.apply(signal).reshape(-1), dense_reference @ signal.reshape(-1), atol=1e-4)
+    linear_twin = NonlinearSheafLaplacian(lap_graph, maps.clone(), activation=lambda t: t)
+    assert torch.allclose(linear_twin.apply(signal), laplacian.apply(signal), atol=1e-4), "Identity activation must be linear"
+    assert float(NonlinearSheafLaplacian(lap_graph, maps.clone()).energy(signal)) >= 0.0
+
+    # Touch two hyperedges' maps and add a new hyperedge: only those blocks are recomputed
+    full_blocks = laplacian.blocks_recomputed
+    laplacian.set_restriction_maps(torch.tensor([0, 3]), torch.randn(2, 3, 3, device=DEVICE))
+    lap_graph.add_hyperedge([9, 11])
+    assert laplacian.num_dirty_hyperedges == 3
+    incremental = laplacian.assemble().to_dense()
+    fresh = SheafLaplacian(lap_graph, laplacian.maps.clone()).assemble().to_dense()
+    assert torch.allclose(incremental, fresh, atol=1e-5), "Incremental re-assembly must match a full build"
+    assert laplacian.blocks_recomputed - full_blocks < full_blocks, "Only dirty hyperedges may be re-assembled"
+    laplacian.set_restriction_maps(torch.tensor([1, 7]), torch.randn(2, 3, 3, device=DEVICE))  # Same pattern, new values
+    fresh = SheafLaplacian(lap_graph, laplacian.maps.clone()).assemble().to_dense()
+    assert torch.allclose(laplacian.assemble().to_dense(), fresh, atol=1e-5), "In-place value update must match a full build"
+
+    plain = SheafLaplacian(lap_graph)  # Identity maps: constants are global sections
+    assert torch.allclose(plain.apply(torch.ones(12, 3, device=DEVICE)), torch.zeros(12, 3, device=DEVICE), atol=1e-5)
+    diffused = plain.diffuse(signal, steps=10, step_size=0.1)
+    assert float(plain.energy(diffused)) < float(plain.energy(signal)), "Diffusion must reduce the Dirichlet energy"
+    print("Sheaf Laplacian assembly, incremental updates and nonlinear diffusion verified.")
+
+    # 10. Multi-layer stacks on dense tensors with a shared incidence structure
+    print("\nTesting multi-layer SHN stacks:")
+    structure = big.incidence_structure()
+    assert big.incidence_structure() is structure, "Incidence structure must be cached per hypergraph version"
+    torch.manual_seed(5)
+    stack = SheafHypergraphStack([feature_dim, 16, 16, 4])
+    out = stack(big.features, structure)
+    assert out.shape == (big.num_nodes, 4)
+    expected_out = big.features
+    for depth, layer in enumerate(stack.layers):
+        members_mean = torch.stack([expected_out[list(he)].mean(dim=0) for he in big.hyperedges])
+        transformed = layer.linear_transform(members_mean)
+        expected_out = torch.stack([
+            torch.stack([transformed[big.hyperedge_id(he)] for he in big.get_incident_hyperedges(n)]).mean(dim=0)
+            if big.get_incident_hyperedges(n) else torch.zeros(layer.out_features, device=DEVICE)
+            for n in range(big.num_nodes)
+        ])
+        if depth < len(stack.layers) - 1:
+            expected_out = torch.relu(expected_out)
+    assert torch.allclose(out, expected_out, atol=1e-5), "Stack output differs from per-hyperedge message passing"
+
+    out.pow(2).sum().backward()
+    plain_grads = [p.grad.clone() for p in stack.parameters()]
+    stack.zero_grad()
+    stack.checkpoint = True
+    stack.forward_hypergraph(big).pow(2).sum().backward()
+    for plain, checkpointed in zip(plain_grads, (p.grad for p in stack.parameters())):
+        assert torch.allclose(plain, checkpointed, atol=1e-5), "Checkpointing must not change gradients"
+    print("Stacked layers match the reference and checkpointed gradients are identical.")
+
+    # 11. Per-instance RNG streams: interleaved construction does not perturb either hypergraph
+    first = SheafHypergraph(num_nodes=20, hyperedges_data=[[0, 1, 2]], feature_dim=4, seed=9)
+    SheafHypergraph(num_nodes=20, hyperedges_data=[[3, 4]], feature_dim=4, seed=10)
+    torch.manual_seed(123)  # Global state no longer matters either
+    first.add_hyperedge([5, 6, 7])
+    replay = SheafHypergraph(num_nodes=20, hyperedges_data=[[0, 1, 2]], feature_dim=4, seed=9)
+    replay.add_hyperedge([5, 6, 7])
+    assert torch.equal(first.features, replay.features) and torch.equal(first.stalks, replay.stalks)
+    print("Seeded hypergraphs replay identically regardless of interleaving.")
+
+    # 12. Snapshots: hyperedge CSR, stalks and RNG state survive a round trip
+    import os
+    import tempfile
+    from core_modules.snapshot import Snapshot, load_hypergraph, save_hypergraph
+
+    with tempfile.TemporaryDirectory() as tmp:
+        snap_path = os.path.join(tmp, "hypergraph.snap")
+        save_hypergraph(first, snap_path)
+        restored = load_hypergraph(snap_path)
+        assert torch.equal(restored.incidence_index, first.incidence_index)
+        assert restored._store._hyperedges is None, "Loading must not build the hyperedge tuples"
+        assert restored.hyperedges == first.hyperedges
+        assert all(restored.get_incident_hyperedges(n) == first.get_incident_hyperedges(n) for n in range(first.num_nodes))
+        assert torch.equal(restored.features, first.features) and torch.equal(restored.stalks, first.stalks)
+        first.add_hyperedge([8, 9])
+        restored.add_hyperedge([8, 9])
+        assert torch.equal(restored.stalks, first.stalks), "Restored hypergraph must continue the same RNG stream"
+        partial = Snapshot(snap_path).node_range(0, 3)
+        assert partial.indptr.tolist() == [0, 1, 2, 3] and partial.indices.tolist() == [0, 0, 0]
+    print("Hypergraph snapshot round trip verified.")
+
     print("\n--- HNK Module Basic Tests Complete ---")
\ No newline at end of file
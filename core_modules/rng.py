@@ -0,0 +1,121 @@
+# ~/aurora_project/core_modules/rng.py
+import math
+import random
+from typing import Optional, Union
+
+import torch
+
+# SplitMix64 constants, as signed int64 (torch has no uint64 arithmetic).
+_GOLDEN = 0x9E3779B97F4A7C15 - (1 << 64)
+_MIX1 = 0xBF58476D1CE4E5B9 - (1 << 64)
+_MIX2 = 0x94D049BB133111EB - (1 << 64)
+_MASK64 = (1 << 64) - 1
+
+
+def _srl(x: torch.Tensor, k: int) -> torch.Tensor:
+    """Logical right shift of int64 bit patterns."""
+    return (x >> k) & ((1 << (64 - k)) - 1)
+
+
+def splitmix64(x: torch.Tensor) -> torch.Tensor:
+    """SplitMix64 finaliser over an int64 tensor (wrapping arithmetic), element-wise."""
+    x = x + _GOLDEN
+    for shift, mult in ((30, _MIX1), (27, _MIX2)):
+        x.bitwise_xor_(_srl(x, shift)).mul_(mult)
+    return x.bitwise_xor_(_srl(x, 31))
+
+
+def mix64(value: int) -> int:
+    """SplitMix64 of a Python int, for deriving seeds and stream keys."""
+    x = (value + 0x9E3779B97F4A7C15) & _MASK64
+    x = ((x ^ (x >> 30)) * 0xBF58476D1CE4E5B9) & _MASK64
+    x = ((x ^ (x >> 27)) * 0x94D049BB133111EB) & _MASK64
+    return x ^ (x >> 31)
+
+
+def _signed(value: int) -> int:
+    value &= _MASK64
+    return value - (1 << 64) if value >= 1 << 63 else value
+
+
+def stream_key(seed: int, *path: int) -> int:
+    """Deterministic 64-bit key of the substream `seed / path[0] / path[1] / ...`."""
+    key = mix64(seed)
+    for part in path:
+        key = mix64(key ^ mix64(part))
+    return key
+
+
+def counter_uniform(key: int, counters: torch.Tensor) -> torch.Tensor:
+    """
+    Counter-based uniforms in (0, 1), float64: element i depends only on (key, counters[i]),
+    so any subset of a stream can be drawn on its own, in any order, on any worker.
+    """
+    bits = _srl(splitmix64(counters.long() ^ _signed(key)), 11)  # top 53 bits
+    return (bits.double() + 0.5) * (1.0 / (1 << 53))
+
+
+def counter_normal(key: int, rows: torch.Tensor, dim: int) -> torch.Tensor:
+    """
+    `(len(rows), dim)` standard normals (float64) from the counter stream `key` by Box-Muller.
+    Row r depends only on (key, r): drawing noise for nodes [3, 17] gives exactly rows 3 and
+    17 of the noise for all nodes.
+    """
+    pairs = (dim + 1) // 2
+    slots = torch.arange(2 * pairs, device=rows.device)
+    counters = rows.long().unsqueeze(1) * (2 * pairs) + slots
+    u = counter_uniform(key, counters)
+    radius = torch.sqrt(-2.0 * torch.log(u[:, 0::2]))
+    angle = (2.0 * math.pi) * u[:, 1::2]
+    return torch.cat([radius * torch.cos(angle), radius * torch.sin(angle)], dim=1)[:, :dim]
+
+
+class RNGStreams:
+    """
+    Per-instance random streams, so several meshes or hypergraphs (or parallel workers)
+    never share or clobber global RNG state.
+    - `random` / `torch`: sequential `random.Random` and `torch.Generator` for construction
+      and other inherently serial draws;
+    - `substream(*path)`: an independent RNGStreams for a partition, worker or component;
+    - `normal(stream, step, rows, dim)`: counter-based noise keyed by (stream, step, row), so
+      a partitioned run draws bit-identical per-node noise to a serial run.
+    Without a seed, one is drawn from the global `random` module, so seeding it still
+    reproduces unseeded instances.
+    """
+    def __init__(self, seed: Optional[int] = None, device: Union[str, torch.device] = "cpu"):
+        self.seed: int = seed if seed is not None else random.getrandbits(63)
+        self.device = torch.device(device)
+        self.random = random.Random(self.seed)
+        self.torch = torch.Generator(device=self.device)
+        self.torch.manual_seed(stream_key(self.seed, 0) & ((1 << 63) - 1))
+
+    def substream(self, *path: int) -> "RNGStreams":
+        return RNGStreams(stream_key(self.seed, 1, *path) & ((1 << 63) - 1), self.device)
+
+    def normal(self, stream: int, step: int, rows: torch.Tensor, dim: int,
+               dtype: torch.dtype = torch.float32) -> torch.Tensor:
+        """Counter-based `(len(rows), dim)` standard normals for `rows` at `step` of `stream`."""
+        key = stream_key(self.seed, 2, stream, step)
+        return counter_normal(key, rows.to(self.device), dim).to(dtype)
+
+    def get_state(self) -> dict:
+        """Seed and stream positions, e.g. for snapshots; `torch` is a ByteTensor, the rest is plain data."""
+        return {"seed": self.seed, "random": self.random.getstate(), "torch": self.torch.get_state()}
+
+    def set_state(self, state: dict) -> None:
+        """Restores a `get_state()` result (a JSON round trip of `random` is accepted)."""
+        self.seed = state["seed"]
+        version, internal, gauss = state["random"]
+        self.random.setstate((version, tuple(internal), gauss))
+        self.torch.set_state(state["torch"])
+
+    def __getstate__(self) -> dict:
+        state = self.__dict__.copy()
+        state["torch"] = self.torch.get_state()
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        generator = torch.Generator(device=state["device"])
+        generator.set_state(state["torch"])
+        state["torch"] = generator
+        self.__dict__.update(state)
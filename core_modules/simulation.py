@@ -0,0 +1,311 @@
+# ~/aurora_project/core_modules/simulation.py
+import heapq
+import logging
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from multiprocessing.connection import Connection
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence, Tuple, Union
+
+import torch
+import torch.multiprocessing as mp
+
+from core_modules.cess_mesh.event_log import LogRecord, apply_record, mutation_record
+from core_modules.cess_mesh.mesh_simulator import CESSMesh, MeshEvent
+from core_modules.hnk.sheaf_hypergraph_network import SheafHypergraph, SheafHypergraphNetwork
+from core_modules.tgif_flow.intent import AnyIntent
+from core_modules.tgif_flow.intent_batch import IntentBatch
+from core_modules.tgif_flow.router import TGIFRouter
+
+logger = logging.getLogger(__name__)
+
+RouteResult = Tuple[bool, Optional[List[int]]]
+# A LogRecord as plain data, so shipping records to route shards pickles no tensors.
+PlainRecord = Tuple[int, int, int, List[float]]
+
+
+class StageTimings(NamedTuple):
+    """Seconds spent per stage of one scheduler step; `wall` covers the whole step, barrier included."""
+    evolve: float
+    route: float
+    learn: float
+    sync: float
+    wall: float
+
+
+class TickReport(NamedTuple):
+    """
+    The routing and message-passing outputs for one mesh tick.
+    - `tick`: the mesh tick whose state was routed over and learned from;
+    - `routes`: one (success, path) per intent, in input order;
+    - `embedding`: `(N, out_features)` SHN output, or None without a learn stage;
+    - `timings`: the step that produced them (in pipelined mode, the step evolving tick + 1).
+    """
+    tick: int
+    routes: List[RouteResult]
+    embedding: Optional[torch.Tensor]
+    timings: StageTimings
+
+
+def _timed(fn: Any, *args: Any) -> Tuple[Any, float]:
+    start = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - start
+
+
+class RouteShard:
+    """
+    Routes one shard of the intents (every intent of its sources) in a worker process,
+    over its own replica of the mesh. The replica starts from the mesh's edges and follows
+    it through the mutation records shipped with each routing request.
+    """
+    def __init__(self, edge_index: torch.Tensor, edge_weight: torch.Tensor, num_nodes: int, seed: int,
+                 sources: torch.Tensor, destinations: torch.Tensor, weighted: bool = False):
+        self.edge_index = edge_index
+        self.edge_weight = edge_weight
+        self.num_nodes = num_nodes
+        self.seed = seed
+        self.intents = IntentBatch(sources, destinations, torch.empty(sources.shape[0], 0))
+        self.weighted = weighted
+        self.router: Optional[TGIFRouter] = None
+
+    def start(self) -> None:
+        """Builds the replica and its router (in the worker, so the parent never holds them)."""
+        replica = CESSMesh.from_edge_index(self.edge_index, self.num_nodes, edge_weight=self.edge_weight, seed=self.seed)
+        self.router = TGIFRouter(replica, weighted=self.weighted)
+
+    def route(self, records: List[PlainRecord]) -> List[RouteResult]:
+        for kind, u, v, payload in records:
+            apply_record(self.router.mesh, LogRecord(kind, u, v, torch.tensor(payload, dtype=torch.float32)))
+        return self.router.route_intents(self.intents)
+
+
+def _route_worker_loop(shard: RouteShard, conn: Connection) -> None:
+    torch.set_num_threads(1)
+    shard.start()
+    while True:
+        records = conn.recv()
+        if records is None:
+            break
+        conn.send(shard.route(records))
+    conn.close()
+
+
+def _shard_by_source(sources: List[int], num_shards: int) -> List[List[int]]:
+    """Intent indices per shard: whole sources (one search each) go to the least loaded shard."""
+    by_source: Dict[int, List[int]] = {}
+    for i, source in enumerate(sources):
+        by_source.setdefault(source, []).append(i)
+    shards: List[List[int]] = [[] for _ in range(num_shards)]
+    loads = [(0, k) for k in range(num_shards)]
+    for source in sorted(by_source, key=lambda s: (-len(by_source[s]), s)):
+        load, k = heapq.heappop(loads)
+        shards[k].extend(by_source[source])
+        heapq.heappush(loads, (load + 1, k))
+    return [sorted(indices) for indices in shards]
+
+
+class SimulationScheduler:
+    """
+    Drives a CESS Mesh, a TGIF Router and an SHN layer tick by tick as three stages:
+    - evolve: `moves_per_tick` Pachner rewires and one `update_node_properties` on the mesh;
+    - route: the intents routed over the mesh as of the last completed tick;
+    - learn: that tick's node state copied into the hypergraph's features, stalks refreshed
+      and one `forward_dense` pass.
+    Route and learn never touch the live mesh: they read a replica whose topology follows the
+    live mesh through its mutation records (see cess_mesh.event_log) and whose node state is
+    the second half of a double buffer, both advanced only at the barrier between steps.
+    With `pipelined=True` a step runs evolve(t + 1) concurrently with route(t) and learn(t)
+    on a thread pool; otherwise the stages run back to back. Both modes produce identical
+    reports. Routing is pure Python and holds the GIL, so in-process it only overlaps with
+    the torch work of the other stages; with `route_workers > 0` the intents are split by
+    source across that many worker processes (each with its own replica, fed the same
+    mutation records), so routing runs beside evolve and learn and is itself parallel.
+    How much this gains depends on free cores and on the slowest stage: a step can never
+    be faster than its slowest stage, which `bench_scheduler` reports.
+
+        with SimulationScheduler(mesh, intents, hypergraph, network) as scheduler:
+            for report in scheduler.run(100):
+                ...
+            print(scheduler.summary())
+    """
+    def __init__(self, mesh: CESSMesh, intents: Union[Sequence[AnyIntent], IntentBatch],
+                 hypergraph: Optional[SheafHypergraph] = None, network: Optional[SheafHypergraphNetwork] = None,
+                 moves_per_tick: int = 0, noise_scale: float = 0.1, pipelined: bool = True, weighted: bool = False,
+                 route_workers: int = 0):
+        if (hypergraph is None) != (network is None):
+            raise ValueError("The learn stage needs both a hypergraph and a network.")
+        if hypergraph is not None and (hypergraph.num_nodes > mesh.num_nodes or hypergraph.feature_dim != mesh.NODE_STATE_DIM):
+            raise ValueError(f"Hypergraph features ({hypergraph.num_nodes} x {hypergraph.feature_dim}) must be rows "
+                             f"of the mesh node state ({mesh.num_nodes} x {mesh.NODE_STATE_DIM}).")
+        self.mesh = mesh
+        self.intents = intents
+        self.hypergraph = hypergraph
+        self.network = network
+        self.moves_per_tick = moves_per_tick
+        self.noise_scale = noise_scale
+        self.pipelined = pipelined
+        # The replica is the consistent snapshot route/learn read while the live mesh evolves.
+        self.replica = CESSMesh.from_edge_index(mesh.edge_index.clone(), mesh.num_nodes, node_state=mesh.node_state.clone(),
+                                                edge_weight=mesh.edge_weight.clone(), seed=mesh.rng.seed)
+        self.replica.tick_count = mesh.tick_count
+        self.timings: List[StageTimings] = []
+        self._pending: List[LogRecord] = []
+        self._unsent: List[PlainRecord] = []  # Applied to the replica, not yet shipped to route shards.
+        self._ready = False  # Whether the replica holds a tick not yet routed and learned.
+        self._conns: List[Connection] = []
+        self._processes: List[mp.Process] = []
+        self._shard_indices: List[List[int]] = []
+        self.router: Optional[TGIFRouter] = None
+        if route_workers > 0:
+            self._start_route_workers(route_workers, weighted)
+        else:
+            self.router = TGIFRouter(self.replica, weighted=weighted)
+        self._pool: Optional[ThreadPoolExecutor] = ThreadPoolExecutor(max_workers=3, thread_name_prefix="aurora-sim") if pipelined else None
+        mesh.add_listener(self._on_mesh_event)
+        self._attached = True
+
+    def _start_route_workers(self, num_workers: int, weighted: bool) -> None:
+        if isinstance(self.intents, IntentBatch):
+            sources, destinations = self.intents.source_ids.tolist(), self.intents.destination_ids.tolist()
+        else:
+            sources = [intent.source_node_id for intent in self.intents]
+            destinations = [intent.destination_node_id for intent in self.intents]
+        self._num_intents = len(sources)
+        ctx = mp.get_context()
+        for indices in _shard_by_source(sources, num_workers):
+            shard = RouteShard(self.mesh.edge_index.clone(), self.mesh.edge_weight.clone(), self.mesh.num_nodes,
+                               self.mesh.rng.seed, torch.tensor([sources[i] for i in indices], dtype=torch.long),
+                               torch.tensor([destinations[i] for i in indices], dtype=torch.long), weighted)
+            parent, child = ctx.Pipe()
+            process = ctx.Process(target=_route_worker_loop, args=(shard, child), daemon=True)
+            process.start()
+            child.close()
+            self._conns.append(parent)
+            self._processes.append(process)
+            self._shard_indices.append(indices)
+        logger.info("Routing %d intents on %d worker processes.", self._num_intents, num_workers)
+
+    def _on_mesh_event(self, event: MeshEvent) -> None:
+        record = mutation_record(self.mesh, event)
+        if record is not None:
+            self._pending.append(record)
+
+    # --- Stages ---
+    def _evolve(self) -> None:
+        if self.moves_per_tick > 0:
+            self.mesh.perform_pachner_moves(self.moves_per_tick)
+        self.mesh.update_node_properties(self.noise_scale)
+
+    def _route(self) -> List[RouteResult]:
+        if self.router is not None:
+            return self.router.route_intents(self.intents)
+        records, self._unsent = self._unsent, []
+        for conn in self._conns:
+            conn.send(records)
+        routes: List[RouteResult] = [(False, None)] * self._num_intents
+        for conn, indices in zip(self._conns, self._shard_indices):
+            for i, result in zip(indices, conn.recv()):
+                routes[i] = result
+        return routes
+
+    def _learn(self) -> Optional[torch.Tensor]:
+        if self.hypergraph is None or self.network is None:
+            return None
+        with torch.no_grad():
+            self.hypergraph.features.copy_(self.replica.node_state[:self.hypergraph.num_nodes])
+            self.hypergraph.update_all_stalks()
+            return self.network.forward_dense(self.hypergraph)
+
+    def _sync(self) -> None:
+        """The barrier: advances the replica to the live mesh's last completed tick."""
+        records, self._pending = self._pending, []
+        for record in records:
+            apply_record(self.replica, record)
+        if self._conns:
+            self._unsent.extend((r.kind, r.u, r.v, r.payload.tolist()) for r in records)
+        self.replica.node_state.copy_(self.mesh.node_state)
+        self.replica.tick_count = self.mesh.tick_count
+        self._ready = True
+
+    # --- Driving ---
+    def step(self) -> Optional[TickReport]:
+        """
+        Evolves the mesh by one tick. Returns the report of the tick routed and learned in
+        this step: the new tick when serial, the previous one when pipelined (None on the first).
+        """
+        wall_start = time.perf_counter()
+        report_tick = self.replica.tick_count - 1
+        routes: Optional[List[RouteResult]] = None
+        embedding: Optional[torch.Tensor] = None
+        route_s = learn_s = 0.0
+        if self._pool is not None:
+            evolve_future: Future = self._pool.submit(_timed, self._evolve)
+            if self._ready:
+                route_future: Future = self._pool.submit(_timed, self._route)
+                learn_future: Future = self._pool.submit(_timed, self._learn)
+                routes, route_s = route_future.result()
+                embedding, learn_s = learn_future.result()
+            _, evolve_s = evolve_future.result()
+            _, sync_s = _timed(self._sync)
+        else:
+            _, evolve_s = _timed(self._evolve)
+            _, sync_s = _timed(self._sync)
+            report_tick = self.replica.tick_count - 1
+            routes, route_s = _timed(self._route)
+            embedding, learn_s = _timed(self._learn)
+        timings = StageTimings(evolve_s, route_s, learn_s, sync_s, time.perf_counter() - wall_start)
+        self.timings.append(timings)
+        if routes is None:
+            return None
+        return TickReport(report_tick, routes, embedding, timings)
+
+    def drain(self) -> Optional[TickReport]:
+        """Routes and learns the last evolved tick if the pipeline still holds it."""
+        if self._pool is None or not self._ready:
+            return None
+        self._ready = False
+        start = time.perf_counter()
+        route_future: Future = self._pool.submit(_timed, self._route)
+        learn_future: Future = self._pool.submit(_timed, self._learn)
+        routes, route_s = route_future.result()
+        embedding, learn_s = learn_future.result()
+        timings = StageTimings(0.0, route_s, learn_s, 0.0, time.perf_counter() - start)
+        self.timings.append(timings)
+        return TickReport(self.replica.tick_count - 1, routes, embedding, timings)
+
+    def run(self, ticks: int) -> List[TickReport]:
+        """Evolves `ticks` ticks and returns the report of every one of them, in tick order."""
+        reports = [report for report in (self.step() for _ in range(ticks)) if report is not None]
+        final = self.drain()
+        if final is not None:
+            reports.append(final)
+        return reports
+
+    def summary(self) -> dict:
+        """Mean seconds per step for each stage, and end-to-end ticks per second."""
+        steps = [t for t in self.timings if t.evolve > 0.0] or self.timings
+        total_wall = sum(t.wall for t in self.timings)
+        means = {field: sum(getattr(t, field) for t in steps) / max(len(steps), 1) for field in StageTimings._fields}
+        return {**means, "ticks": len(steps), "ticks_per_s": len(steps) / total_wall if total_wall > 0 else 0.0}
+
+    def close(self) -> None:
+        """Detaches from the mesh and stops the thread pool and route workers."""
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+            self.pipelined = False
+        for conn in self._conns:
+            conn.send(None)
+            conn.close()
+        for process in self._processes:
+            process.join()
+        self._conns, self._processes = [], []
+        if self._attached:
+            self.mesh.remove_listener(self._on_mesh_event)
+            self._attached = False
+
+    def __enter__(self) -> "SimulationScheduler":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
@@ -0,0 +1,242 @@
+# ~/aurora_project/core_modules/snapshot.py
+import json
+import logging
+import mmap
+import os
+import struct
+from typing import TYPE_CHECKING, Any, Dict, Iterator, NamedTuple, Optional, Tuple
+
+import torch
+
+if TYPE_CHECKING:
+    from core_modules.cess_mesh.mesh_simulator import CESSMesh
+    from core_modules.hnk.sheaf_hypergraph_network import SheafHypergraph
+
+logger = logging.getLogger(__name__)
+
+# File layout: MAGIC | u64 header length | JSON header | padding | arrays, each 64-byte aligned.
+# The header records the snapshot kind, free-form metadata and, per array, its dtype,
+# shape and byte offset from the start of the data section.
+MAGIC = b"AURSNAP\x01"
+ALIGN = 64
+KIND_MESH = "cess_mesh"
+KIND_HYPERGRAPH = "sheaf_hypergraph"
+
+
+def _align(n: int) -> int:
+    return (n + ALIGN - 1) // ALIGN * ALIGN
+
+
+def write_snapshot(path: str, kind: str, arrays: Dict[str, torch.Tensor], meta: Optional[Dict[str, Any]] = None) -> None:
+    """
+    Writes named tensors and JSON-serialisable metadata as one snapshot file.
+    The file is sized up front and every array is copied into a writable mapping in one bulk
+    copy; it is written under a temporary name and renamed, so readers never see a partial file.
+    """
+    entries: Dict[str, Dict[str, Any]] = {}
+    offset = 0
+    contiguous: Dict[str, torch.Tensor] = {}
+    for name, tensor in arrays.items():
+        tensor = tensor.detach().cpu().contiguous()
+        contiguous[name] = tensor
+        nbytes = tensor.numel() * tensor.element_size()
+        entries[name] = {"dtype": str(tensor.dtype).replace("torch.", ""), "shape": list(tensor.shape),
+                         "offset": offset, "nbytes": nbytes}
+        offset = _align(offset + nbytes)
+    header = json.dumps({"kind": kind, "meta": meta or {}, "arrays": entries}).encode("utf-8")
+    data_start = _align(len(MAGIC) + 8 + len(header))
+    total = data_start + offset
+
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(MAGIC + struct.pack("<Q", len(header)) + header)
+        f.truncate(max(total, 1))
+    with open(tmp_path, "r+b") as f, mmap.mmap(f.fileno(), 0) as mapped:
+        for name, tensor in contiguous.items():
+            entry = entries[name]
+            if entry["nbytes"]:
+                target = torch.frombuffer(mapped, dtype=torch.uint8, count=entry["nbytes"], offset=data_start + entry["offset"])
+                target.copy_(tensor.view(-1).view(torch.uint8))
+                del target  # Release the exported buffer before the mapping closes.
+        mapped.flush()
+    os.replace(tmp_path, path)
+    logger.info("Wrote %s snapshot %s (%d arrays, %.1f MB).", kind, path, len(entries), total / 2**20)
+
+
+class NodeRange(NamedTuple):
+    """
+    The rows of a node range [start, stop) and their CSR neighbourhoods.
+    - `rows`: `(stop - start, D)` per-node array (node state or features);
+    - `indptr`: `(stop - start + 1,)` offsets into `indices`, rebased to 0;
+    - `indices`: neighbour (mesh) or hyperedge (hypergraph) IDs of the range, global IDs;
+    - `weights`: matching edge weights, or None.
+    """
+    start: int
+    stop: int
+    rows: torch.Tensor
+    indptr: torch.Tensor
+    indices: torch.Tensor
+    weights: Optional[torch.Tensor]
+
+
+class Snapshot:
+    """
+    A snapshot file opened through a copy-on-write memory map.
+    `array(name)` returns a tensor backed directly by the mapped pages (no read, no copy):
+    pages are loaded lazily on first touch and shared through the page cache by every
+    process mapping the same file. Writing to a returned tensor only changes this process's
+    private copy of the touched pages, never the file.
+    """
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY)
+        if self._map[:len(MAGIC)] != MAGIC:
+            raise ValueError(f"{path} is not an AURORA snapshot.")
+        (header_len,) = struct.unpack("<Q", self._map[len(MAGIC):len(MAGIC) + 8])
+        header = json.loads(self._map[len(MAGIC) + 8:len(MAGIC) + 8 + header_len].decode("utf-8"))
+        self.kind: str = header["kind"]
+        self.meta: Dict[str, Any] = header["meta"]
+        self.arrays: Dict[str, Dict[str, Any]] = header["arrays"]
+        self._data_start = _align(len(MAGIC) + 8 + header_len)
+
+    def __contains__(self, name: object) -> bool:
+        return name in self.arrays
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.arrays)
+
+    def _view(self, name: str, first: int, count: int, shape: Tuple[int, ...]) -> torch.Tensor:
+        entry = self.arrays[name]
+        dtype = getattr(torch, entry["dtype"])
+        if count == 0:
+            return torch.empty(shape, dtype=dtype)
+        element_size = torch.empty((), dtype=dtype).element_size()
+        flat = torch.frombuffer(self._map, dtype=dtype, count=count,
+                                offset=self._data_start + entry["offset"] + first * element_size)
+        return flat.view(shape)
+
+    def array(self, name: str) -> torch.Tensor:
+        """The whole array, zero-copy."""
+        shape = tuple(self.arrays[name]["shape"])
+        count = 1
+        for dim in shape:
+            count *= dim
+        return self._view(name, 0, count, shape)
+
+    def rows(self, name: str, start: int, stop: int) -> torch.Tensor:
+        """Rows [start, stop) of an array, zero-copy; only those rows' pages are ever touched."""
+        shape = tuple(self.arrays[name]["shape"])
+        stop = min(stop, shape[0])
+        start = min(max(start, 0), stop)
+        row_size = 1
+        for dim in shape[1:]:
+            row_size *= dim
+        return self._view(name, start * row_size, (stop - start) * row_size, (stop - start,) + shape[1:])
+
+    def csr_rows(self, prefix: str, start: int, stop: int) -> Tuple[torch.Tensor, torch.Tensor, Optional[torch.Tensor]]:
+        """Rows [start, stop) of the CSR stored as `{prefix}_ptr` / `_index` (/ `_weight`): (indptr, indices, weights)."""
+        indptr = self.rows(f"{prefix}_ptr", start, stop + 1)
+        first, last = int(indptr[0]), int(indptr[-1])
+        indices = self.rows(f"{prefix}_index", first, last)
+        weights = self.rows(f"{prefix}_weight", first, last) if f"{prefix}_weight" in self else None
+        return indptr - first, indices, weights
+
+    def node_range(self, start: int, stop: int) -> NodeRange:
+        """Lazily loads nodes [start, stop): their state/feature rows and CSR neighbourhoods."""
+        if self.kind == KIND_MESH:
+            rows, prefix = self.rows("node_state", start, stop), "adjacency"
+        else:
+            rows, prefix = self.rows("features", start, stop), "node_hyperedges"
+        indptr, indices, weights = self.csr_rows(prefix, start, start + rows.shape[0])
+        return NodeRange(start, start + rows.shape[0], rows, indptr, indices, weights)
+
+    def close(self) -> None:
+        """Drops this handle's mapping; tensors already returned keep it alive until released."""
+        self._map = None  # type: ignore[assignment]
+
+
+def _csr(rows: torch.Tensor, cols: torch.Tensor, num_rows: int) -> Tuple[torch.Tensor, torch.Tensor]:
+    """(indptr, order) of a CSR grouping of (rows, cols) pairs, with each row's columns sorted."""
+    order = torch.argsort(rows * max(int(cols.max().item()) + 1 if cols.numel() else 1, 1) + cols)
+    indptr = torch.zeros(num_rows + 1, dtype=torch.long)
+    indptr[1:] = torch.cumsum(torch.bincount(rows, minlength=num_rows), dim=0)
+    return indptr, order
+
+
+def _rng_arrays(rng: Any) -> Tuple[Dict[str, torch.Tensor], Dict[str, Any]]:
+    state = rng.get_state()
+    return {"rng_torch_state": state["torch"]}, {"rng_seed": state["seed"], "rng_random_state": state["random"]}
+
+
+def _restore_rng(rng: Any, snapshot: Snapshot) -> None:
+    rng.set_state({"seed": snapshot.meta["rng_seed"], "random": snapshot.meta["rng_random_state"],
+                   "torch": snapshot.array("rng_torch_state").clone()})
+
+
+def save_mesh(mesh: "CESSMesh", path: str, meta: Optional[Dict[str, Any]] = None) -> None:
+    """
+    Snapshots a CESS Mesh: node state, the packed COO edge index and weights (in slot order,
+    so a restore is exact), a symmetric adjacency CSR for partial node-range loads, the
+    evolution tick and the mesh's RNG state.
+    """
+    indptr, indices, weights = mesh.csr()
+    rng_arrays, rng_meta = _rng_arrays(mesh.rng)
+    arrays = {"node_state": mesh.node_state, "edge_index": mesh.edge_index, "edge_weight": mesh.edge_weight,
+              "adjacency_ptr": indptr, "adjacency_index": indices, "adjacency_weight": weights, **rng_arrays}
+    info = {"num_nodes": mesh.num_nodes, "num_edges": mesh.num_edges, "tick_count": mesh.tick_count, **rng_meta, **(meta or {})}
+    write_snapshot(path, KIND_MESH, arrays, info)
+
+
+def load_mesh(path: str) -> "CESSMesh":
+    """
+    Restores a CESS Mesh from a snapshot. Node state, edge index and weights are adopted
+    zero-copy from the memory map; the networkx adjacency and edge-slot map are only built
+    on first use (tensor ops such as `csr()` or evolution noise never need them).
+    """
+    from core_modules.cess_mesh.mesh_simulator import CESSMesh
+    snapshot = Snapshot(path)
+    if snapshot.kind != KIND_MESH:
+        raise ValueError(f"{path} holds a {snapshot.kind} snapshot, not a {KIND_MESH}.")
+    mesh = CESSMesh.from_edge_index(snapshot.array("edge_index"), snapshot.meta["num_nodes"],
+                                    node_state=snapshot.array("node_state"), edge_weight=snapshot.array("edge_weight"),
+                                    seed=snapshot.meta["rng_seed"], copy=False)
+    mesh.tick_count = snapshot.meta["tick_count"]
+    _restore_rng(mesh.rng, snapshot)
+    return mesh
+
+
+def save_hypergraph(hypergraph: "SheafHypergraph", path: str, meta: Optional[Dict[str, Any]] = None) -> None:
+    """
+    Snapshots a Sheaf Hypergraph: node features, stalks, the hyperedge membership CSR (row i
+    lists hyperedge i's nodes), the node incidence CSR for partial loads, and its RNG state.
+    """
+    nodes, edges = hypergraph.incidence_index.cpu()
+    member_ptr, member_order = _csr(edges, nodes, hypergraph.num_hyperedges)
+    node_ptr, node_order = _csr(nodes, edges, hypergraph.num_nodes)
+    rng_arrays, rng_meta = _rng_arrays(hypergraph.rng)
+    arrays = {"features": hypergraph.features, "stalks": hypergraph.stalks,
+              "hyperedge_members_ptr": member_ptr, "hyperedge_members_index": nodes[member_order],
+              "node_hyperedges_ptr": node_ptr, "node_hyperedges_index": edges[node_order], **rng_arrays}
+    info = {"num_nodes": hypergraph.num_nodes, "num_hyperedges": hypergraph.num_hyperedges, **rng_meta, **(meta or {})}
+    write_snapshot(path, KIND_HYPERGRAPH, arrays, info)
+
+
+def load_hypergraph(path: str) -> "SheafHypergraph":
+    """
+    Restores a Sheaf Hypergraph from a snapshot. Node features, stalks and hyperedge members
+    are adopted zero-copy from the memory map; only the hyperedge row of each incidence
+    column is expanded (one tensor op). The hyperedge tuples and lookup dicts are built on
+    first use.
+    """
+    from core_modules.hnk.sheaf_hypergraph_network import SheafHypergraph
+    snapshot = Snapshot(path)
+    if snapshot.kind != KIND_HYPERGRAPH:
+        raise ValueError(f"{path} holds a {snapshot.kind} snapshot, not a {KIND_HYPERGRAPH}.")
+    ptr = snapshot.array("hyperedge_members_ptr")
+    members = snapshot.array("hyperedge_members_index")
+    owners = torch.repeat_interleave(torch.arange(ptr.shape[0] - 1), ptr.diff())
+    hypergraph = SheafHypergraph.from_incidence(snapshot.array("features"), torch.stack([members, owners]),
+                                                snapshot.array("stalks"), seed=snapshot.meta["rng_seed"])
+    _restore_rng(hypergraph.rng, snapshot)
+    return hypergraph
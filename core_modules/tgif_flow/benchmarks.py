@@ -0,0 +1,233 @@
+# ~/aurora_project/core_modules/tgif_flow/benchmarks.py
+import gc
+import logging
+import os
+import random
+import time
+from typing import Callable, List, Optional, Tuple
+
+import networkx as nx
+import torch
+
+from .intent import CompactIntent, Intent
+from .intent_batch import IntentBatch
+from .router import TGIFRouter
+from core_modules.cess_mesh.mesh_simulator import CESSMesh
+
+
+def _per_query_us(fn: Callable[[int, int], object], pairs: List[Tuple[int, int]]) -> float:
+    fn(*pairs[0])  # Warm-up: lazily built structures should not count against the first query.
+    start = time.perf_counter()
+    for s, d in pairs:
+        fn(s, d)
+    return (time.perf_counter() - start) / len(pairs) * 1e6
+
+
+def bench_weighted_vs_unweighted(sizes: Tuple[int, ...] = (1_000, 10_000, 100_000), queries: int = 200) -> None:
+    """Per-query latency of hop-count vs. weighted (edge_attrs) routing on meshes of several sizes."""
+    print(f"{'nodes':>8} {'nx hop (us)':>12} {'router hop (us)':>16} {'weighted (us)':>14} {'A* h=0 (us)':>12}")
+    for num_nodes in sizes:
+        mesh = CESSMesh(num_nodes=num_nodes, seed=0)
+        rng = random.Random(1)
+        pairs = [(rng.randrange(num_nodes), rng.randrange(num_nodes)) for _ in range(queries)]
+        pairs = [(s, d) for s, d in pairs if nx.has_path(mesh.graph, s, d)]
+
+        def nx_hop(s: int, d: int) -> object:
+            # The router's original implementation: an uncached NetworkX search per query.
+            return nx.shortest_path(mesh.graph, source=s, target=d)
+
+        # Cache disabled so every query pays for its own search.
+        hop_router = TGIFRouter(mesh, path_cache_size=0, tree_cache_size=0)
+        weighted_router = TGIFRouter(mesh, weighted=True)
+        weighted_router.get_path(*pairs[0])  # Build the CSR lists once, outside the timed loop.
+
+        nx_us = _per_query_us(nx_hop, pairs)
+        hop_us = _per_query_us(hop_router.get_path, pairs)
+        weighted_us = _per_query_us(weighted_router.get_path, pairs)
+        astar_us = _per_query_us(lambda s, d: weighted_router.get_path(s, d, heuristic=lambda n, t: 0.0), pairs)
+        print(f"{num_nodes:>8} {nx_us:>12.1f} {hop_us:>16.1f} {weighted_us:>14.1f} {astar_us:>12.1f}")
+
+
+def bench_distance_index(sizes: Tuple[int, ...] = (1_000, 10_000, 100_000), queries: int = 200, rewires: int = 100) -> None:
+    """Build time, per-query latency and incremental refresh cost of the router's distance index."""
+    print(f"{'nodes':>8} {'mode':>10} {'build (s)':>10} {'index (us)':>11} {'ALT A* (us)':>12} "
+          f"{'search (us)':>12} {'refresh (s)':>12}   (refresh after {rewires} rewires)")
+    for num_nodes in sizes:
+        mesh = CESSMesh(num_nodes=num_nodes, seed=0)
+        rng = random.Random(2)
+        pairs = [(rng.randrange(num_nodes), rng.randrange(num_nodes)) for _ in range(queries)]
+        search_router = TGIFRouter(mesh, path_cache_size=0, tree_cache_size=0)
+        index_router = TGIFRouter(mesh)
+
+        start = time.perf_counter()
+        index = index_router.enable_distance_index()
+        build_s = time.perf_counter() - start
+        query_us = _per_query_us(index_router.get_path, pairs)
+        search_us = _per_query_us(search_router.get_path, pairs)
+        alt_us = float("nan")
+        if index.mode == "landmarks":
+            index.landmark_search = "alt"
+            alt_us = _per_query_us(index_router.get_path, pairs[:20])
+            index.landmark_search = "bidirectional"
+
+        mesh.perform_pachner_moves(rewires)
+        start = time.perf_counter()
+        index.refresh()
+        refresh_s = time.perf_counter() - start
+        print(f"{num_nodes:>8} {index.mode:>10} {build_s:>10.2f} {query_us:>11.1f} {alt_us:>12.1f} "
+              f"{search_us:>12.1f} {refresh_s:>12.3f}")
+
+
+def bench_logging_overhead(num_nodes: int = 1_000, num_intents: int = 20_000) -> None:
+    """
+    Routing throughput with module logging disabled (the default) vs. every hot-path
+    message formatted and written out, which is what the old unconditional `print`s cost.
+    Output goes to os.devnull so terminal speed does not skew the comparison.
+    """
+    mesh = CESSMesh(num_nodes=num_nodes, seed=0)
+    router = TGIFRouter(mesh)
+    rng = random.Random(3)
+    # Traffic repeats a bounded set of endpoint pairs, so after warm-up both runs are served
+    # from the path cache and differ only in logging cost.
+    hot_pairs = [(rng.randrange(num_nodes), rng.randrange(num_nodes)) for _ in range(1_000)]
+    intents = [Intent(source_node_id=s, destination_node_id=d) for s, d in (rng.choice(hot_pairs) for _ in range(num_intents))]
+    for intent in intents:
+        router.route_intent(intent)
+
+    def throughput() -> float:
+        start = time.perf_counter()
+        for intent in intents:
+            router.route_intent(intent)
+        return num_intents / (time.perf_counter() - start)
+
+    package_logger = logging.getLogger("core_modules")
+    quiet_rate = throughput()
+    with open(os.devnull, "w") as sink:
+        handler = logging.StreamHandler(sink)
+        previous_level = package_logger.level
+        package_logger.addHandler(handler)
+        package_logger.setLevel(logging.DEBUG)
+        try:
+            verbose_rate = throughput()
+        finally:
+            package_logger.removeHandler(handler)
+            package_logger.setLevel(previous_level)
+    print(f"route_intent throughput: logging off {quiet_rate:,.0f}/s, "
+          f"all messages emitted (old print behaviour) {verbose_rate:,.0f}/s "
+          f"-> {quiet_rate / verbose_rate:.1f}x")
+
+
+def bench_intent_construction(count: int = 200_000) -> None:
+    """Construction rate of dataclass Intents vs. CompactIntents (with and without reading the vector)."""
+    def rate(make: Callable[[int], object]) -> float:
+        start = time.perf_counter()
+        for i in range(count):
+            make(i)
+        return count / (time.perf_counter() - start)
+
+    full = rate(lambda i: Intent(source_node_id=i, destination_node_id=i + 1))
+    compact = rate(lambda i: CompactIntent(source_node_id=i, destination_node_id=i + 1))
+    compact_vec = rate(lambda i: CompactIntent(source_node_id=i, destination_node_id=i + 1).intent_vector)
+    print(f"Intent construction: dataclass {full:,.0f}/s, compact {compact:,.0f}/s, "
+          f"compact + vector read {compact_vec:,.0f}/s")
+
+
+def bench_intent_batch(num_nodes: int = 1_000, batch_size: int = 100_000) -> None:
+    """Building and routing B intents as a list of Intent objects vs. one columnar IntentBatch."""
+    mesh = CESSMesh(num_nodes=num_nodes, seed=0)
+    router = TGIFRouter(mesh)
+
+    start = time.perf_counter()
+    intents = [Intent(source_node_id=i % num_nodes, destination_node_id=(i * 7) % num_nodes) for i in range(batch_size)]
+    build_list_s = time.perf_counter() - start
+    start = time.perf_counter()
+    batch = IntentBatch.random(batch_size, num_nodes)
+    build_batch_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    router.route_intents(intents)
+    route_list_s = time.perf_counter() - start
+    start = time.perf_counter()
+    router.route_intents(batch)
+    route_batch_s = time.perf_counter() - start
+    print(f"{batch_size:,} intents: build list {build_list_s:.2f}s vs batch {build_batch_s:.3f}s; "
+          f"route list {route_list_s:.2f}s vs batch {route_batch_s:.2f}s")
+
+
+def bench_rewire_invalidation(num_nodes: int = 100_000, num_pairs: int = 200, moves: int = 200) -> None:
+    """
+    Cost of keeping a warm path cache exact across Pachner rewires: `moves` rewires on a mesh
+    without a router vs. with `num_pairs` cached pairs, per ball budget, and how many survive.
+    """
+    rng = random.Random(0)
+    pairs = [(rng.randrange(num_nodes), rng.randrange(num_nodes)) for _ in range(num_pairs)]
+    mesh = CESSMesh(num_nodes=num_nodes, seed=0)
+    start = time.perf_counter()
+    mesh.perform_pachner_moves(moves)
+    print(f"{moves} rewires, no router: {(time.perf_counter() - start) * 1e3:.1f} ms")
+    print(f"{'ball budget':>12} {'rewires (ms)':>13} {'cached pairs kept':>18}")
+    for budget in (64, 512, 4096):
+        mesh = CESSMesh(num_nodes=num_nodes, seed=0)
+        router = TGIFRouter(mesh)
+        router.path_cache.ball_budget = budget
+        for s, d in pairs:
+            router.get_path(s, d)
+        cached = len(router.path_cache)
+        gc.collect()  # Earlier meshes' garbage must not be collected inside the timed rewires.
+        start = time.perf_counter()
+        mesh.perform_pachner_moves(moves)
+        elapsed_ms = (time.perf_counter() - start) * 1e3
+        print(f"{budget:>12} {elapsed_ms:>13.1f} {len(router.path_cache):>9} / {cached}")
+
+
+def bench_scheduler(num_nodes: int = 50_000, ticks: int = 10, num_intents: int = 4, moves_per_tick: int = 2_000,
+                    route_workers: Optional[int] = None) -> None:
+    """
+    End-to-end ticks/s of the evolve / route / learn tick loop: stages run back to back,
+    pipelined across ticks, and pipelined with routing sharded over `route_workers` processes
+    (default: one per spare core, at least 2), with the mean time per stage. A pipelined tick
+    can't beat its slowest stage plus the sync barrier, so each row also prints that bound
+    (the sequential tick time over it); reaching it needs a free core per overlapped stage and shard.
+    """
+    from core_modules.simulation import SimulationScheduler
+    from core_modules.hnk.sheaf_hypergraph_network import SheafHypergraph, SheafHypergraphNetwork
+
+    if route_workers is None:
+        route_workers = max(2, (os.cpu_count() or 1) - 1)
+    network = SheafHypergraphNetwork(CESSMesh.NODE_STATE_DIM, 16)
+    intents = IntentBatch.random(num_intents, num_nodes, generator=torch.Generator().manual_seed(0))
+    print(f"{os.cpu_count()} cores, {num_nodes:,} nodes, {num_intents} intents and {moves_per_tick} rewires per tick")
+    rates = {}
+    for name, pipelined, workers in (("sequential", False, 0), ("pipelined", True, 0),
+                                     (f"{route_workers} shards", True, route_workers)):
+        mesh = CESSMesh(num_nodes=num_nodes, seed=0)
+        hypergraph = SheafHypergraph(num_nodes, mesh.edge_index.t().tolist(), feature_dim=CESSMesh.NODE_STATE_DIM, seed=0)
+        with SimulationScheduler(mesh, intents, hypergraph, network, moves_per_tick=moves_per_tick, pipelined=pipelined,
+                                 route_workers=workers) as scheduler:
+            scheduler.run(ticks)
+            stats = scheduler.summary()
+        rates[name] = stats["ticks_per_s"]
+        stages = (stats["evolve"], stats["route"], stats["learn"])
+        print(f"{name:>10}: {stats['ticks_per_s']:.2f} ticks/s "
+              f"(evolve {stats['evolve'] * 1e3:.0f} ms, route {stats['route'] * 1e3:.0f} ms, "
+              f"learn {stats['learn'] * 1e3:.0f} ms, sync {stats['sync'] * 1e3:.0f} ms per tick; "
+              f"overlap bound {(sum(stages) + stats['sync']) / (max(stages) + stats['sync']):.2f}x)")
+    for name in list(rates)[1:]:
+        print(f"{name} vs sequential: {rates[name] / rates['sequential']:.2f}x")
+
+
+if __name__ == "__main__":
+    print("--- TGIF Flow Routing Benchmarks ---")
+    bench_weighted_vs_unweighted()
+    print()
+    bench_distance_index()
+    print()
+    bench_logging_overhead()
+    print()
+    bench_intent_construction()
+    print()
+    bench_intent_batch()
+    print()
+    bench_rewire_invalidation()
+    print()
+    bench_scheduler()
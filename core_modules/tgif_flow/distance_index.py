@@ -0,0 +1,230 @@
+# ~/aurora_project/core_modules/tgif_flow/distance_index.py
+from typing import Dict, List, Optional, Set, Tuple
+
+import networkx as nx
+import torch
+
+from core_modules.cess_mesh.mesh_simulator import CESSMesh, MeshEvent, EDGE_ADDED, EDGE_REMOVED
+from .weighted_search import CSRLists, shortest_weighted_path
+
+# "Unreachable" hop distance. Small enough that INF + 1 + INF still fits in int32.
+INF: int = 1 << 29
+
+
+class DistanceIndex:
+    """
+    Hop-count distance oracle over a CESS Mesh, stored as an `(S, N)` int32 tensor whose
+    rows are BFS distance vectors from S source nodes.
+    - "exact" mode: every node is a source (all-pairs). Paths are answered by greedy
+      next-hop lookup: from the current node, step to any neighbour one hop closer to the
+      target.
+    - "landmarks" mode: S landmark nodes chosen by farthest-point sampling. They give O(S)
+      ALT lower bounds max_l |d(l, n) - d(l, t)| and detect disconnected pairs without a
+      search. Paths are answered by bidirectional BFS (`landmark_search="bidirectional"`,
+      the faster choice on low-diameter meshes) or by A* guided by the ALT bound
+      (`landmark_search="alt"`, which pays off on long, lattice-like meshes).
+    Rows are computed by batched frontier expansion (a sparse adjacency x dense frontier
+    matmul per BFS level). The index listens to the mesh and maintains itself
+    incrementally:
+    - An added edge (a, b) only affects rows whose endpoint depths differ by more than one.
+      In exact mode those rows are patched in place via d'(s, t) = min(d(s, t),
+      d(s, a) + 1 + d(b, t), d(s, b) + 1 + d(a, t)); in landmark mode they are marked dirty.
+    - A removed edge only affects rows where it is tight (depths differ by exactly one).
+      Those rows are marked dirty.
+    Dirty rows are recomputed together, in batches, on the next query.
+    """
+    def __init__(self, mesh: CESSMesh, mode: str = "auto", num_landmarks: int = 16,
+                 exact_threshold: int = 4096, batch_size: int = 256, seed: int = 0,
+                 landmark_search: str = "bidirectional"):
+        if mode not in ("auto", "exact", "landmarks"):
+            raise ValueError(f"Unknown distance index mode '{mode}'.")
+        if landmark_search not in ("bidirectional", "alt"):
+            raise ValueError(f"Unknown landmark search '{landmark_search}'.")
+        self.landmark_search = landmark_search
+        self.mesh = mesh
+        self.mode = mode if mode != "auto" else ("exact" if mesh.num_nodes <= exact_threshold else "landmarks")
+        self.num_landmarks = num_landmarks
+        self.batch_size = batch_size
+        self.seed = seed
+        self.rows_recomputed = 0
+        self._dirty: Set[int] = set()
+        self._hop_csr: Optional[Tuple[int, CSRLists]] = None
+        # Landmark rows as Python lists, so the ALT bound costs no tensor op per node.
+        self._landmark_lists: Optional[List[List[int]]] = None
+        self.rebuild()
+        self.mesh.add_listener(self.on_mesh_event)
+
+    # --- Construction ---
+    def _adjacency(self) -> torch.Tensor:
+        """Symmetric 0/1 sparse adjacency matrix built from the mesh's COO edge index."""
+        ei = self.mesh.edge_index
+        n = self.mesh.num_nodes
+        indices = torch.cat([ei, ei.flip(0)], dim=1)
+        values = torch.ones(indices.shape[1], device=ei.device)
+        return torch.sparse_coo_tensor(indices, values, size=(n, n), check_invariants=False).coalesce()
+
+    def _bfs_rows(self, sources: torch.Tensor, adjacency: torch.Tensor) -> torch.Tensor:
+        """BFS distances from each of `sources` to every node, as an (len(sources), N) int32 tensor."""
+        n = self.mesh.num_nodes
+        out = torch.full((sources.shape[0], n), INF, dtype=torch.int32, device=adjacency.device)
+        for start in range(0, sources.shape[0], self.batch_size):
+            batch = sources[start:start + self.batch_size]
+            rows = torch.arange(batch.shape[0], device=adjacency.device)
+            dist = out[start:start + batch.shape[0]]
+            dist[rows, batch] = 0
+            visited = dist == 0
+            frontier = visited.to(torch.float32)
+            level = 0
+            while True:
+                level += 1
+                # adjacency is symmetric, so (A @ F^T)^T is the set of nodes one hop from F.
+                reached = torch.sparse.mm(adjacency, frontier.t()).t() > 0
+                new = reached & ~visited
+                if not bool(new.any()):
+                    break
+                dist[new] = level
+                visited |= new
+                frontier = new.to(torch.float32)
+        return out
+
+    def _choose_landmarks(self, adjacency: torch.Tensor) -> Tuple[torch.Tensor, torch.Tensor]:
+        """
+        Farthest-point sampling: each new landmark maximises its distance to those chosen
+        so far. Returns the landmark IDs and their BFS rows.
+        """
+        n = self.mesh.num_nodes
+        k = min(self.num_landmarks, n)
+        generator = torch.Generator().manual_seed(self.seed)
+        chosen = [int(torch.randint(n, (1,), generator=generator).item())]
+        rows = [self._bfs_rows(torch.tensor(chosen[:1], device=adjacency.device), adjacency)]
+        closest = rows[0][0].clone()
+        while len(chosen) < k:
+            # Unreachable nodes (INF) win first, so every component gets a landmark.
+            candidate = int(torch.argmax(closest).item())
+            if candidate in chosen:
+                break
+            chosen.append(candidate)
+            rows.append(self._bfs_rows(torch.tensor([candidate], device=adjacency.device), adjacency))
+            closest = torch.minimum(closest, rows[-1][0])
+        return torch.tensor(chosen, dtype=torch.long, device=adjacency.device), torch.cat(rows)
+
+    def rebuild(self) -> None:
+        """Recomputes the whole index from scratch."""
+        adjacency = self._adjacency()
+        self.num_nodes = self.mesh.num_nodes
+        if self.mode == "exact":
+            self.sources = torch.arange(self.num_nodes, device=adjacency.device)
+            self.dist = self._bfs_rows(self.sources, adjacency)
+        else:
+            self.sources, self.dist = self._choose_landmarks(adjacency)
+        self._row_of: Dict[int, int] = {s: r for r, s in enumerate(self.sources.tolist())}
+        self.rows_recomputed += self.sources.shape[0]
+        self._dirty.clear()
+        self._landmark_lists = None
+
+    # --- Incremental maintenance ---
+    def on_mesh_event(self, event: MeshEvent) -> None:
+        """CESSMesh listener: patches or invalidates only the rows the edge change can affect."""
+        if event.kind not in (EDGE_ADDED, EDGE_REMOVED):
+            return
+        a, b = event.u, event.v
+        if a >= self.num_nodes or b >= self.num_nodes:
+            return  # Touches a node added since the last build; the next refresh rebuilds.
+        da, db = self.dist[:, a], self.dist[:, b]
+        gap = (da - db).abs()
+        if event.kind == EDGE_REMOVED:
+            self._mark_dirty(torch.nonzero(gap == 1).flatten())
+            return
+
+        affected = torch.nonzero(gap > 1).flatten()
+        if affected.numel() == 0:
+            return
+        if self.mode == "exact" and a not in self._dirty and b not in self._dirty:
+            row_a, row_b = self.dist[a], self.dist[b]
+            sub = self.dist[affected]
+            via_ab = sub[:, a:a + 1] + 1 + row_b.unsqueeze(0)
+            via_ba = sub[:, b:b + 1] + 1 + row_a.unsqueeze(0)
+            patched = torch.minimum(sub, torch.minimum(via_ab, via_ba)).clamp_(max=INF)
+            self.dist[affected] = patched
+            self._landmark_lists = None
+        else:
+            self._mark_dirty(affected)
+
+    def _mark_dirty(self, rows: torch.Tensor) -> None:
+        self._dirty.update(rows.tolist())
+
+    def refresh(self) -> None:
+        """Recomputes all dirty rows in batched frontier expansions."""
+        if self.mesh.num_nodes != self.num_nodes:
+            self.rebuild()
+            return
+        if not self._dirty:
+            return
+        rows = torch.tensor(sorted(self._dirty), dtype=torch.long, device=self.dist.device)
+        self.dist[rows] = self._bfs_rows(self.sources[rows], self._adjacency())
+        self.rows_recomputed += rows.shape[0]
+        self._dirty.clear()
+        self._landmark_lists = None
+
+    @property
+    def num_dirty_rows(self) -> int:
+        return len(self._dirty)
+
+    # --- Queries ---
+    def distance(self, source: int, target: int) -> Optional[int]:
+        """Exact hop distance (exact mode) or the ALT lower bound (landmark mode); None if unreachable."""
+        self.refresh()
+        if self.mode == "exact":
+            d = int(self.dist[self._row_of[target], source].item())
+        else:
+            from_source, from_target = self.dist[:, source], self.dist[:, target]
+            # A landmark reaching exactly one endpoint proves they lie in different components
+            # (the same test `_alt_path` uses); INF - d would otherwise pass for a distance.
+            if bool(((from_source >= INF) != (from_target >= INF)).any()):
+                return None
+            d = int((from_source - from_target).abs().max().item())
+        return None if d >= INF else d
+
+    def path(self, source: int, target: int) -> Optional[List[int]]:
+        """Shortest (hop-count) path from source to target, or None if unreachable."""
+        self.refresh()
+        if self.mode == "exact":
+            return self._greedy_path(source, target)
+        return self._alt_path(source, target)
+
+    def _greedy_path(self, source: int, target: int) -> Optional[List[int]]:
+        to_target: List[int] = self.dist[self._row_of[target]].tolist()
+        if to_target[source] >= INF:
+            return None
+        adj = self.mesh.graph.adj
+        path = [source]
+        current = source
+        while current != target:
+            want = to_target[current] - 1
+            current = next(w for w in adj[current] if to_target[w] == want)
+            path.append(current)
+        return path
+
+    def _alt_path(self, source: int, target: int) -> Optional[List[int]]:
+        if self._landmark_lists is None:
+            self._landmark_lists = self.dist.tolist()
+        rows = self._landmark_lists
+        to_target = [row[target] for row in rows]
+        # A landmark that reaches exactly one endpoint proves the pair is disconnected.
+        if any((row[source] >= INF) != (t >= INF) for row, t in zip(rows, to_target)):
+            return None
+        if self.landmark_search == "bidirectional":
+            try:
+                return nx.bidirectional_shortest_path(self.mesh.graph, source, target)
+            except nx.NetworkXNoPath:
+                return None
+
+        if self._hop_csr is None or self._hop_csr[0] != self.mesh.version:
+            indptr, indices, _ = self.mesh.csr()
+            self._hop_csr = (self.mesh.version, (indptr.tolist(), indices.tolist(), [1.0] * indices.shape[0]))
+
+        def alt_bound(node: int, _target: int) -> float:
+            return max(abs(row[node] - t) for row, t in zip(rows, to_target))
+
+        result = shortest_weighted_path(self._hop_csr[1], source, target, heuristic=alt_bound)
+        return None if result is None else result[1]
@@ -1,11 +1,12 @@
 # ~/aurora_project/core_modules/tgif_flow/intent.py
 from dataclasses import dataclass, field
+import itertools
 import uuid
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Union
 import torch
 
-# Import DEVICE from CESS Mesh module, as it's a shared global for GPU usage
-from core_modules.cess_mesh.mesh_simulator import DEVICE
+# Shared, lazily resolved compute device (see core_modules/device.py)
+from core_modules.device import get_device
 
 @dataclass
 class Intent:
@@ -35,10 +36,137 @@ class Intent:
 
     def __post_init__(self):
         # Initialize intent_vector on the specified device
-        self.intent_vector = torch.randn(self.vector_dim, device=DEVICE)
+        self.intent_vector = torch.randn(self.vector_dim, device=get_device())
 
     def __str__(self) -> str:
         return f"Intent(ID={self.intent_id[:8]}, Src={self.source_node_id}, Dest={self.destination_node_id}, PayloadKeys={list(self.payload.keys())}, VecShape={tuple(self.intent_vector.shape)})"
 
     def __repr__(self) -> str:
-        return self.__str__()
\ No newline at end of file
+        return self.__str__()
+
+
+# Process-wide counter for compact integer intent IDs.
+_next_intent_id = itertools.count()
+
+
+class IntentVectorPool:
+    """
+    Pre-allocated block of random intent vectors, handed out one row (a view) at a time.
+    One `randn` call fills `capacity` vectors, so materialising an intent vector costs an
+    index instead of a fresh device allocation.
+    """
+    def __init__(self, vector_dim: int = 16, capacity: int = 65536, device: Optional[torch.device] = None):
+        self.vector_dim = vector_dim
+        self.capacity = capacity
+        self.device = device
+        self._block: Optional[torch.Tensor] = None
+        self._next = capacity
+
+    def _refill(self) -> None:
+        self._block = torch.randn(self.capacity, self.vector_dim, device=self.device or get_device())
+        self._next = 0
+
+    def take(self) -> torch.Tensor:
+        """Returns one fresh `(vector_dim,)` vector."""
+        if self._next >= self.capacity:
+            self._refill()
+        assert self._block is not None
+        row = self._block[self._next]
+        self._next += 1
+        return row
+
+    def take_many(self, n: int) -> torch.Tensor:
+        """Returns `n` fresh vectors as an `(n, vector_dim)` tensor (a view when they fit in one block)."""
+        if n > self.capacity - self._next:
+            if n > self.capacity:
+                return torch.randn(n, self.vector_dim, device=self.device or get_device())
+            self._refill()
+        assert self._block is not None
+        rows = self._block[self._next:self._next + n]
+        self._next += n
+        return rows
+
+
+_default_pools: Dict[int, IntentVectorPool] = {}
+
+
+def default_vector_pool(vector_dim: int = 16) -> IntentVectorPool:
+    """The shared pool for a given vector dimension, created on first use."""
+    pool = _default_pools.get(vector_dim)
+    if pool is None:
+        pool = _default_pools[vector_dim] = IntentVectorPool(vector_dim)
+    return pool
+
+
+class CompactIntent:
+    """
+    Memory-lean Intent for high message rates. It has the same attributes as Intent, but:
+    - `__slots__`, so there is no per-instance `__dict__`;
+    - integer IDs from a process-wide counter by default (pass `intent_id` to override,
+      e.g. with a UUID string);
+    - `payload` / `metadata` dicts are only allocated when first accessed;
+    - `intent_vector` is only materialised when first read, as a row of a shared
+      IntentVectorPool rather than its own allocation.
+    """
+    __slots__ = ("intent_id", "source_node_id", "destination_node_id", "vector_dim",
+                 "_payload", "_metadata", "_intent_vector", "_pool")
+
+    def __init__(self, source_node_id: int = -1, destination_node_id: int = -1,
+                 payload: Optional[Dict[str, Any]] = None, metadata: Optional[Dict[str, Any]] = None,
+                 vector_dim: int = 16, intent_id: Optional[Union[int, str]] = None,
+                 pool: Optional[IntentVectorPool] = None):
+        self.intent_id: Union[int, str] = next(_next_intent_id) if intent_id is None else intent_id
+        self.source_node_id = source_node_id
+        self.destination_node_id = destination_node_id
+        self.vector_dim = vector_dim
+        self._payload = payload
+        self._metadata = metadata
+        self._intent_vector: Optional[torch.Tensor] = None
+        self._pool = pool
+
+    @property
+    def payload(self) -> Dict[str, Any]:
+        if self._payload is None:
+            self._payload = {}
+        return self._payload
+
+    @payload.setter
+    def payload(self, value: Dict[str, Any]) -> None:
+        self._payload = value
+
+    @property
+    def metadata(self) -> Dict[str, Any]:
+        if self._metadata is None:
+            self._metadata = {}
+        return self._metadata
+
+    @metadata.setter
+    def metadata(self, value: Dict[str, Any]) -> None:
+        self._metadata = value
+
+    @property
+    def intent_vector(self) -> torch.Tensor:
+        if self._intent_vector is None:
+            pool = self._pool if self._pool is not None else default_vector_pool(self.vector_dim)
+            self._intent_vector = pool.take()
+        return self._intent_vector
+
+    @intent_vector.setter
+    def intent_vector(self, value: torch.Tensor) -> None:
+        self._intent_vector = value
+
+    @property
+    def has_vector(self) -> bool:
+        """True once the intent vector has been materialised."""
+        return self._intent_vector is not None
+
+    def __str__(self) -> str:
+        payload_keys = list(self._payload.keys()) if self._payload else []
+        return f"CompactIntent(ID={str(self.intent_id)[:8]}, Src={self.source_node_id}, Dest={self.destination_node_id}, PayloadKeys={payload_keys}, VecDim={self.vector_dim})"
+
+    def __repr__(self) -> str:
+        return self.__str__()
+
+
+# Anything the router accepts as an intent.
+AnyIntent = Union[Intent, CompactIntent]
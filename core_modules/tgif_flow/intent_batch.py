@@ -0,0 +1,111 @@
+# ~/aurora_project/core_modules/tgif_flow/intent_batch.py
+from typing import Any, Dict, List, Optional, Sequence, Union
+
+import torch
+
+from core_modules.device import get_device
+from .intent import AnyIntent, CompactIntent, IntentVectorPool, default_vector_pool
+
+IntentIds = Union[torch.Tensor, List[Union[int, str]]]
+
+
+class IntentBatch:
+    """
+    Columnar container for many intents, so routing, scoring and encryption can work on
+    whole batches instead of per-object loops:
+    - `source_ids` / `destination_ids`: `(B,)` int64 tensors;
+    - `intent_vectors`: one `(B, vector_dim)` tensor;
+    - `intent_ids`: `(B,)` int64 tensor, or a list when some IDs are strings (e.g. UUIDs);
+    - `payloads`: side table of per-intent payload dicts (None where empty).
+    `to_intents()` is zero-copy: each CompactIntent's vector is a row view of `intent_vectors`.
+    """
+    def __init__(self, source_ids: torch.Tensor, destination_ids: torch.Tensor, intent_vectors: torch.Tensor,
+                 intent_ids: Optional[IntentIds] = None, payloads: Optional[List[Optional[Dict[str, Any]]]] = None):
+        batch_size = source_ids.shape[0]
+        if destination_ids.shape[0] != batch_size or intent_vectors.shape[0] != batch_size:
+            raise ValueError("IntentBatch columns must all have the same length.")
+        self.source_ids = source_ids.long()
+        self.destination_ids = destination_ids.long()
+        self.intent_vectors = intent_vectors
+        self.intent_ids: IntentIds = intent_ids if intent_ids is not None else torch.arange(batch_size)
+        self.payloads: List[Optional[Dict[str, Any]]] = payloads if payloads is not None else [None] * batch_size
+        if len(self.intent_ids) != batch_size or len(self.payloads) != batch_size:
+            raise ValueError("IntentBatch side tables must match the batch length.")
+
+    def __len__(self) -> int:
+        return self.source_ids.shape[0]
+
+    @property
+    def vector_dim(self) -> int:
+        return self.intent_vectors.shape[1]
+
+    @classmethod
+    def from_intents(cls, intents: Sequence[AnyIntent], vector_dim: int = 16,
+                     pool: Optional[IntentVectorPool] = None) -> "IntentBatch":
+        """
+        Packs intents into columns. Vectors that were never materialised (CompactIntent)
+        are drawn from the pool in one block instead of one by one.
+        """
+        device = get_device()
+        n = len(intents)
+        sources = torch.tensor([i.source_node_id for i in intents], dtype=torch.long)
+        destinations = torch.tensor([i.destination_node_id for i in intents], dtype=torch.long)
+        raw_ids = [i.intent_id for i in intents]
+        ids: IntentIds = torch.tensor(raw_ids, dtype=torch.long) if all(isinstance(x, int) for x in raw_ids) else raw_ids
+
+        vectors = torch.empty(n, vector_dim, device=device)
+        missing = [k for k, i in enumerate(intents) if isinstance(i, CompactIntent) and not i.has_vector]
+        present = [k for k, i in enumerate(intents) if not (isinstance(i, CompactIntent) and not i.has_vector)]
+        if present:
+            vectors[present] = torch.stack([intents[k].intent_vector for k in present]).to(device)
+        if missing:
+            vectors[missing] = (pool or default_vector_pool(vector_dim)).take_many(len(missing)).to(device)
+
+        payloads: List[Optional[Dict[str, Any]]] = [
+            (i._payload if isinstance(i, CompactIntent) else i.payload) or None for i in intents
+        ]
+        return cls(sources, destinations, vectors, ids, payloads)
+
+    @classmethod
+    def random(cls, batch_size: int, num_nodes: int, vector_dim: int = 16,
+               generator: Optional[torch.Generator] = None) -> "IntentBatch":
+        """A batch of intents between uniformly random mesh nodes, built column-wise."""
+        sources = torch.randint(num_nodes, (batch_size,), generator=generator)
+        destinations = torch.randint(num_nodes, (batch_size,), generator=generator)
+        vectors = torch.randn(batch_size, vector_dim, generator=generator).to(get_device())
+        return cls(sources, destinations, vectors)
+
+    def intent(self, index: int) -> CompactIntent:
+        """A CompactIntent view of one row; its vector shares storage with the batch."""
+        intent_id = self.intent_ids[index]
+        compact = CompactIntent(
+            source_node_id=int(self.source_ids[index]),
+            destination_node_id=int(self.destination_ids[index]),
+            payload=self.payloads[index],
+            vector_dim=self.vector_dim,
+            intent_id=int(intent_id) if isinstance(intent_id, torch.Tensor) else intent_id,
+        )
+        compact.intent_vector = self.intent_vectors[index]
+        return compact
+
+    def to_intents(self) -> List[CompactIntent]:
+        """Unpacks the batch into CompactIntents without copying vectors."""
+        sources = self.source_ids.tolist()
+        destinations = self.destination_ids.tolist()
+        ids = self.intent_ids.tolist() if isinstance(self.intent_ids, torch.Tensor) else self.intent_ids
+        out: List[CompactIntent] = []
+        for k in range(len(self)):
+            compact = CompactIntent(sources[k], destinations[k], self.payloads[k], vector_dim=self.vector_dim, intent_id=ids[k])
+            compact.intent_vector = self.intent_vectors[k]
+            out.append(compact)
+        return out
+
+    def select(self, index: Union[torch.Tensor, slice]) -> "IntentBatch":
+        """Sub-batch by slice, boolean mask or index tensor."""
+        if isinstance(index, slice):
+            positions = list(range(len(self)))[index]
+        else:
+            positions = torch.arange(len(self))[index.cpu()].tolist()
+        ids = self.intent_ids[index] if isinstance(self.intent_ids, torch.Tensor) else [self.intent_ids[k] for k in positions]
+        return IntentBatch(self.source_ids[index], self.destination_ids[index], self.intent_vectors[index],
+                           ids, [self.payloads[k] for k in positions])
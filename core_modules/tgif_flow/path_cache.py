@@ -0,0 +1,274 @@
+# ~/aurora_project/core_modules/tgif_flow/path_cache.py
+from collections import OrderedDict, deque
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Set, Tuple
+
+import networkx as nx
+
+from core_modules.cess_mesh.mesh_simulator import MeshEvent, EDGE_ADDED, EDGE_REMOVED
+
+PairKey = Tuple[int, int]
+EdgeKey = Tuple[int, int]
+
+
+def _edge_key(u: int, v: int) -> EdgeKey:
+    return (u, v) if u < v else (v, u)
+
+
+@dataclass
+class PathCacheStats:
+    """Counters for sizing the router's path cache."""
+    hits: int = 0           # (source, destination) pair served straight from the pair cache
+    tree_hits: int = 0      # lookup answered from an already cached BFS tree
+    misses: int = 0         # lookup that required a fresh search (point-to-point or full BFS tree)
+    invalidations: int = 0  # pairs + trees dropped because a mesh mutation touched them
+    evictions: int = 0      # pairs + trees dropped by the LRU bound
+
+
+class BFSTree:
+    """
+    A single-source shortest-path (hop count) tree: BFS parent pointers and distances.
+    """
+    __slots__ = ("source", "parent", "dist")
+
+    def __init__(self, source: int, parent: Dict[int, int], dist: Dict[int, int]):
+        self.source = source
+        self.parent = parent
+        self.dist = dist
+
+    @classmethod
+    def build(cls, graph: nx.Graph, source: int) -> "BFSTree":
+        adj = graph.adj
+        parent: Dict[int, int] = {source: source}
+        dist: Dict[int, int] = {source: 0}
+        queue: deque[int] = deque([source])
+        while queue:
+            u = queue.popleft()
+            du = dist[u] + 1
+            for w in adj[u]:
+                if w not in dist:
+                    dist[w] = du
+                    parent[w] = u
+                    queue.append(w)
+        return cls(source, parent, dist)
+
+    def path_to(self, target: int) -> Optional[List[int]]:
+        if target not in self.parent:
+            return None
+        path = [target]
+        parent = self.parent
+        while target != self.source:
+            target = parent[target]
+            path.append(target)
+        path.reverse()
+        return path
+
+    def uses_edge(self, u: int, v: int) -> bool:
+        """True if (u, v) is one of the tree's parent edges."""
+        return (self.parent.get(v) == u and v != self.source) or (self.parent.get(u) == v and u != self.source)
+
+    def shortcut_by(self, u: int, v: int) -> bool:
+        """
+        True if adding edge (u, v) can shorten some distance from the source, i.e. the
+        endpoints' depths differ by more than one (or only one endpoint is reachable).
+        """
+        du, dv = self.dist.get(u), self.dist.get(v)
+        if du is None or dv is None:
+            return (du is None) != (dv is None)
+        return abs(du - dv) > 1
+
+
+class ShortestPathCache:
+    """
+    Bounded LRU cache of shortest (hop-count) paths keyed on (source, destination),
+    plus an LRU of per-source BFS trees used for batch routing. Pair misses are answered
+    from a cached tree when one exists, otherwise by a bidirectional search.
+
+    Invalidation is driven by CESSMesh events and is selective:
+    - Edge removed: only pairs whose cached path uses that edge are dropped, and only
+      trees that use it as a parent edge.
+    - Edge added: a tree is dropped only if the new edge shortcuts it; its source's pairs
+      are not affected. A pair (s, t) without a cached source tree is dropped only if the
+      new edge (a, b) can yield a shorter route, i.e. d(s, a) + 1 + d(b, t) may be below its
+      cached length (either orientation). Distances come from two BFS balls around a and b,
+      grown level by level up to the longest cached path or until `ball_budget` nodes are
+      reached; beyond a truncated ball only a lower bound is known, so a few extra pairs
+      may be dropped but a stale one never survives. Removals never shorten paths, so
+      surviving entries stay exact shortest paths.
+    """
+    def __init__(self, max_paths: int = 4096, max_trees: int = 256, ball_budget: int = 512):
+        self.max_paths = max_paths
+        self.max_trees = max_trees
+        self.ball_budget = ball_budget
+        self.stats = PathCacheStats()
+        self._paths: "OrderedDict[PairKey, List[int]]" = OrderedDict()
+        self._paths_by_edge: Dict[EdgeKey, Set[PairKey]] = {}
+        self._paths_by_source: Dict[int, Set[PairKey]] = {}
+        self._paths_by_length: Dict[int, Set[PairKey]] = {}
+        self._trees: "OrderedDict[int, BFSTree]" = OrderedDict()
+        # The graph cached entries were computed on.
+        self._graph: Optional[nx.Graph] = None
+
+    def __len__(self) -> int:
+        return len(self._paths)
+
+    @property
+    def num_trees(self) -> int:
+        return len(self._trees)
+
+    def clear(self) -> None:
+        self._paths.clear()
+        self._paths_by_edge.clear()
+        self._paths_by_source.clear()
+        self._paths_by_length.clear()
+        self._trees.clear()
+
+    def get_path(self, graph: nx.Graph, source: int, destination: int) -> Optional[List[int]]:
+        """Returns the cached shortest path, computing (and caching) it on a miss."""
+        self._graph = graph
+        key = (source, destination)
+        path = self._paths.get(key)
+        if path is not None:
+            self._paths.move_to_end(key)
+            self.stats.hits += 1
+            return path
+
+        tree = self._trees.get(source)
+        if tree is not None:
+            self._trees.move_to_end(source)
+            self.stats.tree_hits += 1
+            path = tree.path_to(destination)
+        else:
+            # A cold pair only needs a point-to-point search, which is far cheaper than
+            # growing a full tree; trees are built on demand by batch routing (get_tree).
+            self.stats.misses += 1
+            try:
+                path = nx.bidirectional_shortest_path(graph, source, destination)
+            except nx.NetworkXNoPath:
+                path = None
+        if path is not None and self.max_paths > 0:
+            self._store_path(key, path)
+        return path
+
+    def get_tree(self, graph: nx.Graph, source: int) -> BFSTree:
+        """Returns the cached BFS tree for `source`, building it on a miss."""
+        self._graph = graph
+        tree = self._trees.get(source)
+        if tree is not None:
+            self._trees.move_to_end(source)
+            self.stats.tree_hits += 1
+            return tree
+        self.stats.misses += 1
+        tree = BFSTree.build(graph, source)
+        if self.max_trees > 0:
+            self._trees[source] = tree
+            if len(self._trees) > self.max_trees:
+                self._trees.popitem(last=False)
+                self.stats.evictions += 1
+        return tree
+
+    def _store_path(self, key: PairKey, path: List[int]) -> None:
+        self._paths[key] = path
+        self._paths_by_length.setdefault(len(path) - 1, set()).add(key)
+        for u, v in zip(path[:-1], path[1:]):
+            self._paths_by_edge.setdefault(_edge_key(u, v), set()).add(key)
+        self._paths_by_source.setdefault(key[0], set()).add(key)
+        if len(self._paths) > self.max_paths:
+            oldest, _ = next(iter(self._paths.items()))
+            self._drop_path(oldest)
+            self.stats.evictions += 1
+
+    def _drop_path(self, key: PairKey) -> None:
+        path = self._paths.pop(key, None)
+        if path is None:
+            return
+        for u, v in zip(path[:-1], path[1:]):
+            users = self._paths_by_edge.get(_edge_key(u, v))
+            if users is not None:
+                users.discard(key)
+                if not users:
+                    del self._paths_by_edge[_edge_key(u, v)]
+        source_keys = self._paths_by_source.get(key[0])
+        if source_keys is not None:
+            source_keys.discard(key)
+            if not source_keys:
+                del self._paths_by_source[key[0]]
+        length_keys = self._paths_by_length.get(len(path) - 1)
+        if length_keys is not None:
+            length_keys.discard(key)
+            if not length_keys:
+                del self._paths_by_length[len(path) - 1]
+
+    def _ball(self, root: int, radius: int) -> Tuple[Dict[int, int], int]:
+        """
+        Hop distances from `root` up to `radius`, stopping once `ball_budget` nodes are
+        reached. Returns the distances (all exact) and the depth up to which they are
+        complete: any node missing from the ball is farther than that.
+        """
+        adj = self._graph._adj  # type: ignore[union-attr]  # Raw dicts: no per-node view objects.
+        dist: Dict[int, int] = {root: 0}
+        frontier = [root]
+        budget = self.ball_budget
+        for depth in range(1, radius + 1):
+            if not frontier:
+                return dist, radius  # The component is exhausted: missing nodes are unreachable.
+            next_frontier = []
+            for x in frontier:
+                for w in adj[x]:
+                    if w not in dist:
+                        dist[w] = depth
+                        next_frontier.append(w)
+                        if len(dist) >= budget:
+                            return dist, depth - 1  # Level `depth` is only partly explored.
+            frontier = next_frontier
+        return dist, radius
+
+    def _shortened_pairs(self, u: int, v: int) -> List[PairKey]:
+        """Cached pairs without a source tree that the (already added) edge (u, v) shortens."""
+        if self._graph is None or all(source in self._trees for source in self._paths_by_source):
+            return []
+        # A route through the new edge needs d(s, u) + 1 + d(v, t) < length, so neither
+        # distance matters beyond the longest cached length - 2.
+        radius = max(self._paths_by_length) - 2
+        if radius < 0:
+            return []
+        from_u, known_u = self._ball(u, radius)
+        from_v, known_v = self._ball(v, radius)
+        # Lower bounds for nodes outside a ball; exact distances inside it.
+        far_u, far_v = known_u + 1, known_v + 1
+        candidates: Set[PairKey] = set()
+        for source in set(from_u).union(from_v).intersection(self._paths_by_source):
+            candidates.update(self._paths_by_source[source])
+        # A source outside both balls is at least min(far_u, far_v) hops from the new edge,
+        # so only longer cached paths can be shortened through it.
+        shortest_outside = min(far_u, far_v) + 1
+        for length, keys in self._paths_by_length.items():
+            if length > shortest_outside:
+                candidates.update(keys)
+        stale: List[PairKey] = []
+        for key in candidates:
+            source, target = key
+            if source in self._trees:
+                continue
+            through = min(from_u.get(source, far_u) + from_v.get(target, far_v),
+                          from_v.get(source, far_v) + from_u.get(target, far_u)) + 1
+            if through < len(self._paths[key]) - 1:
+                stale.append(key)
+        return stale
+
+    def on_mesh_event(self, event: MeshEvent) -> None:
+        """CESSMesh listener: invalidates exactly the entries the mutation can affect."""
+        if event.kind == EDGE_REMOVED:
+            for key in list(self._paths_by_edge.get(_edge_key(event.u, event.v), ())):
+                self._drop_path(key)
+                self.stats.invalidations += 1
+            for source in [s for s, tree in self._trees.items() if tree.uses_edge(event.u, event.v)]:
+                del self._trees[source]
+                self.stats.invalidations += 1
+        elif event.kind == EDGE_ADDED:
+            for source in [s for s, tree in self._trees.items() if tree.shortcut_by(event.u, event.v)]:
+                del self._trees[source]
+                self.stats.invalidations += 1
+            for key in self._shortened_pairs(event.u, event.v):
+                self._drop_path(key)
+                self.stats.invalidations += 1
@@ -1,12 +1,19 @@
 # ~/aurora_project/core_modules/tgif_flow/router.py
+import functools
+import logging
 import networkx as nx
 import torch
-from typing import List, Tuple, Optional, Dict, Any
-import matplotlib.pyplot as plt # <--- ADD THIS LINE
+from typing import List, Tuple, Optional, Dict, Any, Sequence, Union
 
 # Import necessary components from other AURORA modules
-from core_modules.cess_mesh.mesh_simulator import CESSMesh, DEVICE
-from .intent import Intent
+from core_modules.cess_mesh.mesh_simulator import CESSMesh
+from .intent import AnyIntent
+from .intent_batch import IntentBatch
+from .path_cache import ShortestPathCache, PathCacheStats
+from .distance_index import DistanceIndex
+from .weighted_search import CSRLists, Heuristic, shortest_weighted_path, shortest_weighted_tree, walk_parents
+
+logger = logging.getLogger(__name__)
 
 class TGIFRouter:
     """
@@ -15,61 +22,148 @@ class TGIFRouter:
     Inspired by twistor geometry, this router will prioritize causal correctness
     and leverage the dynamic mesh topology.
     """
-    def __init__(self, mesh: CESSMesh):
+    def __init__(self, mesh: CESSMesh, path_cache_size: int = 4096, tree_cache_size: int = 256,
+                 weighted: bool = False, heuristic: Optional[Heuristic] = None):
         self.mesh = mesh
-        print(f"TGIF Router initialized, connected to CESS Mesh with {self.mesh.graph.number_of_nodes()} nodes.")
+        # Weighted mode routes on the mesh's edge_attrs (as link costs) instead of hop count.
+        self.weighted = weighted
+        self.heuristic = heuristic
+        self._csr_lists: Optional[Tuple[int, CSRLists]] = None
+        self.distance_index: Optional[DistanceIndex] = None
+        # Shortest paths are cached per (source, destination) and per source BFS tree;
+        # the mesh notifies the cache of every edge mutation so it can invalidate selectively.
+        self.path_cache = ShortestPathCache(max_paths=path_cache_size, max_trees=tree_cache_size)
+        self.mesh.add_listener(self.path_cache.on_mesh_event)
+        logger.info("TGIF Router initialized, connected to CESS Mesh with %d nodes.", self.mesh.graph.number_of_nodes())
+
+    @property
+    def cache_stats(self) -> PathCacheStats:
+        """Hit/miss/invalidation/eviction counters of the path cache."""
+        return self.path_cache.stats
+
+    def enable_distance_index(self, mode: str = "auto", num_landmarks: int = 16,
+                              exact_threshold: int = 4096, landmark_search: str = "bidirectional") -> DistanceIndex:
+        """
+        Precomputes a hop-count distance oracle (exact all-pairs for meshes up to
+        `exact_threshold` nodes, ALT landmarks above) and answers hop-count routes from it.
+        The index follows mesh rewires incrementally.
+        """
+        if self.distance_index is not None:
+            self.mesh.remove_listener(self.distance_index.on_mesh_event)
+        self.distance_index = DistanceIndex(self.mesh, mode=mode, num_landmarks=num_landmarks,
+                                            exact_threshold=exact_threshold, landmark_search=landmark_search)
+        logger.info("TGIF Router distance index built in '%s' mode.", self.distance_index.mode)
+        return self.distance_index
+
+    def _weighted_adjacency(self) -> CSRLists:
+        """The mesh's CSR adjacency as Python lists, rebuilt only when the mesh version changes."""
+        if self._csr_lists is None or self._csr_lists[0] != self.mesh.version:
+            indptr, indices, weights = self.mesh.csr()
+            self._csr_lists = (self.mesh.version, (indptr.tolist(), indices.tolist(), weights.tolist()))
+        return self._csr_lists[1]
 
-    def get_path(self, source_node_id: int, destination_node_id: int) -> Optional[List[int]]:
+    def get_path(self, source_node_id: int, destination_node_id: int,
+                 weighted: Optional[bool] = None, heuristic: Optional[Heuristic] = None) -> Optional[List[int]]:
         """
         Finds a path between source and destination nodes in the CESS Mesh.
-        This is a basic shortest path for now, but will evolve to incorporate
-        "conformal correctness" (e.g., path stability, latency, security properties derived from twistor vectors).
+        By default this is a hop-count shortest path served from the router's path cache.
+        In weighted mode (per call, or router-wide via `weighted=True`) it runs Dijkstra, or A*
+        when a heuristic is supplied, using the mesh's edge attributes as link costs.
+        This will evolve to incorporate "conformal correctness" (e.g., path stability, latency,
+        security properties derived from twistor vectors).
         """
         if not self.mesh.graph.has_node(source_node_id) or not self.mesh.graph.has_node(destination_node_id):
-            print(f"Routing Error: Source {source_node_id} or Destination {destination_node_id} not in mesh.")
+            logger.warning("Routing Error: Source %s or Destination %s not in mesh.", source_node_id, destination_node_id)
             return None
+
+        if self.weighted if weighted is None else weighted:
+            result = shortest_weighted_path(
+                self._weighted_adjacency(), source_node_id, destination_node_id,
+                heuristic if heuristic is not None else self.heuristic,
+            )
+            if result is None:
+                logger.info("Routing Error: No path found between %s and %s.", source_node_id, destination_node_id)
+                return None
+            return result[1]
         
-        try:
-            # Basic shortest path using NetworkX
-            # In a true TGIF Flow, this would be highly optimized, potentially GPU-acceleraccelerated,
-            # and influenced by dynamic edge weights (from CESS Mesh attributes).
-            path: List[int] = nx.shortest_path(self.mesh.graph, source=source_node_id, target=destination_node_id)
-            return path
-        except nx.NetworkXNoPath:
-            print(f"Routing Error: No path found between {source_node_id} and {destination_node_id}.")
-            return None
-        except Exception as e:
-            print(f"An unexpected routing error occurred: {e}")
+        if self.distance_index is not None:
+            path = self.distance_index.path(source_node_id, destination_node_id)
+        else:
+            path = self.path_cache.get_path(self.mesh.graph, source_node_id, destination_node_id)
+        if path is None:
+            logger.info("Routing Error: No path found between %s and %s.", source_node_id, destination_node_id)
             return None
+        # Hand out a copy so callers cannot corrupt the cached entry.
+        return list(path)
 
-    def route_intent(self, intent: Intent) -> Tuple[bool, Optional[List[int]]]:
+    def route_intent(self, intent: AnyIntent) -> Tuple[bool, Optional[List[int]]]:
         """
         Routes an Intent object through the CESS Mesh.
         Returns a tuple: (success_boolean, path_list_or_None).
         """
         if intent.source_node_id == -1 or intent.destination_node_id == -1:
-            print(f"Intent {intent.intent_id[:8]} cannot be routed: source or destination undefined.")
+            logger.warning("Intent %.8s cannot be routed: source or destination undefined.", intent.intent_id)
             return False, None
 
-        print(f"Routing Intent {intent.intent_id[:8]} from {intent.source_node_id} to {intent.destination_node_id}...")
+        logger.debug("Routing Intent %.8s from %s to %s...", intent.intent_id, intent.source_node_id, intent.destination_node_id)
         path = self.get_path(intent.source_node_id, intent.destination_node_id)
 
         if path:
-            print(f"Intent {intent.intent_id[:8]} successfully routed. Path: {path}")
+            logger.debug("Intent %.8s successfully routed. Path: %s", intent.intent_id, path)
             # In a real system, intent would traverse the path, interacting with nodes/edges
             return True, path
         else:
-            print(f"Intent {intent.intent_id[:8]} failed to route.")
+            logger.info("Intent %.8s failed to route.", intent.intent_id)
             return False, None
 
+    def route_intents(self, intents: Union[Sequence[AnyIntent], IntentBatch]) -> List[Tuple[bool, Optional[List[int]]]]:
+        """
+        Routes a whole batch of Intents (a list, or a columnar IntentBatch) in one pass.
+        Intents are grouped by source node and each distinct source is searched once
+        (a BFS tree from the path cache, or a single-source Dijkstra in weighted mode);
+        every intent from that source is then answered by walking the tree. Returns one (success, path) tuple per
+        intent, in input order.
+        """
+        if isinstance(intents, IntentBatch):
+            sources: List[int] = intents.source_ids.tolist()
+            destinations: List[int] = intents.destination_ids.tolist()
+        else:
+            sources = [intent.source_node_id for intent in intents]
+            destinations = [intent.destination_node_id for intent in intents]
+        results: List[Tuple[bool, Optional[List[int]]]] = [(False, None)] * len(sources)
+        graph = self.mesh.graph
+        by_source: Dict[int, List[int]] = {}
+        for i, (source, destination) in enumerate(zip(sources, destinations)):
+            if graph.has_node(source) and graph.has_node(destination):
+                by_source.setdefault(source, []).append(i)
+
+        routed = 0
+        for source, indices in by_source.items():
+            if self.weighted:
+                _, parent = shortest_weighted_tree(self._weighted_adjacency(), source)
+                path_to = functools.partial(walk_parents, parent, source)
+            elif self.distance_index is not None:
+                path_to = functools.partial(self.distance_index.path, source)
+            else:
+                path_to = self.path_cache.get_tree(graph, source).path_to
+            for i in indices:
+                path = path_to(destinations[i])
+                if path is not None:
+                    results[i] = (True, path)
+                    routed += 1
+
+        logger.debug("Routed %d/%d intents using %d single-source searches.", routed, len(sources), len(by_source))
+        return results
+
     def visualize_path(self, path: List[int], iteration: int = 0, title_suffix: str = ""):
         """
         Visualizes a path on the CESS Mesh.
         Re-uses CESSMesh's visualize capability.
         """
         if not path or len(path) < 2:
-            print("Cannot visualize path: invalid path.")
+            logger.warning("Cannot visualize path: invalid path.")
             return
+        import matplotlib.pyplot as plt  # Plotting is optional and heavy to import; load it on demand.
         
         # Create a copy of the graph to highlight path
         graph_copy: nx.Graph = self.mesh.graph.copy() # Explicitly type graph_copy
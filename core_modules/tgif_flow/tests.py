@@ -1,17 +1,20 @@
 # ~/aurora_project/core_modules/tgif_flow/tests.py
+import logging
 import torch
 import networkx as nx
 import matplotlib.pyplot as plt # Needed for visualization
 from typing import Dict, List, Tuple
 
 # Import the core components
-from .intent import Intent
+from .intent import Intent, CompactIntent, IntentVectorPool
 from .router import TGIFRouter
 
 # Import CESS Mesh directly for setup
 from core_modules.cess_mesh.mesh_simulator import CESSMesh, DEVICE
 
 if __name__ == "__main__":
+    # Module loggers are silent by default; surface their INFO messages while testing.
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
     print("--- Running TGIF Flow Module Basic Tests ---")
 
     # 1. Test CUDA availability (inherited from CESS Mesh)
@@ -66,4 +69,164 @@ if __name__ == "__main__":
     assert not success3 and path3 is None
     print(f"Intent 3 (unreachable) routing result: Success={success3}, Path={path3}")
 
+    # 5. Path cache: repeated pairs hit the cache, and mesh rewires invalidate stale entries
+    cache_mesh = CESSMesh(num_nodes=100, seed=3)
+    cache_router = TGIFRouter(cache_mesh, path_cache_size=256, tree_cache_size=16)
+    pairs: List[Tuple[int, int]] = [(s, d) for s in range(0, 100, 10) for d in range(5, 100, 15)]
+    for _ in range(2):
+        for s, d in pairs:
+            cache_router.get_path(s, d)
+    assert cache_router.cache_stats.hits >= len(pairs), "Second pass should be served from the cache"
+    for _ in range(5):
+        cache_mesh.perform_pachner_moves(20)
+        for s, d in pairs:
+            path = cache_router.get_path(s, d)
+            if not nx.has_path(cache_mesh.graph, s, d):
+                assert path is None
+                continue
+            assert path is not None and path[0] == s and path[-1] == d
+            assert all(cache_mesh.graph.has_edge(a, b) for a, b in zip(path[:-1], path[1:])), "Cached path uses a removed edge"
+            assert len(path) - 1 == nx.shortest_path_length(cache_mesh.graph, s, d), "Cached path is no longer shortest"
+    print(f"Path cache stats after rewires: {cache_router.cache_stats}")
+    assert cache_router.cache_stats.invalidations > 0
+    line_mesh = CESSMesh.from_edge_index(torch.tensor([list(range(19)), list(range(1, 20))]), num_nodes=20, seed=0)
+    line_router = TGIFRouter(line_mesh)
+    line_router.get_path(0, 5)
+    line_router.get_path(10, 19)
+    line_mesh.add_edge(10, 19)  # Shortcuts 10 -> 19 only
+    hits_before = line_router.cache_stats.hits
+    assert line_router.get_path(0, 5) == list(range(6)) and line_router.cache_stats.hits == hits_before + 1, "Unaffected pair must survive"
+    assert line_router.get_path(10, 19) == [10, 19]
+
+    # 6. Batch routing: one search per distinct source, results aligned with the input order
+    batch_intents: List[Intent] = [
+        Intent(source_node_id=s, destination_node_id=d) for s in (1, 2, 3) for d in range(0, 100, 7)
+    ]
+    batch_intents.append(Intent(source_node_id=1, destination_node_id=unreachable_node))
+    misses_before: int = cache_router.cache_stats.misses
+    batch_results = cache_router.route_intents(batch_intents)
+    assert len(batch_results) == len(batch_intents)
+    assert cache_router.cache_stats.misses - misses_before <= 3, "Expected at most one search per distinct source"
+    for intent, (ok, path) in zip(batch_intents, batch_results):
+        single_ok, single_path = cache_router.route_intent(intent)
+        assert ok == single_ok
+        if ok:
+            assert path is not None and single_path is not None and len(path) == len(single_path)
+            assert path[0] == intent.source_node_id and path[-1] == intent.destination_node_id
+    print(f"Batch routing verified for {len(batch_intents)} intents.")
+
+    # 7. Weighted routing reads link costs from the mesh's edge attributes
+    weighted_router = TGIFRouter(cache_mesh, weighted=True)
+    for s, d in pairs[:20]:
+        w_path = weighted_router.get_path(s, d)
+        if not nx.has_path(cache_mesh.graph, s, d):
+            assert w_path is None
+            continue
+        assert w_path is not None
+        w_cost: float = sum(cache_mesh.edge_attrs[(a, b)].item() for a, b in zip(w_path[:-1], w_path[1:]))
+        nx_cost: float = nx.shortest_path_length(
+            cache_mesh.graph, s, d, weight=lambda a, b, _: cache_mesh.edge_attrs[(a, b)].item()
+        )
+        assert abs(w_cost - nx_cost) < 1e-4, f"Weighted path {s}->{d} costs {w_cost}, optimum is {nx_cost}"
+        # A zero heuristic is trivially admissible, so A* must find an equally cheap path
+        a_star_path = weighted_router.get_path(s, d, heuristic=lambda node, target: 0.0)
+        assert a_star_path is not None
+    # Reweighting an edge must be picked up without rebuilding the router
+    u1, v1 = cache_mesh.edge_index[:, 0].tolist()
+    cache_mesh.edge_attrs[(u1, v1)] = torch.tensor([1e-6], device=DEVICE)
+    assert weighted_router.get_path(u1, v1) == [u1, v1]
+    weighted_results = weighted_router.route_intents(batch_intents[:10])
+    assert all(ok for ok, _ in weighted_results)
+    print("Weighted (Dijkstra/A*) routing verified against NetworkX.")
+
+    # 8. Distance index: exact all-pairs and ALT landmarks, maintained across rewires
+    from .distance_index import DistanceIndex
+    index_router = TGIFRouter(cache_mesh)
+    exact_index = index_router.enable_distance_index(mode="exact")
+    landmark_index = DistanceIndex(cache_mesh, mode="landmarks", num_landmarks=8)
+    for _ in range(3):
+        cache_mesh.perform_pachner_moves(10)
+        lengths: Dict[int, Dict[int, int]] = dict(nx.all_pairs_shortest_path_length(cache_mesh.graph))
+        for s, d in pairs:
+            expected = lengths[s].get(d)
+            assert exact_index.distance(s, d) == expected, f"Exact index distance {s}->{d} is stale"
+            for idx_path in (index_router.get_path(s, d), landmark_index.path(s, d)):
+                if expected is None:
+                    assert idx_path is None
+                else:
+                    assert idx_path is not None and len(idx_path) - 1 == expected
+                    assert all(cache_mesh.graph.has_edge(a, b) for a, b in zip(idx_path[:-1], idx_path[1:]))
+            lower = landmark_index.distance(s, d)
+            assert expected is None or (lower is not None and lower <= expected), "ALT bound must be admissible"
+    assert exact_index.rows_recomputed < 4 * cache_mesh.num_nodes, "Index should update incrementally, not rebuild"
+    split_mesh = CESSMesh.from_edge_index(torch.tensor([[0, 1, 3], [1, 2, 4]]), num_nodes=5, seed=0)
+    split_index = DistanceIndex(split_mesh, mode="landmarks", num_landmarks=1)
+    for s, d in ((1, 3), (4, 0)):
+        assert split_index.distance(s, d) is None and split_index.path(s, d) is None, "Disconnected pairs must be unreachable"
+    assert split_index.distance(0, 2) is not None and split_index.path(0, 2) == [0, 1, 2]
+    print(f"Distance index verified (exact rows recomputed: {exact_index.rows_recomputed}).")
+
+    # 9. Compact intents: slotted, integer IDs, lazily materialised pooled vectors
+    compact = CompactIntent(source_node_id=0, destination_node_id=9)
+    assert not hasattr(compact, "__dict__")
+    assert isinstance(compact.intent_id, int) and CompactIntent().intent_id > compact.intent_id
+    assert not compact.has_vector, "Vector must not be allocated until it is read"
+    assert compact.intent_vector.shape == (16,) and compact.has_vector
+    assert compact.intent_vector.device.type == DEVICE.type
+    small_pool = IntentVectorPool(vector_dim=4, capacity=2)
+    pooled = [CompactIntent(vector_dim=4, pool=small_pool).intent_vector for _ in range(3)]
+    assert all(v.shape == (4,) for v in pooled) and not torch.equal(pooled[0], pooled[1])
+    assert CompactIntent(intent_id="external-uuid").intent_id == "external-uuid"
+    compact_ok, compact_path = router.route_intent(compact)
+    assert compact_ok == success1 and compact_path == path1
+    print(f"Compact intent verified: {compact}")
+
+    # 10. Columnar intent batches: zero-copy round trip and batch routing
+    from .intent_batch import IntentBatch
+    mixed = [intent1, CompactIntent(source_node_id=0, destination_node_id=5, payload={"k": 1}), CompactIntent(2, 7)]
+    packed = IntentBatch.from_intents(mixed)
+    assert len(packed) == 3 and packed.intent_vectors.shape == (3, 16)
+    assert packed.source_ids.dtype == torch.long and packed.source_ids.tolist() == [0, 0, 2]
+    assert isinstance(packed.intent_ids, list), "UUID string IDs are kept in a side list"
+    assert torch.equal(packed.intent_vectors[0], intent1.intent_vector.to(packed.intent_vectors.device))
+    unpacked = packed.to_intents()
+    assert [i.destination_node_id for i in unpacked] == [9, 5, 7] and unpacked[1].payload == {"k": 1}
+    assert unpacked[2].intent_vector.data_ptr() == packed.intent_vectors[2].data_ptr(), "to_intents must not copy vectors"
+    random_batch = IntentBatch.random(200, cache_mesh.num_nodes, generator=torch.Generator().manual_seed(0))
+    assert random_batch.intent_ids.tolist() == list(range(200))
+    batch_router = TGIFRouter(cache_mesh)
+    batch_results = batch_router.route_intents(random_batch)
+    assert batch_results == batch_router.route_intents(random_batch.to_intents())
+    sub = random_batch.select(random_batch.source_ids < 50)
+    assert len(sub) == int((random_batch.source_ids < 50).sum()) and bool((sub.source_ids < 50).all())
+    print(f"Intent batch verified ({sum(ok for ok, _ in batch_results)}/{len(random_batch)} routed).")
+
+    # 11. Tick scheduler: pipelined evolve / route / learn (and routing sharded across worker
+    # processes) matches running the stages in sequence
+    from core_modules.simulation import SimulationScheduler
+    from core_modules.hnk.sheaf_hypergraph_network import SheafHypergraph, SheafHypergraphNetwork
+    shn = SheafHypergraphNetwork(CESSMesh.NODE_STATE_DIM, 3)
+    sim_intents = IntentBatch.random(100, 300, generator=torch.Generator().manual_seed(1))
+    runs = {}
+    for pipelined, route_workers in ((False, 0), (True, 0), (True, 2)):
+        sim_mesh = CESSMesh(num_nodes=300, seed=5)
+        sim_hypergraph = SheafHypergraph(300, sim_mesh.edge_index.t().tolist()[:200], feature_dim=CESSMesh.NODE_STATE_DIM, seed=5)
+        with SimulationScheduler(sim_mesh, sim_intents, sim_hypergraph, shn, moves_per_tick=10, pipelined=pipelined,
+                                 route_workers=route_workers) as scheduler:
+            runs[pipelined, route_workers] = scheduler.run(5)
+            assert set(map(frozenset, scheduler.replica.graph.edges())) == set(map(frozenset, sim_mesh.graph.edges()))
+            assert torch.equal(scheduler.replica.node_state, sim_mesh.node_state)
+            live_routes = TGIFRouter(sim_mesh).route_intents(sim_intents)
+            assert [len(p or []) for _, p in runs[pipelined, route_workers][-1].routes] == [len(p or []) for _, p in live_routes]
+            stats = scheduler.summary()
+    serial_run = runs[False, 0]
+    assert [r.tick for r in serial_run] == list(range(5))
+    for key in ((True, 0), (True, 2)):
+        assert [r.tick for r in runs[key]] == list(range(5))
+        for serial_report, report in zip(serial_run, runs[key]):
+            assert serial_report.routes == report.routes, f"Routes differ at tick {serial_report.tick} for {key}"
+            assert torch.equal(serial_report.embedding, report.embedding)
+    print(f"Tick scheduler verified: {stats['ticks_per_s']:.1f} ticks/s pipelined with 2 route workers "
+          f"(evolve {stats['evolve'] * 1e3:.1f} ms, route {stats['route'] * 1e3:.1f} ms, learn {stats['learn'] * 1e3:.1f} ms).")
+
     print("\n--- TGIF Flow Module Basic Tests Complete ---")
\ No newline at end of file
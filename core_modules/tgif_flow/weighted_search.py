@@ -0,0 +1,131 @@
+# ~/aurora_project/core_modules/tgif_flow/weighted_search.py
+import heapq
+import math
+from typing import Callable, Dict, List, Optional, Tuple
+
+# A* heuristic: (node, target) -> admissible lower bound on the remaining path cost.
+Heuristic = Callable[[int, int], float]
+
+# Plain-Python CSR adjacency: (indptr, indices, weights) lists, see CESSMesh.csr().
+CSRLists = Tuple[List[int], List[int], List[float]]
+
+
+def walk_parents(parent: Dict[int, int], source: int, target: int) -> Optional[List[int]]:
+    """Reconstructs the source -> target path from a parent map (None if target was not reached)."""
+    if target not in parent:
+        return None
+    path = [target]
+    while target != source:
+        target = parent[target]
+        path.append(target)
+    path.reverse()
+    return path
+
+
+def shortest_weighted_path(
+    csr: CSRLists,
+    source: int,
+    target: int,
+    heuristic: Optional[Heuristic] = None,
+) -> Optional[Tuple[float, List[int]]]:
+    """
+    Point-to-point search over a CSR adjacency: bidirectional Dijkstra, or A* when a
+    heuristic is given.
+    Edge costs are read straight from the CSR weight array, which must be non-negative;
+    the heuristic must be consistent for the closed-set pruning to stay exact.
+    Returns (cost, path) or None if the target is unreachable.
+    """
+    if heuristic is None:
+        return _bidirectional_dijkstra(csr, source, target)
+    indptr, indices, weights = csr
+    dist: Dict[int, float] = {source: 0.0}
+    parent: Dict[int, int] = {source: source}
+    closed = set()
+    # Heap entries are (f, -g, node): among equal f, the deepest node is expanded first,
+    # which avoids sweeping whole plateaus of ties on unit-weight graphs.
+    heap: List[Tuple[float, float, int]] = [(heuristic(source, target), -0.0, source)]
+    while heap:
+        _, neg_d, u = heapq.heappop(heap)
+        d = -neg_d
+        if u == target:
+            return d, walk_parents(parent, source, target)
+        if u in closed:
+            continue
+        closed.add(u)
+        for k in range(indptr[u], indptr[u + 1]):
+            w = indices[k]
+            nd = d + weights[k]
+            if nd < dist.get(w, math.inf):
+                dist[w] = nd
+                parent[w] = u
+                heapq.heappush(heap, (nd + heuristic(w, target), -nd, w))
+    return None
+
+
+def _bidirectional_dijkstra(csr: CSRLists, source: int, target: int) -> Optional[Tuple[float, List[int]]]:
+    """
+    Dijkstra grown alternately from both endpoints (the graph is undirected, so the same
+    CSR serves both directions). Stops once the two frontiers' radii exceed the best meeting cost.
+    """
+    if source == target:
+        return 0.0, [source]
+    indptr, indices, weights = csr
+    dists: Tuple[Dict[int, float], Dict[int, float]] = ({source: 0.0}, {target: 0.0})
+    parents: Tuple[Dict[int, int], Dict[int, int]] = ({source: source}, {target: target})
+    closed: Tuple[set, set] = (set(), set())
+    heaps: Tuple[List[Tuple[float, int]], List[Tuple[float, int]]] = ([(0.0, source)], [(0.0, target)])
+    best = math.inf
+    meet = -1
+    side = 0
+    while heaps[0] and heaps[1]:
+        if heaps[0][0][0] + heaps[1][0][0] >= best:
+            break
+        # Expand the side with the smaller frontier radius.
+        side = 0 if heaps[0][0][0] <= heaps[1][0][0] else 1
+        d, u = heapq.heappop(heaps[side])
+        if u in closed[side]:
+            continue
+        closed[side].add(u)
+        dist, other = dists[side], dists[1 - side]
+        parent = parents[side]
+        for k in range(indptr[u], indptr[u + 1]):
+            w = indices[k]
+            nd = d + weights[k]
+            if nd < dist.get(w, math.inf):
+                dist[w] = nd
+                parent[w] = u
+                heapq.heappush(heaps[side], (nd, w))
+            if w in other and nd + other[w] < best:
+                best = nd + other[w]
+                meet = w
+    if meet < 0:
+        return None
+    forward = walk_parents(parents[0], source, meet)
+    backward = walk_parents(parents[1], target, meet)
+    assert forward is not None and backward is not None
+    return best, forward + backward[-2::-1]
+
+
+def shortest_weighted_tree(csr: CSRLists, source: int) -> Tuple[Dict[int, float], Dict[int, int]]:
+    """
+    Single-source Dijkstra over a CSR adjacency. Returns (dist, parent) maps for every
+    reachable node, so many destinations from one source share a single search.
+    """
+    indptr, indices, weights = csr
+    dist: Dict[int, float] = {source: 0.0}
+    parent: Dict[int, int] = {source: source}
+    closed = set()
+    heap: List[Tuple[float, int]] = [(0.0, source)]
+    while heap:
+        d, u = heapq.heappop(heap)
+        if u in closed:
+            continue
+        closed.add(u)
+        for k in range(indptr[u], indptr[u + 1]):
+            w = indices[k]
+            nd = d + weights[k]
+            if nd < dist.get(w, math.inf):
+                dist[w] = nd
+                parent[w] = u
+                heapq.heappush(heap, (nd, w))
+    return dist, parent